@@ -29,6 +29,35 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str | None = None
+    # Provedor de LLM: "openai" ou "fake" (determinístico, para testes e carga)
+    LLM_PROVIDER: str = "openai"
+    LLM_BASE_URL: str | None = None  # ex.: servidor falso local em http://127.0.0.1:8100/v1
+    LLM_CHAT_MODEL: str = "gpt-4-1106-preview"
+    LLM_CHAT_TIMEOUT_SECONDS: float = 60
+    LLM_EMBEDDING_TIMEOUT_SECONDS: float = 15
+    LLM_MAX_RETRIES: int = 2
+    LLM_MAX_CONCURRENCY: int = 16  # chamadas simultâneas por worker
+    LLM_MAX_CONNECTIONS: int = 32
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    FAKE_LLM_LATENCY_MS: float = 0
+    # "local-hashing-v1" usa o backend local em CPU (services/local_embeddings)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    # Recalcula com o backend local quando a API de embeddings falha
+    EMBEDDING_LOCAL_FALLBACK: bool = True
+    LOCAL_EMBEDDING_DIMENSIONS: int = 384
+    LOCAL_EMBEDDING_IDF_PATH: str | None = None  # gerado por scripts/fit_local_embeddings.py
+    # Redução de dimensões dos modelos text-embedding-3 (ex.: 512); None usa a padrão
+    EMBEDDING_DIMENSIONS: int | None = None
+    # Janela para agrupar embeddings de análises concorrentes em uma chamada
+    EMBEDDING_BATCH_WINDOW_MS: float = 10
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000
+    # Limite de entrada do modelo; textos maiores são cortados antes do lote
+    EMBEDDING_MAX_INPUT_TOKENS: int = 8191
+    # Currículos são embutidos por trechos alinhados às seções
+    RESUME_CHUNK_MAX_CHARS: int = 2000
+    # Peso do melhor trecho vs. média ponderada por seção (0 a 1)
+    RESUME_CHUNK_MAX_WEIGHT: float = 0.5
 
     # Stripe
     STRIPE_SECRET_KEY: str | None = None
@@ -36,6 +65,88 @@ class Settings(BaseSettings):
     STRIPE_WEBHOOK_SECRET: str | None = None
     STRIPE_PRICE_ID: str | None = None
 
+    # Cache
+    CACHE_DIR: str = "/tmp/resume_analyzer_cache"
+    TEXT_CACHE_MEMORY_BYTES: int = 64 * 1024 * 1024  # 64MB por worker
+    TEXT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60  # 7 dias
+    EMBEDDING_CACHE_MEMORY_BYTES: int = 32 * 1024 * 1024  # 32MB por worker; ignorado com o backend mmap
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60  # 30 dias
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100000
+    JOB_CACHE_MEMORY_BYTES: int = 16 * 1024 * 1024
+    JOB_CACHE_FRESH_SECONDS: int = 6 * 60 * 60  # usado sem revalidar
+    JOB_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60  # mantido para GET condicional
+    EMBEDDING_STORE_DTYPE: str = "float16"  # float32, float16 ou int8
+    EMBEDDING_STORE_BACKEND: str = "mmap"  # mmap (compartilhado entre workers) ou sqlite
+
+    # Busca de vagas
+    JOB_FETCH_TIMEOUT_SECONDS: float = 15
+    JOB_MAX_RESPONSE_BYTES: int = 2 * 1024 * 1024  # leitura interrompida, não recusada
+    JOB_STREAM_CHUNK_BYTES: int = 16 * 1024
+    JOB_PREFETCH_TTL_SECONDS: float = 10 * 60  # handle de /cv/jobs/prefetch
+    JOB_PREFETCH_MAX_ENTRIES: int = 1000
+    JOB_PREFETCH_MAX_PER_USER: int = 10  # handles ativos por usuário
+    # Limites por domínio (extract_domain); JOB_FETCH_DOMAIN_LIMITS sobrescreve por site
+    JOB_FETCH_CONCURRENCY_PER_DOMAIN: int = 4
+    JOB_FETCH_RATE_PER_DOMAIN: float = 2.0  # requisições/s
+    JOB_FETCH_BURST_PER_DOMAIN: float = 4
+    JOB_FETCH_DOMAIN_LIMITS: dict[str, dict[str, float]] = {
+        "linkedin.com": {"concurrency": 2, "rate": 0.5, "burst": 2},
+        "indeed.com": {"concurrency": 2, "rate": 1.0, "burst": 2},
+        "gupy.io": {"concurrency": 4, "rate": 2.0, "burst": 4},
+    }
+    JOB_FETCH_MAX_RETRIES: int = 2
+    # Redirecionamentos seguidos manualmente, cada destino verificado
+    JOB_FETCH_MAX_REDIRECTS: int = 5
+    # Permite buscar vagas em hosts internos (loopback, rede privada). Só para
+    # desenvolvimento e testes de carga locais; nunca em produção
+    JOB_FETCH_ALLOW_PRIVATE_HOSTS: bool = False
+    JOB_FETCH_MAX_BACKOFF_SECONDS: float = 10
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5
+    HTTP_READ_TIMEOUT_SECONDS: float = 10
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 8
+    HTTP_DNS_CACHE_SECONDS: int = 300
+    HTTP_KEEPALIVE_SECONDS: float = 30
+
+    # Upload e extração de documentos
+    MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_SPOOL_DIR: str | None = None  # None usa o diretório temporário do sistema
+    EXTRACTION_WORKERS: int = 2
+    EXTRACTION_TIMEOUT_SECONDS: float = 30
+    EXTRACTION_START_METHOD: str = "spawn"
+    EXTRACTION_MAX_PAGES: int = 100  # 0 desativa
+    EXTRACTION_PROBE_TIMEOUT_SECONDS: float = 2
+    # PDFs acima deste número de páginas são extraídos em paralelo; 0 desativa
+    EXTRACTION_PARALLEL_PAGE_THRESHOLD: int = 20
+    # Orçamento de texto do currículo (~4 caracteres por token); 0 desativa
+    EXTRACTION_MAX_CHARS: int = 32000
+
+    # Etapas de /cv/analyze (app.utils.pipeline): prazo total da requisição e
+    # timeout de cada etapa, limitado ao que resta do prazo
+    ANALYSIS_DEADLINE_SECONDS: float = 90
+    ANALYSIS_STAGE_TIMEOUTS: dict[str, float] = {
+        "resume": 20,
+        "jobs": 15,
+        "credits": 5,
+        "resume_embedding": 15,
+        "job_embedding": 15,
+        "similarity": 5,
+        "generation": 60,
+    }
+    # Tempo reservado para o fallback local quando a API de embeddings atrasa
+    EMBEDDING_LOCAL_RESERVE_SECONDS: float = 1.0
+
+    # Fila de análises assíncronas (app.services.analysis_queue)
+    ANALYSIS_QUEUE_MAX_ATTEMPTS: int = 3
+    # Análises na fila ou em execução por usuário; também limitado aos créditos restantes
+    ANALYSIS_QUEUE_MAX_PENDING_PER_USER: int = 3
+    # Lease do worker; maior que ANALYSIS_DEADLINE_SECONDS, então não precisa renovar
+    ANALYSIS_QUEUE_VISIBILITY_TIMEOUT_SECONDS: float = 300
+    ANALYSIS_QUEUE_RETRY_DELAY_SECONDS: float = 10  # multiplicado pela tentativa
+    ANALYSIS_QUEUE_POLL_SECONDS: float = 1
+    ANALYSIS_WORKER_CONCURRENCY: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
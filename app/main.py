@@ -1,8 +1,27 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config.settings import settings
+from app.utils.metrics import metrics
+from app.utils.extraction_pool import extraction_pool
+from app.services.llm import close_llm_provider
+from app.services.http_session import close_http_session, get_http_session
+from app.services.local_embeddings import is_local_model, local_embedder
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    extraction_pool.start()
+    get_http_session()
+    if settings.EMBEDDING_LOCAL_FALLBACK or is_local_model(settings.EMBEDDING_MODEL):
+        # Evita pagar a importação do scikit-learn na primeira análise
+        await asyncio.to_thread(local_embedder.warm_up)
+    yield
+    extraction_pool.shutdown()
+    await close_llm_provider()
+    await close_http_session()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configuração do CORS
 app.add_middleware(
@@ -36,3 +55,6 @@ async def health_check():
         "backend_url": settings.BACKEND_URL
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
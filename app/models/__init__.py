@@ -1,2 +1,2 @@
 from .user import User
-
+from .analysis_job import AnalysisJob
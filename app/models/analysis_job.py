@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import deferred
+from app.database import Base
+import uuid
+
+class AnalysisJob(Base):
+    """Análise enfileirada por POST /cv/analyze/submit e executada por scripts/analysis_worker.py"""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    # queued -> running -> done | failed (running volta a queued em retentativas)
+    status = Column(String, nullable=False, default="queued")
+    # Texto do currículo, quando já estava no cache de extração no envio;
+    # senão o arquivo enviado, extraído pelo worker e apagado ao finalizar.
+    # O arquivo (até MAX_UPLOAD_SIZE) só é carregado por claim, não nas
+    # consultas de andamento
+    resume_text = Column(Text, nullable=True)
+    resume_file = deferred(Column(LargeBinary, nullable=True))
+    job_links = Column(JSONB, nullable=False)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Fila: visível para os workers a partir deste instante. Em execução,
+    # marca o fim do prazo de visibilidade (lease) do worker que a pegou
+    visible_at = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+    locked_by = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_analysis_jobs_claim",
+            "visible_at",
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
@@ -1,30 +1,45 @@
 # Conteúdo atual do cv_analysis.py
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
 import asyncio  # Adicionando import do asyncio
 from app.database import get_db
 from app.models.user import User
 from app.models.user_credits import UserCredits
+from app.models.analysis_job import AnalysisJob
 from app.middleware.auth import get_current_user
 import logging
 import json
-from openai import OpenAI
+import re
+import uuid
 from app.config.settings import settings
 import aiohttp
-from bs4 import BeautifulSoup
-from pypdf import PdfReader  # Mudado de PyPDF2 para pypdf
-import docx
-import io
 from app.utils.keywords_filter import filter_relevant_keywords
-from sklearn.metrics.pairwise import cosine_similarity
+from app.utils.text_extraction import check_upload, extract_stored_text, extract_upload_text
+from app.utils.upload_ingest import ingest_upload, sniff_format, HEADER_SIZE
+from app.utils.text_normalization import comparison_form, normalize_document
+from app.utils.embedding_cache import embedding_cache
+from app.utils.embedding_batcher import EmbeddingBatcher
+from app.services import analysis_queue
+from app.services.llm import get_llm_provider
+from app.services.job_fetcher import fetch_job_description
+from app.services.job_prefetch import JobPrefetcher, PrefetchLimitError
+from app.services.http_session import get_http_session
+from app.services.local_embeddings import LOCAL_EMBEDDING_MODEL, is_local_model, local_embedder
+from app.utils import deadline
+from app.utils.metrics import metrics
+from app.utils.pipeline import StagePipeline, StageTimeoutError
+from app.utils.similarity import cosine_matrix, pool_chunk_scores
+from app.utils.url_canonical import BlockedURLError, check_fetch_url
 import numpy as np
+from app.utils.resume_sections import SECTION_KEYWORDS, ResumeChunk, chunk_resume
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Inicialize o cliente OpenAI
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+T = TypeVar("T")
+
 
 async def validate_content_type(content_type: str) -> bool:
     """Validação aprimorada do Content-Type"""
@@ -39,98 +54,239 @@ async def validate_content_type(content_type: str) -> bool:
 
 async def validate_file_content(file: UploadFile) -> bool:
     """Nova função para validação do conteúdo do arquivo"""
-    magic_numbers = {
-        b'%PDF': '.pdf',
-        b'\xD0\xCF\x11\xE0': '.doc',
-        b'PK\x03\x04': '.docx'
-    }
-    header = await file.read(4)
+    header = await file.read(HEADER_SIZE)
     await file.seek(0)
-    return any(header.startswith(magic) for magic in magic_numbers.keys())
+    return sniff_format(header) is not None
 
 async def read_resume(file: UploadFile) -> str:
     # Validação do Content-Type
     if not await validate_content_type(file.content_type):
         raise HTTPException(status_code=400, detail="Content-Type inválido")
-    
-    # Limite de tamanho do arquivo (ex: 10MB)
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB em bytes
-    content = await file.read(MAX_FILE_SIZE + 1)
-    
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="Arquivo muito grande")
-    
-    try:
-        if file.filename.endswith('.pdf'):
-            pdf_reader = PdfReader(io.BytesIO(content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        
-        elif file.filename.endswith(('.doc', '.docx')):
-            doc = docx.Document(io.BytesIO(content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        
-        else:
-            raise HTTPException(status_code=400, detail="Formato de arquivo não suportado")
-            
-    except Exception as e:
-        logger.error(f"Erro ao processar arquivo: {str(e)}")
-        raise HTTPException(status_code=400, detail="Erro ao processar arquivo")
+
+    # Leitura única do upload, extrator escolhido pelo magic number
+    return await extract_upload_text(file)
 
 async def fetch_job_descriptions(urls: List[str]) -> List[str]:
-    descriptions = []
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_single_job(session, url) for url in urls if url.strip()]
-        descriptions = await asyncio.gather(*tasks, return_exceptions=True)
+    # Links pré-carregados por /jobs/prefetch já estão prontos (ou em andamento)
+    tasks = [asyncio.ensure_future(job_prefetcher.fetch(url)) for url in urls if url.strip()]
+    if not tasks:
+        return []
+    # Dentro do prazo da análise, segue com as vagas que ficarem prontas; as
+    # buscas interrompidas continuam em segundo plano e aquecem o cache
+    done, pending = await asyncio.wait(tasks, timeout=deadline.remaining(deadline.PARTIAL_MARGIN_SECONDS))
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Prazo esgotado com {len(pending)} de {len(tasks)} vagas pendentes")
+        metrics.counter("analysis_partial_total", stage="jobs").inc()
+    descriptions = [task.result() for task in tasks if task in done and task.exception() is None]
     return [desc for desc in descriptions if isinstance(desc, str) and desc.strip()]
 
 async def fetch_single_job(session: aiohttp.ClientSession, url: str) -> str:
-    job_site_parsers = {
-        'gupy.io': parse_gupy_job,
-        'linkedin.com': parse_linkedin_job,
-        'indeed.com': parse_indeed_job,
-        # Adicionar mais sites conforme necessário
-    }
-    
     try:
-        domain = extract_domain(url)
-        parser = job_site_parsers.get(domain, parse_generic_job)
-        return await parser(session, url)
+        # Cache compartilhado pelo link canônico, com revalidação condicional
+        return await fetch_job_description(session, url)
     except Exception as e:
         logger.error(f"Erro ao buscar vaga {url}: {str(e)}")
         return ""
 
-async def get_embedding(text: str, model="text-embedding-3-small") -> list:
-    """Gera embedding para um texto usando a API da OpenAI"""
+async def _fetch_job_text(url: str) -> str:
+    # Sessão do worker, com conexões keep-alive reaproveitadas entre análises
+    return await fetch_single_job(get_http_session(), url)
+
+def clean_job_link(link: str) -> str:
+    clean_link = link.strip()
+    if not clean_link.startswith(('http://', 'https://')):
+        clean_link = 'https://' + clean_link
+    return clean_link
+
+async def in_thread(func: Callable[..., T], *args) -> T:
+    """
+    Executa consultas síncronas do SQLAlchemy fora do event loop. Se quem
+    espera é cancelado (prazo da etapa), aguarda a consulta terminar antes
+    de propagar o cancelamento: a sessão não pode ser usada por duas threads.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
     try:
-        response = client.embeddings.create(
-            input=text,
-            model=model
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        logger.error(f"Erro ao gerar embedding: {str(e)}")
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
         raise
 
-async def analyze_resume(resume_text: str, job_descriptions: List[str]) -> dict:
+def validate_job_link(link: str) -> str:
+    """
+    Link limpo, recusado com 400 se aponta para um endereço interno. A busca
+    repete a verificação a cada redirecionamento e na resolução de DNS.
+    """
+    clean_link = clean_job_link(link)
     try:
-        # Gerar embeddings para o currículo e descrições das vagas
-        resume_embedding = await get_embedding(resume_text)
-        job_embeddings = [await get_embedding(desc) for desc in job_descriptions]
-        
-        # Calcular similaridade média com todas as descrições de vagas
-        similarities = [
-            cosine_similarity([resume_embedding], [job_emb])[0][0]
-            for job_emb in job_embeddings
-        ]
-        avg_similarity = sum(similarities) / len(similarities)
+        check_fetch_url(clean_link, settings.JOB_FETCH_ALLOW_PRIVATE_HOSTS)
+    except BlockedURLError as e:
+        logger.warning(f"Link de vaga recusado: {str(e)}")
+        raise HTTPException(status_code=400, detail="Link de vaga inválido")
+    return clean_link
+
+def require_credits(db: Session, user: User) -> None:
+    """
+    Verificação de créditos sem lock, antes de qualquer busca ou chamada à
+    OpenAI. O débito continua sob lock no momento de consumir o crédito.
+    """
+    user_credits = db.query(UserCredits).filter(UserCredits.user_id == user.id).first()
+    if not user_credits or user_credits.remaining_analyses < 1:
+        logger.warning(f"Créditos insuficientes para usuário: {user.email}")
+        raise HTTPException(
+            status_code=402,
+            detail="Créditos insuficientes. Por favor, adquira mais créditos."
+        )
+
+async def _embed_batch(texts: List[str], model: str, dimensions: int = None) -> List[list]:
+    """Uma única chamada à API para todos os textos do lote"""
+    vectors = await get_llm_provider().embed(texts, model, dimensions)
+    metrics.counter("embedding_api_calls_total", model=model).inc()
+    return vectors
+
+embedding_batcher = EmbeddingBatcher(
+    _embed_batch,
+    window_seconds=settings.EMBEDDING_BATCH_WINDOW_MS / 1000,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+    max_input_tokens=settings.EMBEDDING_MAX_INPUT_TOKENS
+)
+
+async def _embed_normalized(normalized: List[str], model: str, dimensions: int = None) -> List[np.ndarray]:
+    """Cache + cálculo dos ausentes para textos já normalizados"""
+    vectors = {}
+    missing = []
+    for text in normalized:
+        if text in vectors or text in missing:
+            continue
+        cached = embedding_cache.get(model, dimensions, text)
+        if cached is not None:
+            vectors[text] = cached
+        else:
+            missing.append(text)
+
+    if missing:
+        if is_local_model(model):
+            # Sem rede: não há o que agrupar no micro-batcher
+            computed = await asyncio.to_thread(local_embedder.embed, missing)
+        else:
+            computed = await embedding_batcher.embed(missing, model, dimensions)
+        for text, vector in zip(missing, computed):
+            vectors[text] = embedding_cache.set(model, dimensions, text, vector)
+
+    return [vectors[text] for text in normalized]
+
+async def embed_texts(texts: List[str], model: str = None, dimensions: int = None) -> Tuple[str, List[np.ndarray]]:
+    """Como get_embeddings, devolvendo também o modelo usado (o local, após fallback)"""
+    model = model or settings.EMBEDDING_MODEL
+    dimensions = None if is_local_model(model) else dimensions or settings.EMBEDDING_DIMENSIONS
+    normalized = [normalize_document(text).text for text in texts]
+
+    fallback = settings.EMBEDDING_LOCAL_FALLBACK and not is_local_model(model)
+    try:
+        # Com fallback, a API não pode consumir o prazo inteiro da etapa
+        budget = deadline.remaining(settings.EMBEDDING_LOCAL_RESERVE_SECONDS) if fallback else None
+        return model, await asyncio.wait_for(_embed_normalized(normalized, model, dimensions), timeout=budget)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            logger.error("Prazo esgotado ao gerar embedding")
+        else:
+            logger.error(f"Erro ao gerar embedding: {str(e)}")
+        if not fallback:
+            raise
+        logger.warning("Usando embeddings locais como fallback")
+        metrics.counter("embedding_local_fallback_total").inc()
+        return LOCAL_EMBEDDING_MODEL, await _embed_normalized(normalized, LOCAL_EMBEDDING_MODEL)
+
+async def get_embeddings(texts: List[str], model: str = None, dimensions: int = None) -> List[np.ndarray]:
+    """
+    Gera embeddings para vários textos usando a API da OpenAI ou, com
+    EMBEDDING_MODEL="local-hashing-v1", o backend local em CPU.
+
+    Os textos são normalizados (mesma forma usada no matcher) e os vetores
+    ficam em cache por (modelo, dimensões, hash do texto); análises repetidas
+    não chamam a API. Os textos ausentes do cache seguem, sem repetição, para
+    o micro-batcher, que os agrupa com os de outras análises concorrentes.
+
+    Se a API falhar e EMBEDDING_LOCAL_FALLBACK estiver ativo, todos os textos
+    da chamada são recalculados localmente, para que os vetores comparados
+    estejam no mesmo espaço.
+
+    Os vetores retornam como arrays float32 no formato do cache, inclusive
+    os recém-calculados, para que análises repetidas tenham o mesmo score.
+
+    Dentro de um prazo (app.utils.deadline), a API tem até o prazo menos
+    EMBEDDING_LOCAL_RESERVE_SECONDS; depois disso vale o fallback local.
+    """
+    _, vectors = await embed_texts(texts, model, dimensions)
+    return vectors
+
+job_prefetcher = JobPrefetcher(
+    _fetch_job_text,
+    get_embeddings,
+    ttl_seconds=settings.JOB_PREFETCH_TTL_SECONDS,
+    max_entries=settings.JOB_PREFETCH_MAX_ENTRIES,
+    max_per_user=settings.JOB_PREFETCH_MAX_PER_USER
+)
+
+async def get_embedding(text: str, model: str = None, dimensions: int = None) -> list:
+    """Gera embedding para um texto (ver get_embeddings), como lista de float"""
+    embeddings = await get_embeddings([text], model=model, dimensions=dimensions)
+    return embeddings[0].tolist()
+
+async def embed_resume(resume_text: str) -> Tuple[List[ResumeChunk], str, List[np.ndarray]]:
+    """Trechos do currículo, modelo usado e embeddings dos trechos"""
+    # Currículo dividido em trechos por seção; cada trecho tem seu próprio
+    # hash no cache, então uma revisão do CV só reenvia os trechos alterados
+    chunks = chunk_resume(resume_text, settings.RESUME_CHUNK_MAX_CHARS)
+    if not chunks:
+        raise ValueError("Currículo sem texto para comparar")
+    metrics.histogram("resume_chunks", buckets=(1, 2, 4, 8, 16, 32, 64)).observe(len(chunks))
+    model, vectors = await embed_texts([chunk.text for chunk in chunks])
+    return chunks, model, vectors
 
-        prompt = """Você é um especialista em análise de currículos para sistemas ATS (Applicant Tracking Systems). Siga estas etapas rigorosamente:
+async def embed_jobs(job_descriptions: List[str]) -> Tuple[str, List[np.ndarray]]:
+    if not job_descriptions:
+        raise ValueError("Nenhuma descrição de vaga para comparar")
+    return await embed_texts(list(job_descriptions))
+
+def score_similarity(
+    chunks: List[ResumeChunk],
+    chunk_embeddings: List[np.ndarray],
+    job_embeddings: List[np.ndarray]
+) -> float:
+    # Similaridade de todos os trechos com todas as vagas em um único produto
+    # de matrizes, agregada por vaga (melhor trecho + média ponderada por seção)
+    similarities = pool_chunk_scores(
+        cosine_matrix(chunk_embeddings, job_embeddings),
+        [chunk.weight for chunk in chunks],
+        settings.RESUME_CHUNK_MAX_WEIGHT
+    )
+    return float(similarities.mean())
+
+async def aligned_similarity(
+    resume_embedding: Tuple[List[ResumeChunk], str, List[np.ndarray]],
+    job_descriptions: List[str],
+    job_embedding: Tuple[str, List[np.ndarray]]
+) -> float:
+    """
+    Similaridade entre os resultados de embed_resume e embed_jobs. Se só um
+    dos lados caiu no fallback local, o outro é recalculado localmente, para
+    que os vetores comparados estejam no mesmo espaço.
+    """
+    chunks, resume_model, chunk_embeddings = resume_embedding
+    job_model, job_embeddings = job_embedding
+    if resume_model != job_model:
+        if resume_model != LOCAL_EMBEDDING_MODEL:
+            chunk_embeddings = await get_embeddings([chunk.text for chunk in chunks], LOCAL_EMBEDDING_MODEL)
+        else:
+            job_embeddings = await get_embeddings(job_descriptions, LOCAL_EMBEDDING_MODEL)
+    return score_similarity(chunks, chunk_embeddings, job_embeddings)
+
+async def generate_analysis(resume_text: str, job_descriptions: List[str], avg_similarity: float) -> dict:
+    """Análise ATS pelo modelo de chat, com os campos obrigatórios verificados"""
+    prompt = f"""Você é um especialista em análise de currículos para sistemas ATS (Applicant Tracking Systems). Siga estas etapas rigorosamente:
 
 1. **Análise da Descrição da Vaga**:
    - Extraia termos-chave da descrição da vaga usando técnicas avançadas de NLP (lematização, reconhecimento de entidades nomeadas e análise de contexto).
@@ -190,46 +346,58 @@ Formato de Saída (JSON):
   "motivational_message": ""
 }}"""
 
-        logger.info("Enviando requisição para OpenAI")
-        
-        response = client.chat.completions.create(
-            model="gpt-4-1106-preview",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "Você é um especialista em ATS e análise de currículos. Forneça análises detalhadas focando em correspondências exatas e semânticas. Retorne APENAS o JSON solicitado, sem texto adicional."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4000,
-            response_format={ "type": "json_object" }
-        )
+    logger.info("Enviando requisição para OpenAI")
+    
+    content = await get_llm_provider().complete_json(
+        model=settings.LLM_CHAT_MODEL,
+        messages=[
+            {
+                "role": "system", 
+                "content": "Você é um especialista em ATS e análise de currículos. Forneça análises detalhadas focando em correspondências exatas e semânticas. Retorne APENAS o JSON solicitado, sem texto adicional."
+            },
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=4000
+    )
 
-        logger.info("Resposta recebida da OpenAI")
-        
-        logger.debug(f"Resposta completa da OpenAI: {response.choices[0].message.content}")
+    logger.info("Resposta recebida da OpenAI")
+    
+    logger.debug(f"Resposta completa da OpenAI: {content}")
 
-        raw_analysis = json.loads(response.choices[0].message.content)
-        
-        # Verifica campos obrigatórios
-        required_fields = [
-            'job_keywords',
-            'resume_matches',
-            'semantic_similarity',
-            'missing_keywords_with_recommendations',
-            'match_percentage',
-            'motivational_message'
-        ]
-        
-        missing_fields = [field for field in required_fields if field not in raw_analysis]
-        
-        if missing_fields:
-            logger.error(f"Campos ausentes na resposta: {missing_fields}")
-            logger.error(f"Resposta recebida: {raw_analysis}")
-            raise ValueError(f"Campos obrigatórios ausentes: {missing_fields}")
+    raw_analysis = json.loads(content)
+    
+    # Verifica campos obrigatórios
+    required_fields = [
+        'job_keywords',
+        'resume_matches',
+        'semantic_similarity',
+        'missing_keywords_with_recommendations',
+        'match_percentage',
+        'motivational_message'
+    ]
+    
+    missing_fields = [field for field in required_fields if field not in raw_analysis]
+    
+    if missing_fields:
+        logger.error(f"Campos ausentes na resposta: {missing_fields}")
+        logger.error(f"Resposta recebida: {raw_analysis}")
+        raise ValueError(f"Campos obrigatórios ausentes: {missing_fields}")
 
-        return raw_analysis
+    return raw_analysis
+
+async def analyze_resume(resume_text: str, job_descriptions: List[str]) -> dict:
+    try:
+        if not job_descriptions:
+            raise ValueError("Nenhuma descrição de vaga para comparar")
+
+        # Trechos e vagas pedidos juntos: o micro-batcher os envia em uma
+        # única requisição de embeddings
+        resume_embedding, job_embedding = await asyncio.gather(
+            embed_resume(resume_text), embed_jobs(job_descriptions)
+        )
+        avg_similarity = await aligned_similarity(resume_embedding, job_descriptions, job_embedding)
+        return await generate_analysis(resume_text, job_descriptions, avg_similarity)
 
     except json.JSONDecodeError as e:
         logger.error(f"Erro ao decodificar JSON da resposta: {e}")
@@ -245,39 +413,30 @@ def normalize_text_for_comparison(text: str) -> str:
     """
     Normaliza o texto para comparação case-insensitive e remove espaços extras
     """
-    # Remove caracteres especiais mantendo espaços
-    import re
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    # Remove espaços extras
-    return ' '.join(text.split())
+    return comparison_form(text)
 
 def identify_resume_section(text: str, line_index: int) -> str:
     """
     Identifica a seção do currículo baseado no contexto
     """
-    sections = {
-        "resumo": ["resumo", "sobre mim", "perfil", "objetivo", "apresentação"],
-        "experiência": ["experiência", "experiencias", "profissional", "trabalho", "carreira"],
-        "formação": ["formação", "educação", "acadêmico", "escolaridade"],
-        "habilidades": ["habilidades", "competências", "conhecimentos", "tecnologias", "skills"],
-        "certificações": ["certificações", "certificados", "cursos", "qualificações"],
-        "idiomas": ["idiomas", "línguas"],
-        "projetos": ["projetos", "portfolio", "realizações"]
-    }
-    
-    lines = text.split('\n')
+    sections = SECTION_KEYWORDS
+
+    # Linhas normalizadas (minúsculas) calculadas uma única vez por documento;
+    # line_index refere-se a essas linhas
+    document = normalize_document(text)
+    lines = document.lines
     # Procura até 10 linhas acima para encontrar o cabeçalho da seção
-    start_index = max(0, line_index)
+    start_index = min(max(0, line_index), len(lines) - 1)
     end_index = max(-1, line_index - 11)
     
-    for i in range(start_index, end_index, -1):
-        line_lower = lines[i].lower().strip()
+    for i in range(start_index, end_index, -1) if lines else ():
+        line_lower = lines[i]
         for section_name, keywords in sections.items():
             if any(keyword in line_lower for keyword in keywords):
                 return section_name.title()
     
     # Se não encontrar seção específica, procura em todo o texto
-    text_lower = text.lower()
+    text_lower = document.text
     for section_name, keywords in sections.items():
         if any(keyword in text_lower for keyword in keywords):
             return section_name.title()
@@ -289,19 +448,21 @@ def validate_keyword_match(keyword: str, text: str) -> tuple[bool, str]:
     Valida se há uma correspondência exata da palavra-chave no texto e retorna a seção
     """
     normalized_keyword = normalize_text_for_comparison(keyword)
-    lines = text.split('\n')
+    if not normalized_keyword:
+        return False, ""
+
+    # Normalização do currículo feita uma única vez e reutilizada para todas as palavras-chave
+    document = normalize_document(text)
     
     # Padrão para encontrar a palavra exata, considerando limites de palavra
-    import re
-    keyword_pattern = r'\b' + re.escape(normalized_keyword) + r'\b'
+    keyword_pattern = re.compile(r'\b' + re.escape(normalized_keyword) + r'\b')
+    keyword_words = normalized_keyword.split()
     
-    for i, line in enumerate(lines):
-        normalized_line = normalize_text_for_comparison(line)
-        match = re.search(keyword_pattern, normalized_line)
+    for i, normalized_line in enumerate(document.match_lines):
+        match = keyword_pattern.search(normalized_line)
         if match:
             # Verifica o contexto da linha para garantir que é uma correspondência válida
             words_in_line = normalized_line.split()
-            keyword_words = normalized_keyword.split()
             
             # Verifica se todas as palavras da keyword estão presentes na linha na mesma ordem
             for j in range(len(words_in_line) - len(keyword_words) + 1):
@@ -490,20 +651,87 @@ def remove_duplicate_keywords(analysis_result: dict) -> dict:
     
     return analysis_result
 
-@router.post("/analyze")
-async def analyze_cv(
-    file: UploadFile = File(...),
-    job_links: List[str] = Form(...),
+@router.post("/jobs/prefetch")
+async def prefetch_job(
+    job_link: str = Form(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """
+    Começa a buscar, parsear e calcular o embedding da vaga em segundo plano,
+    para o frontend chamar assim que o link é colado. O /analyze com o mesmo
+    link aproveita o resultado; o handle serve para consultar o andamento.
+
+    Só para quem tem créditos, com links para hosts públicos e um número
+    limitado de handles ativos por usuário (JOB_PREFETCH_MAX_PER_USER).
+    """
+    if not job_link or not job_link.strip():
+        raise HTTPException(status_code=400, detail="Link de vaga vazio")
+    link = validate_job_link(job_link)
+    require_credits(db, current_user)
     try:
-        logger.info(f"Iniciando análise para usuário: {current_user.email}")
-        
-        # Verificar créditos com lock para evitar condições de corrida
-        user_credits = db.query(UserCredits).filter(
+        entry = job_prefetcher.start(link, current_user.id)
+    except PrefetchLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"handle": entry.handle, "status": entry.status}
+
+@router.get("/jobs/prefetch/{handle}")
+async def prefetch_job_status(
+    handle: str,
+    current_user: User = Depends(get_current_user)
+):
+    entry = job_prefetcher.get(handle, current_user.id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Pré-carregamento não encontrado ou expirado")
+    return {"handle": entry.handle, "status": entry.status}
+
+def build_analysis_pipeline(
+    load_resume: Callable[[], Awaitable[str]],
+    job_links: List[str],
+    current_user: User,
+    db: Session
+) -> StagePipeline:
+    """
+    Etapas da análise e suas dependências:
+
+        resume ──┬── credits ──────────────────────────────┐
+                 └── resume_embedding ──┬── similarity ────┴── generation
+        jobs ────── job_embedding ──────┘
+
+    A extração do currículo (CPU) se sobrepõe à busca das vagas (rede), e o
+    embedding de cada lado começa assim que o seu texto fica pronto. Como as
+    vagas e os embeddings não esperam por `credits`, quem chama verifica os
+    créditos antes (require_credits); `credits` repete a verificação com lock.
+    Executado com `run(settings.ANALYSIS_DEADLINE_SECONDS)`: extração e busca
+    de vagas devolvem o que conseguiram até o prazo da etapa (texto parcial,
+    uma das duas vagas) e os embeddings caem no fallback local.
+    """
+    timeouts = settings.ANALYSIS_STAGE_TIMEOUTS
+
+    async def resume():
+        return await load_resume()
+
+    async def jobs():
+        descriptions = await fetch_job_descriptions(job_links)
+        if not descriptions:
+            raise ValueError("Nenhuma descrição de vaga pôde ser obtida")
+        return descriptions
+
+    def lock_credits(lock_timeout_ms: int) -> Optional[UserCredits]:
+        db.execute(sql_text(f"SET LOCAL lock_timeout = '{max(1, lock_timeout_ms)}ms'"))
+        # populate_existing: a verificação prévia (require_credits) já
+        # carregou a linha na sessão; o saldo tem de vir da leitura com lock
+        return db.query(UserCredits).filter(
             UserCredits.user_id == current_user.id
-        ).with_for_update().first()
+        ).with_for_update().populate_existing().first()
+
+    async def credits(resume):
+        # Depois do currículo: arquivos inválidos ou digitalizados são
+        # rejeitados sem segurar a linha de créditos nem chamar a OpenAI.
+        # A espera pelo lock também respeita o prazo da etapa, e acontece
+        # fora do event loop
+        lock_timeout_ms = int((deadline.remaining() or timeouts.get("credits", 5)) * 1000)
+        user_credits = await in_thread(lock_credits, lock_timeout_ms)
 
         logger.info(f"Créditos antes da análise: {user_credits.remaining_analyses if user_credits else 0}")
 
@@ -513,47 +741,131 @@ async def analyze_cv(
                 status_code=402,
                 detail="Créditos insuficientes. Por favor, adquira mais créditos."
             )
+        return user_credits
 
-        cleaned_links = []
-        for link in job_links:
-            if link and isinstance(link, str) and link.strip():
-                clean_link = link.strip()
-                if not clean_link.startswith(('http://', 'https://')):
-                    clean_link = 'https://' + clean_link
-                cleaned_links.append(clean_link)
-        
-        logger.info(f"Links processados: {cleaned_links}")
+    async def resume_embedding(resume):
+        return await embed_resume(resume)
 
-        if not cleaned_links:
-            raise HTTPException(
-                status_code=400,
-                detail="É necessário fornecer pelo menos um link de vaga para análise"
-            )
+    async def job_embedding(jobs):
+        return await embed_jobs(jobs)
 
-        if len(cleaned_links) > 2:
+    async def similarity(jobs, resume_embedding, job_embedding):
+        return await aligned_similarity(resume_embedding, jobs, job_embedding)
+
+    async def generation(resume, jobs, credits, similarity):
+        return await generate_analysis(resume, jobs, similarity)
+
+    return (
+        StagePipeline("analysis")
+        .add("resume", resume, timeout=timeouts.get("resume"))
+        .add("jobs", jobs, timeout=timeouts.get("jobs"))
+        .add("credits", credits, deps=["resume"], timeout=timeouts.get("credits"))
+        .add("resume_embedding", resume_embedding, deps=["resume"], timeout=timeouts.get("resume_embedding"))
+        .add("job_embedding", job_embedding, deps=["jobs"], timeout=timeouts.get("job_embedding"))
+        .add("similarity", similarity, deps=["jobs", "resume_embedding", "job_embedding"],
+             timeout=timeouts.get("similarity"))
+        .add("generation", generation, deps=["resume", "jobs", "credits", "similarity"],
+             timeout=timeouts.get("generation"))
+    )
+
+def validate_job_links(job_links: List[str]) -> List[str]:
+    cleaned_links = []
+    for link in job_links:
+        if link and isinstance(link, str) and link.strip():
+            cleaned_links.append(validate_job_link(link))
+    
+    logger.info(f"Links processados: {cleaned_links}")
+
+    if not cleaned_links:
+        raise HTTPException(
+            status_code=400,
+            detail="É necessário fornecer pelo menos um link de vaga para análise"
+        )
+
+    if len(cleaned_links) > 2:
+        raise HTTPException(
+            status_code=400,
+            detail="Máximo de 2 links de vagas permitidos por análise"
+        )
+    return cleaned_links
+
+def mark_partial(analysis: dict, results: dict, job_links: List[str]) -> None:
+    if isinstance(analysis, dict) and len(results["jobs"]) < len(job_links):
+        # Alguma vaga não foi obtida (falha ou prazo): a análise cobre só as demais
+        analysis["partial"] = {
+            "jobs_requested": len(job_links),
+            "jobs_analyzed": len(results["jobs"])
+        }
+
+def is_valid_analysis(analysis) -> bool:
+    """
+    Só análises com palavras-chave extraídas consomem crédito, tanto em
+    /analyze quanto na fila
+    """
+    return (
+        isinstance(analysis, dict) and
+        'error' not in analysis and
+        'extracted_keywords' in analysis and
+        'keywords' in analysis and
+        len(analysis.get('extracted_keywords', {}).get('all_keywords', [])) > 0
+    )
+
+INVALID_ANALYSIS_MESSAGE = "A análise não retornou resultados válidos. Nenhum crédito foi consumido."
+
+def timeout_detail(error: StageTimeoutError, pipeline: StagePipeline) -> dict:
+    """Resposta 504: etapa que estourou o prazo e o que já estava pronto"""
+    partial = {}
+    if "similarity" in pipeline.results:
+        partial["semantic_similarity"] = f"{pipeline.results['similarity']:.2f}"
+    if "jobs" in pipeline.results:
+        partial["jobs_fetched"] = len(pipeline.results["jobs"])
+    return {
+        "outcome": "timeout",
+        "stage": error.stage,
+        "message": f"A análise excedeu o tempo limite na etapa '{error.stage}'. Nenhum crédito foi consumido.",
+        "partial": partial
+    }
+
+@router.post("/analyze")
+async def analyze_cv(
+    file: UploadFile = File(...),
+    job_links: List[str] = Form(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        logger.info(f"Iniciando análise para usuário: {current_user.email}")
+
+        cleaned_links = validate_job_links(job_links)
+        # Sem créditos, nada de buscar vagas nem chamar a OpenAI
+        require_credits(db, current_user)
+
+        pipeline = build_analysis_pipeline(lambda: read_resume(file), cleaned_links, current_user, db)
+        try:
+            results = await pipeline.run(settings.ANALYSIS_DEADLINE_SECONDS)
+        except HTTPException:
+            db.rollback()
+            raise
+        except StageTimeoutError as e:
+            logger.error(f"Tempo limite na análise: {str(e)}")
+            db.rollback()
+            raise HTTPException(status_code=504, detail=timeout_detail(e, pipeline))
+        except Exception as e:
+            logger.error(f"Erro durante o processo de análise: {str(e)}")
+            db.rollback()
             raise HTTPException(
-                status_code=400,
-                detail="Máximo de 2 links de vagas permitidos por análise"
+                status_code=500,
+                detail=f"Erro durante a análise: {str(e)}"
             )
 
+        analysis = results["generation"]
+        user_credits = results["credits"]
+        logger.info("Análise realizada com sucesso")
+        mark_partial(analysis, results, cleaned_links)
+
         try:
-            resume_text = await read_resume(file)
-            logger.info("Currículo lido com sucesso")
-            
-            job_descriptions = await fetch_job_descriptions(cleaned_links)
-            logger.info("Descrições das vagas obtidas com sucesso")
-            
-            analysis = await analyze_resume(resume_text, job_descriptions)
-            logger.info("Análise realizada com sucesso")
-            
             # Verificar se a análise retornou resultados válidos
-            if (
-                isinstance(analysis, dict) and
-                'error' not in analysis and
-                'extracted_keywords' in analysis and
-                'keywords' in analysis and
-                len(analysis.get('extracted_keywords', {}).get('all_keywords', [])) > 0
-            ):
+            if is_valid_analysis(analysis):
                 # Só deduz créditos se a análise foi bem-sucedida e retornou palavras-chave
                 user_credits.remaining_analyses -= 1
                 try:
@@ -573,7 +885,7 @@ async def analyze_cv(
                 db.rollback()
                 raise HTTPException(
                     status_code=500,
-                    detail="A análise não retornou resultados válidos. Nenhum crédito foi consumido."
+                    detail=INVALID_ANALYSIS_MESSAGE
                 )
 
         except Exception as e:
@@ -593,6 +905,160 @@ async def analyze_cv(
             detail=f"Erro interno do servidor: {str(e)}"
         )
 
+@router.post("/analyze/submit", status_code=202)
+async def submit_analysis(
+    file: UploadFile = File(...),
+    job_links: List[str] = Form(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Modo assíncrono de /analyze: valida os links e o arquivo e enfileira a
+    análise para os workers (scripts/analysis_worker.py). O andamento é
+    consultado em GET /analyze/{id}; o crédito só é debitado quando a análise
+    conclui.
+
+    Aqui só rodam as verificações rápidas do arquivo (check_upload: formato,
+    cache de texto e PDFs digitalizados), para recusar arquivos inválidos na
+    hora. A extração completa fica com o worker: o arquivo vai na própria
+    linha da fila, a não ser que o texto já esteja no cache.
+
+    Cada usuário tem no máximo ANALYSIS_QUEUE_MAX_PENDING_PER_USER análises
+    na fila ou em execução, e não mais do que os créditos restantes (429).
+    """
+    cleaned_links = validate_job_links(job_links)
+    require_credits(db, current_user)
+    if not await validate_content_type(file.content_type):
+        raise HTTPException(status_code=400, detail="Content-Type inválido")
+
+    upload = await ingest_upload(file, settings.MAX_UPLOAD_SIZE)
+    with upload:
+        resume_text = await check_upload(upload)
+        resume_file = upload.read_bytes() if resume_text is None else None
+
+    def enqueue_job() -> AnalysisJob:
+        # O lock nos créditos serializa os envios do usuário: dois envios
+        # simultâneos não passam do limite contando as mesmas análises
+        user_credits = db.query(UserCredits).filter(
+            UserCredits.user_id == current_user.id
+        ).with_for_update().first()
+        remaining = user_credits.remaining_analyses if user_credits else 0
+        pending = analysis_queue.count_pending(db, current_user.id)
+        if pending >= min(remaining, settings.ANALYSIS_QUEUE_MAX_PENDING_PER_USER):
+            db.rollback()
+            logger.warning(f"Limite de análises pendentes para usuário: {current_user.email} ({pending})")
+            raise HTTPException(
+                status_code=429,
+                detail="Limite de análises em andamento atingido. Aguarde a conclusão das anteriores."
+            )
+        job = analysis_queue.enqueue(
+            db, current_user.id, resume_text, cleaned_links, settings.ANALYSIS_QUEUE_MAX_ATTEMPTS,
+            resume_file=resume_file
+        )
+        db.commit()
+        return job
+
+    try:
+        job = await in_thread(enqueue_job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar análise: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Erro ao enfileirar análise")
+
+    logger.info(f"Análise {job.id} enfileirada para usuário: {current_user.email}")
+    return {"id": str(job.id), "status": job.status}
+
+@router.get("/analyze/{job_id}")
+async def get_analysis(
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    job = analysis_queue.get_job(db, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Análise não encontrada")
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error if job.status == "failed" else None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at
+    }
+
+async def run_analysis_job(db: Session, job: AnalysisJob, worker_id: str) -> Optional[str]:
+    """
+    Executa uma análise da fila com o mesmo pipeline de /analyze; a etapa
+    do currículo extrai o arquivo guardado no envio, se o texto ainda não
+    estava no cache. Como em /analyze, só análises válidas
+    (is_valid_analysis) debitam o crédito, no mesmo commit do resultado; as
+    demais falham sem nova tentativa. Retorna o novo status, ou None se o
+    lease foi perdido.
+
+    As consultas síncronas ao banco rodam fora do event loop (in_thread),
+    que é compartilhado com as outras análises do worker.
+    """
+    async def load_resume():
+        if job.resume_text is not None:
+            return job.resume_text
+        return await extract_stored_text(job.resume_file)
+
+    retry_delay = settings.ANALYSIS_QUEUE_RETRY_DELAY_SECONDS
+
+    def load_user() -> Optional[User]:
+        user = db.query(User).filter(User.id == job.user_id).first()
+        if user is not None:
+            require_credits(db, user)
+        return user
+
+    def fail(error: str, retry: bool = True) -> Optional[str]:
+        db.rollback()
+        return analysis_queue.fail(db, job.id, worker_id, error, retry=retry, retry_delay=retry_delay)
+
+    def complete(result_json: str, user_credits: UserCredits) -> bool:
+        if not analysis_queue.complete(db, job.id, worker_id, result_json):
+            db.rollback()
+            return False
+        user_credits.remaining_analyses -= 1
+        db.commit()
+        return True
+
+    try:
+        user = await in_thread(load_user)
+    except HTTPException as e:
+        return await in_thread(fail, str(e.detail), False)
+    if user is None:
+        return await in_thread(fail, "Usuário não encontrado", False)
+
+    job_links = list(job.job_links)
+    pipeline = build_analysis_pipeline(load_resume, job_links, user, db)
+    try:
+        results = await pipeline.run(settings.ANALYSIS_DEADLINE_SECONDS)
+    except HTTPException as e:
+        # Erros do cliente (ex.: créditos insuficientes) não mudam ao tentar de novo
+        return await in_thread(fail, str(e.detail), e.status_code >= 500)
+    except StageTimeoutError as e:
+        return await in_thread(fail, timeout_detail(e, pipeline)["message"])
+    except Exception as e:
+        logger.error(f"Erro na análise {job.id}: {str(e)}")
+        return await in_thread(fail, f"Erro durante a análise: {str(e)}")
+
+    analysis = results["generation"]
+    if not is_valid_analysis(analysis):
+        logger.error(f"Análise {job.id} retornou resultado vazio ou inválido")
+        return await in_thread(fail, INVALID_ANALYSIS_MESSAGE, False)
+
+    mark_partial(analysis, results, job_links)
+    if not await in_thread(complete, json.dumps(analysis, ensure_ascii=False), results["credits"]):
+        logger.warning(f"Lease da análise {job.id} expirou antes da conclusão; resultado descartado")
+        return None
+
+    logger.info(f"Análise {job.id} concluída; créditos restantes: {results['credits'].remaining_analyses}")
+    return "done"
+
 @router.post("/test-analysis")
 async def test_cv_analysis():
     test_results = []
@@ -0,0 +1,181 @@
+"""
+Fila de análises em Postgres, sem broker externo.
+
+Workers (scripts/analysis_worker.py) pegam análises com
+`SELECT ... FOR UPDATE SKIP LOCKED`, então vários processos ou máquinas
+consomem a mesma tabela sem disputar a mesma linha. Ao pegar uma análise, o
+worker recebe um prazo de visibilidade (lease): se ele morrer, a linha volta
+a ser visível quando o prazo vence e outro worker a executa, até
+`max_attempts` tentativas. Conclusões e falhas só valem para o worker que
+ainda detém o lease (`locked_by`).
+"""
+import logging
+import uuid
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session, undefer
+from app.models.analysis_job import AnalysisJob
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_EXPIRE_EXHAUSTED = text("""
+    UPDATE analysis_jobs
+    SET status = 'failed',
+        error = 'Prazo de visibilidade esgotado em todas as tentativas',
+        resume_file = NULL,
+        locked_by = NULL,
+        finished_at = now(),
+        updated_at = now()
+    WHERE status = 'running'
+      AND visible_at <= now()
+      AND attempts >= max_attempts
+""")
+
+_CLAIM = text("""
+    UPDATE analysis_jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_by = :worker_id,
+        visible_at = now() + make_interval(secs => :visibility_timeout),
+        updated_at = now()
+    WHERE id = (
+        SELECT id FROM analysis_jobs
+        WHERE status IN ('queued', 'running')
+          AND visible_at <= now()
+          AND attempts < max_attempts
+        ORDER BY visible_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id
+""")
+
+_COMPLETE = text("""
+    UPDATE analysis_jobs
+    SET status = 'done',
+        result = CAST(:result AS JSONB),
+        error = NULL,
+        resume_file = NULL,
+        locked_by = NULL,
+        finished_at = now(),
+        updated_at = now()
+    WHERE id = :job_id AND status = 'running' AND locked_by = :worker_id
+""")
+
+_FAIL = text("""
+    UPDATE analysis_jobs
+    SET status = CASE WHEN :retry AND attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        visible_at = now() + make_interval(secs => :retry_delay * attempts),
+        error = :error,
+        resume_file = CASE WHEN :retry AND attempts < max_attempts THEN resume_file END,
+        locked_by = NULL,
+        finished_at = CASE WHEN :retry AND attempts < max_attempts THEN NULL ELSE now() END,
+        updated_at = now()
+    WHERE id = :job_id AND status = 'running' AND locked_by = :worker_id
+    RETURNING status
+""")
+
+
+def enqueue(
+    db: Session,
+    user_id: uuid.UUID,
+    resume_text: Optional[str],
+    job_links: List[str],
+    max_attempts: int = 3,
+    resume_file: Optional[bytes] = None
+) -> AnalysisJob:
+    """
+    Insere a análise na fila; o commit fica com quem chama. Sem o texto do
+    currículo, `resume_file` leva o arquivo enviado para o worker extrair;
+    ele é apagado quando a análise termina (concluída ou falha definitiva).
+    """
+    if resume_text is None and resume_file is None:
+        raise ValueError("Informe o texto ou o arquivo do currículo")
+    job = AnalysisJob(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        status="queued",
+        resume_text=resume_text,
+        resume_file=resume_file,
+        job_links=job_links,
+        attempts=0,
+        max_attempts=max_attempts
+    )
+    db.add(job)
+    db.flush()
+    metrics.counter("analysis_queue_jobs_total", event="enqueued").inc()
+    return job
+
+
+def count_pending(db: Session, user_id: uuid.UUID) -> int:
+    """Análises do usuário ainda na fila ou em execução"""
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.user_id == user_id,
+        AnalysisJob.status.in_(("queued", "running"))
+    ).count()
+
+
+def claim(db: Session, worker_id: str, visibility_timeout: float) -> Optional[AnalysisJob]:
+    """
+    Pega a próxima análise visível (na fila ou com lease vencido) e a marca
+    como em execução por `visibility_timeout` segundos. Confirma a transação.
+    Único ponto que carrega `resume_file`, adiado nas demais consultas.
+    """
+    expired = db.execute(_EXPIRE_EXHAUSTED).rowcount
+    if expired:
+        logger.warning(f"{expired} análises falharam por esgotar as tentativas")
+        metrics.counter("analysis_queue_jobs_total", event="exhausted").inc(expired)
+
+    row = db.execute(_CLAIM, {"worker_id": worker_id, "visibility_timeout": visibility_timeout}).first()
+    db.commit()
+    if row is None:
+        return None
+    metrics.counter("analysis_queue_jobs_total", event="claimed").inc()
+    return db.get(AnalysisJob, row.id, populate_existing=True, options=[undefer(AnalysisJob.resume_file)])
+
+
+def complete(db: Session, job_id: uuid.UUID, worker_id: str, result_json: str) -> bool:
+    """
+    Registra o resultado (JSON serializado). Não confirma a transação, para
+    que quem chama possa debitar o crédito no mesmo commit. Retorna False se
+    o worker perdeu o lease.
+    """
+    updated = db.execute(_COMPLETE, {"job_id": job_id, "worker_id": worker_id, "result": result_json}).rowcount
+    if updated:
+        metrics.counter("analysis_queue_jobs_total", event="done").inc()
+    return bool(updated)
+
+
+def fail(
+    db: Session,
+    job_id: uuid.UUID,
+    worker_id: str,
+    error: str,
+    retry: bool = True,
+    retry_delay: float = 10
+) -> Optional[str]:
+    """
+    Registra a falha e confirma a transação. Com `retry`, a análise volta à
+    fila após `retry_delay * tentativas` segundos enquanto houver tentativas.
+    Retorna o novo status, ou None se o worker perdeu o lease.
+    """
+    row = db.execute(_FAIL, {
+        "job_id": job_id,
+        "worker_id": worker_id,
+        "error": error,
+        "retry": retry,
+        "retry_delay": retry_delay
+    }).first()
+    db.commit()
+    if row is None:
+        return None
+    metrics.counter("analysis_queue_jobs_total", event="retried" if row.status == "queued" else "failed").inc()
+    return row.status
+
+
+def get_job(db: Session, job_id: uuid.UUID, user_id: uuid.UUID) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.id == job_id,
+        AnalysisJob.user_id == user_id
+    ).first()
@@ -0,0 +1,132 @@
+"""
+Backend de LLM falso e determinístico, para testes e testes de carga offline.
+
+As mesmas funções atendem o FakeLLMProvider (em processo) e o servidor HTTP
+compatível com a API da OpenAI (create_fake_app), que permite exercitar o
+OpenAIProvider real, com pool de conexões, sem sair da máquina.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import re
+import time
+from typing import List, Optional
+from aiohttp import web
+
+FAKE_EMBEDDING_DIMENSIONS = 256
+
+_WORD = re.compile(r"\w+")
+_SKILL = re.compile(r"\b[A-Z][\w+#.]*\b")
+
+
+def fake_embedding(text: str, dimensions: Optional[int] = None) -> List[float]:
+    """
+    Vetor determinístico por hashing das palavras: textos com vocabulário em
+    comum têm similaridade de cosseno positiva, como embeddings reais.
+    """
+    dimensions = dimensions or FAKE_EMBEDDING_DIMENSIONS
+    vector = [0.0] * dimensions
+    for word in _WORD.findall(text.lower()):
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def fake_analysis(prompt: str) -> str:
+    """
+    Resposta JSON com todos os campos exigidos por analyze_resume, incluindo
+    as palavras-chave que /cv/analyze exige para aceitar (e cobrar) a análise
+    """
+    skills = sorted(set(_SKILL.findall(prompt)))[:10]
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    percentage = digest[0] % 101
+    return json.dumps({
+        "job_keywords": {
+            "technical_skills": skills,
+            "activities": [],
+            "requirements": []
+        },
+        "resume_matches": {
+            "exact_matches": skills[:5],
+            "partial_matches": [],
+            "missing_critical": skills[5:]
+        },
+        "semantic_similarity": {
+            "score": f"{percentage / 100:.2f}",
+            "matches": []
+        },
+        "extracted_keywords": {
+            "all_keywords": skills
+        },
+        "keywords": {
+            "present": [f"{skill} - Em: Experiência" for skill in skills[:5]],
+            "missing": [f"{skill} - Add em: Habilidades" for skill in skills[5:]]
+        },
+        "missing_keywords_with_recommendations": [],
+        "match_percentage": f"{percentage}%",
+        "motivational_message": "Análise gerada pelo backend falso."
+    }, ensure_ascii=False)
+
+
+def _usage(tokens: int) -> dict:
+    return {"prompt_tokens": tokens, "completion_tokens": 0, "total_tokens": tokens}
+
+
+def create_fake_app(latency_seconds: float = 0.0) -> web.Application:
+    """
+    Servidor compatível com /v1/embeddings e /v1/chat/completions, além de
+    páginas de vaga em /vagas/{id}.
+    `latency_seconds` simula o tempo de resposta do provedor.
+    """
+    async def embeddings(request: web.Request) -> web.Response:
+        body = await request.json()
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        await asyncio.sleep(latency_seconds)
+        data = [
+            {"object": "embedding", "index": index, "embedding": fake_embedding(text, body.get("dimensions"))}
+            for index, text in enumerate(inputs)
+        ]
+        return web.json_response({
+            "object": "list",
+            "data": data,
+            "model": body["model"],
+            "usage": _usage(sum(len(text) // 4 for text in inputs))
+        })
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        await asyncio.sleep(latency_seconds)
+        return web.json_response({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": fake_analysis(prompt)},
+                "finish_reason": "stop"
+            }],
+            "usage": _usage(len(prompt) // 4)
+        })
+
+    async def job_page(request: web.Request) -> web.Response:
+        # Página de vaga estática, para exercitar a busca de vagas offline
+        job_id = request.match_info["job_id"]
+        return web.Response(content_type="text/html", text=(
+            f"<html><head><title>Vaga {job_id}</title></head><body>"
+            f"<h1>Desenvolvedor Python {job_id}</h1>"
+            "<p>Requisitos: Python, FastAPI, AWS, Docker, PostgreSQL e Scrum.</p>"
+            "</body></html>"
+        ))
+
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app.router.add_post("/v1/embeddings", embeddings)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/vagas/{job_id}", job_page)
+    return app
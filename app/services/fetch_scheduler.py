@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ThrottledError(Exception):
+    """O site respondeu 429/503 ou está em período de espera (Retry-After)"""
+
+    def __init__(self, domain: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(f"{domain} limitou as requisições (status={status}, retry_after={retry_after})")
+        self.domain = domain
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After em segundos ou data HTTP; None se ausente ou inválido"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Limita a taxa de requisições; `rate` pode ser ajustado em tempo de execução"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _DomainState:
+    def __init__(self, concurrency: int, rate: float, burst: float):
+        self.concurrency = concurrency
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.backoff = 0.0
+        self.backoff_until = 0.0
+
+
+class FetchScheduler:
+    """
+    Agenda buscas HTTP por domínio:
+    - limite de requisições simultâneas e token bucket de taxa por domínio
+    - single-flight: buscas simultâneas da mesma chave compartilham uma requisição
+    - backoff adaptativo em 429/503: respeita Retry-After, dobra a espera a cada
+      limitação seguida e reduz a taxa pela metade, recuperando aos poucos
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate: float = 2.0,
+        burst: float = 4.0,
+        domain_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_retries: int = 2,
+        max_backoff: float = 30.0,
+        min_rate: float = 0.1
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.domain_limits = domain_limits or {}
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.min_rate = min_rate
+        self._domains: Dict[str, _DomainState] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            limits = self.domain_limits.get(domain, {})
+            state = self._domains[domain] = _DomainState(
+                concurrency=int(limits.get("concurrency", self.concurrency)),
+                rate=float(limits.get("rate", self.rate)),
+                burst=float(limits.get("burst", self.burst))
+            )
+        if state.semaphore is None:
+            # Criado dentro do event loop em execução
+            state.semaphore = asyncio.Semaphore(state.concurrency)
+        return state
+
+    async def run(self, key: str, domain: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Executa `fetch` respeitando os limites do domínio; chaves iguais em voo são unificadas"""
+        task = self._inflight.get(key)
+        if task is not None:
+            metrics.counter("job_fetch_coalesced_total", domain=domain).inc()
+        else:
+            task = asyncio.ensure_future(self._run_scheduled(domain, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: o cancelamento de um dos interessados não cancela a busca dos demais
+        return await asyncio.shield(task)
+
+    async def _run_scheduled(self, domain: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        state = self._state(domain)
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            async with state.semaphore:
+                wait = state.backoff_until - time.monotonic()
+                if wait > self.max_backoff:
+                    # Espera maior que o aceitável para uma análise: falha rápido
+                    metrics.counter("job_fetch_throttled_total", domain=domain, status="backoff").inc()
+                    raise ThrottledError(domain, retry_after=wait)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await state.bucket.acquire()
+                metrics.histogram("job_fetch_queue_wait_seconds", domain=domain).observe(
+                    time.perf_counter() - queued_at
+                )
+
+                try:
+                    result = await fetch()
+                except ThrottledError as e:
+                    self._throttled(domain, state, e)
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        raise
+                    continue
+
+            self._succeeded(domain, state)
+            return result
+
+    def _throttled(self, domain: str, state: _DomainState, error: ThrottledError) -> None:
+        metrics.counter("job_fetch_throttled_total", domain=domain, status=str(error.status)).inc()
+        state.backoff = min(self.max_backoff * 4, max(1.0, state.backoff * 2))
+        delay = max(state.backoff, error.retry_after or 0.0)
+        state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+        state.bucket.rate = max(self.min_rate, state.bucket.rate / 2)
+        metrics.gauge("job_fetch_rate", domain=domain).set(state.bucket.rate)
+        metrics.gauge("job_fetch_backoff_seconds", domain=domain).set(delay)
+        logger.warning(f"{domain} limitou as requisições; aguardando {delay:.1f}s "
+                       f"(taxa {state.bucket.rate:.2f}/s)")
+
+    def _succeeded(self, domain: str, state: _DomainState) -> None:
+        state.backoff = 0.0
+        if state.bucket.rate < state.base_rate:
+            state.bucket.rate = min(state.base_rate, state.bucket.rate + state.base_rate * 0.1)
+            metrics.gauge("job_fetch_rate", domain=domain).set(state.bucket.rate)
@@ -0,0 +1,83 @@
+import logging
+import socket
+from typing import Any, Dict, List, Optional
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+from app.config.settings import settings
+from app.utils import url_canonical
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; CVSemFrescura/1.0; +https://cvsemfrescura.com.br)"
+
+
+class PublicResolver(AbstractResolver):
+    """
+    Resolve os hosts e descarta endereços não públicos (ver
+    url_canonical.is_public_address). A conexão usa exatamente os endereços
+    devolvidos aqui, sem nova consulta de DNS, então um domínio que passa a
+    resolver para um endereço interno (DNS rebinding) não é alcançado.
+    """
+
+    def __init__(self, resolver: Optional[AbstractResolver] = None):
+        self._resolver = resolver or DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        hosts = await self._resolver.resolve(host, port, family)
+        allowed = [entry for entry in hosts if url_canonical.is_public_address(entry["host"])]
+        if not allowed:
+            raise OSError(f"{host} não resolve para um endereço público")
+        return allowed
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Sessão HTTP de saída (busca de vagas), com pool de conexões keep-alive,
+    cache de DNS e limites por host compartilhados por todas as requisições.
+    Só conecta a endereços públicos (PublicResolver), a não ser com
+    JOB_FETCH_ALLOW_PRIVATE_HOSTS.
+    """
+    connector = aiohttp.TCPConnector(
+        resolver=None if settings.JOB_FETCH_ALLOW_PRIVATE_HOSTS else PublicResolver(),
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.JOB_FETCH_TIMEOUT_SECONDS,
+        sock_connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        sock_read=settings.HTTP_READ_TIMEOUT_SECONDS
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT, "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8"},
+        # Limita cabeçalhos gigantes de servidores mal configurados
+        max_line_size=16 * 1024,
+        max_field_size=16 * 1024
+    )
+
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Sessão do worker, aberta no lifespan (ou no primeiro uso, fora da API)"""
+    global _session
+    if _session is None or _session.closed:
+        _session = create_http_session()
+    return _session
+
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
@@ -0,0 +1,231 @@
+import codecs
+import contextlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, Optional, Tuple
+import aiohttp
+from yarl import URL
+from app.config.settings import settings
+from app.services.fetch_scheduler import FetchScheduler, ThrottledError, parse_retry_after
+from app.services.job_parsers import create_page_parser
+from app.utils.cache import TieredCache
+from app.utils.metrics import metrics
+from app.utils.url_canonical import canonicalize_url, check_fetch_url, extract_domain
+
+logger = logging.getLogger(__name__)
+
+BYTE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024, 2 * 1024 * 1024, 4 * 1024 * 1024)
+
+
+@dataclass
+class JobCacheEntry:
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    # Duração da última busca completa, usada para estimar o tempo economizado
+    fetch_seconds: float
+
+    def to_bytes(self) -> bytes:
+        return json.dumps(asdict(self), ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "JobCacheEntry":
+        return cls(**json.loads(data.decode("utf-8")))
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+job_cache = TieredCache(
+    "job",
+    memory_bytes=settings.JOB_CACHE_MEMORY_BYTES,
+    store_path=os.path.join(settings.CACHE_DIR, "job_descriptions.sqlite3") if settings.CACHE_DIR else None,
+    ttl_seconds=settings.JOB_CACHE_TTL_SECONDS
+)
+
+job_scheduler = FetchScheduler(
+    concurrency=settings.JOB_FETCH_CONCURRENCY_PER_DOMAIN,
+    rate=settings.JOB_FETCH_RATE_PER_DOMAIN,
+    burst=settings.JOB_FETCH_BURST_PER_DOMAIN,
+    domain_limits=settings.JOB_FETCH_DOMAIN_LIMITS,
+    max_retries=settings.JOB_FETCH_MAX_RETRIES,
+    max_backoff=settings.JOB_FETCH_MAX_BACKOFF_SECONDS
+)
+
+
+def _encoding(response: aiohttp.ClientResponse) -> str:
+    try:
+        return codecs.lookup(response.get_encoding()).name
+    except (LookupError, RuntimeError):
+        return "utf-8"
+
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+@contextlib.asynccontextmanager
+async def open_job_page(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Dict[str, str]
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    GET com os redirecionamentos seguidos aqui, e não pelo aiohttp: cada
+    destino passa por check_fetch_url antes de ser buscado, então um link
+    público não leva o servidor a um endereço interno.
+    """
+    for _ in range(settings.JOB_FETCH_MAX_REDIRECTS + 1):
+        check_fetch_url(url, settings.JOB_FETCH_ALLOW_PRIVATE_HOSTS)
+        async with session.get(url, headers=headers, allow_redirects=False) as response:
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                yield response
+                return
+            url = str(response.url.join(URL(location)))
+    raise aiohttp.ClientError(f"Mais de {settings.JOB_FETCH_MAX_REDIRECTS} redirecionamentos: {url}")
+
+
+def _record(outcome: str, domain: str) -> None:
+    metrics.counter("job_cache_requests_total", outcome=outcome, domain=domain).inc()
+
+
+async def stream_job_text(
+    response: aiohttp.ClientResponse,
+    url: str,
+    domain: str,
+    max_bytes: int
+) -> Tuple[str, int]:
+    """
+    Lê o corpo em partes, alimentando o parser incremental do domínio, e para
+    assim que a descrição é encontrada (ou não pode mais aparecer) ou ao
+    atingir `max_bytes`. Devolve o texto e os bytes lidos.
+    """
+    parser = create_page_parser(domain)
+    decoder = codecs.getincrementaldecoder(_encoding(response))(errors="replace")
+    received = 0
+    parse_seconds = 0.0
+    reason = "eof"
+
+    async for chunk in response.content.iter_chunked(settings.JOB_STREAM_CHUNK_BYTES):
+        chunk = chunk[:max_bytes - received]
+        received += len(chunk)
+        start = time.perf_counter()
+        parser.feed(decoder.decode(chunk))
+        parse_seconds += time.perf_counter() - start
+        if parser.done:
+            reason = "found"
+            break
+        if received >= max_bytes:
+            reason = "limit"
+            logger.warning(f"Página de vaga truncada em {max_bytes} bytes: {url}")
+            break
+
+    start = time.perf_counter()
+    if reason == "eof":
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    text = parser.result()
+    parse_seconds += time.perf_counter() - start
+
+    metrics.counter("job_fetch_stop_total", domain=domain, reason=reason).inc()
+    metrics.counter("job_fetch_bytes_total", domain=domain).inc(received)
+    metrics.histogram("job_fetch_bytes", buckets=BYTE_BUCKETS, domain=domain).observe(received)
+    metrics.histogram("job_parse_seconds", domain=domain).observe(parse_seconds)
+    if response.content_length is not None and response.content_length > received:
+        # Banda economizada ao parar antes do fim do corpo
+        metrics.counter("job_fetch_bytes_skipped_total", domain=domain).inc(response.content_length - received)
+    return text, received
+
+
+async def fetch_job_description(
+    session: aiohttp.ClientSession,
+    url: str,
+    cache: TieredCache = job_cache
+) -> str:
+    """
+    Texto da vaga, compartilhado entre usuários pelo link canônico.
+
+    - Entrada com menos de JOB_CACHE_FRESH_SECONDS: usada sem rede
+    - Entrada mais antiga: revalidada com GET condicional (If-None-Match /
+      If-Modified-Since); 304 renova a entrada sem baixar nem parsear a página
+    - Falha na busca: usa a entrada antiga, se houver
+
+    As buscas passam pelo job_scheduler (limites por domínio, single-flight
+    e backoff em 429/503).
+    """
+    canonical = canonicalize_url(url)
+    domain = extract_domain(canonical)
+    cached_bytes = cache.get_bytes(canonical)
+    entry = JobCacheEntry.from_bytes(cached_bytes) if cached_bytes is not None else None
+
+    if entry is not None and entry.age < settings.JOB_CACHE_FRESH_SECONDS:
+        _record("fresh", domain)
+        metrics.counter("job_fetch_seconds_saved_total").inc(entry.fetch_seconds)
+        return entry.text
+
+    try:
+        # Buscas simultâneas do mesmo link canônico compartilham uma requisição
+        return await job_scheduler.run(
+            canonical, domain, lambda: _download(session, canonical, domain, entry, cache)
+        )
+    except Exception as e:
+        if entry is not None:
+            logger.warning(f"Falha ao revalidar vaga {canonical}, usando cópia em cache: {str(e)}")
+            _record("stale", domain)
+            return entry.text
+        raise
+
+
+async def _download(
+    session: aiohttp.ClientSession,
+    canonical: str,
+    domain: str,
+    entry: Optional[JobCacheEntry],
+    cache: TieredCache
+) -> str:
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    start = time.perf_counter()
+    # Timeouts de conexão/leitura vêm da sessão (http_session)
+    async with open_job_page(session, canonical, headers) as response:
+        if response.status in (429, 503):
+            raise ThrottledError(domain, response.status, parse_retry_after(response.headers.get("Retry-After")))
+
+        if response.status == 304 and entry is not None:
+            elapsed = time.perf_counter() - start
+            _record("revalidated", domain)
+            metrics.counter("job_fetch_seconds_saved_total").inc(max(0.0, entry.fetch_seconds - elapsed))
+            entry.fetched_at = time.time()
+            cache.set_bytes(canonical, entry.to_bytes())
+            return entry.text
+
+        response.raise_for_status()
+        # Sair do bloco sem ler o corpo inteiro descarta a conexão em vez de
+        # drenar megabytes de scripts que não serão usados
+        text, _ = await stream_job_text(response, canonical, domain, settings.JOB_MAX_RESPONSE_BYTES)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    elapsed = time.perf_counter() - start
+    metrics.histogram("job_fetch_seconds", domain=domain).observe(elapsed)
+    _record("refetched" if entry is not None else "miss", domain)
+
+    if text.strip():
+        cache.set_bytes(canonical, JobCacheEntry(
+            text=text,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+            fetch_seconds=elapsed
+        ).to_bytes())
+    return text
@@ -0,0 +1,357 @@
+"""
+Parsers de páginas de vaga.
+
+Primeiro procura o bloco JSON-LD schema.org `JobPosting` (barato e preciso);
+sem ele, faz um parse incremental do HTML (html.parser da biblioteca padrão)
+que para assim que o contêiner da descrição termina, sem montar a árvore do
+documento inteiro.
+"""
+import html as html_lib
+import json
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Sequence, Tuple
+from app.utils.url_canonical import extract_domain
+
+# Contêiner da descrição: (tag ou None, atributo ou None, trecho do valor ou None)
+Container = Tuple[Optional[str], Optional[str], Optional[str]]
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section",
+              "article", "header", "footer", "table", "blockquote", "dd", "dt"}
+SKIP_TAGS = {"script", "style", "noscript", "svg", "template", "iframe", "button"}
+# Fora de um contêiner, a navegação da página não faz parte da vaga
+CHROME_TAGS = {"nav", "header", "footer", "aside", "form"}
+
+_JSON_LD = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL
+)
+_SPACES = re.compile(r"[ \t\r\f\v ]+")
+
+LINKEDIN_CONTAINERS: Sequence[Container] = (
+    ("div", "class", "show-more-less-html__markup"),
+    ("div", "class", "description__text"),
+)
+INDEED_CONTAINERS: Sequence[Container] = (
+    ("div", "id", "jobDescriptionText"),
+)
+GUPY_CONTAINERS: Sequence[Container] = (
+    ("div", "id", "job-description"),
+    ("div", "data-testid", "text-section"),
+)
+# Elementos que só aparecem depois da descrição: ao encontrá-los sem ter
+# achado o contêiner, não adianta continuar lendo a página
+LINKEDIN_STOP_MARKERS: Sequence[Container] = (
+    ("section", "class", "similar-jobs"),
+    ("section", "class", "people-also-viewed"),
+)
+INDEED_STOP_MARKERS: Sequence[Container] = (
+    ("div", "id", "relatedLinks"),
+    ("div", "class", "jobsearch-JobMetadataFooter"),
+)
+GENERIC_CONTAINERS: Sequence[Container] = (
+    (None, "id", "job-description"),
+    (None, "class", "job-description"),
+    (None, "itemprop", "description"),
+    ("article", None, None),
+    ("main", None, None),
+)
+
+
+def _clean_lines(parts: Iterable[str]) -> str:
+    lines = (_SPACES.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def html_fragment_to_text(fragment: str) -> str:
+    """Texto de um trecho de HTML (ex.: description do JSON-LD)"""
+    if "<" not in fragment:
+        return _clean_lines([html_lib.unescape(fragment)])
+    parser = JobPageParser(containers=())
+    parser.feed(fragment)
+    parser.close()
+    return parser.page_text()
+
+
+def _find_job_posting(data) -> Optional[dict]:
+    if isinstance(data, list):
+        for item in data:
+            found = _find_job_posting(item)
+            if found:
+                return found
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            return data
+        if "@graph" in data:
+            return _find_job_posting(data["@graph"])
+    return None
+
+
+def _names(value) -> List[str]:
+    if isinstance(value, list):
+        return [name for item in value for name in _names(item)]
+    if isinstance(value, dict):
+        address = value.get("address")
+        if address is not None:
+            return _names(address)
+        parts = [value.get(key) for key in ("name", "addressLocality", "addressRegion") if value.get(key)]
+        return [", ".join(str(part) for part in parts)] if parts else []
+    return [str(value)] if value else []
+
+
+def job_posting_text(posting: dict) -> str:
+    """Texto da vaga a partir de um objeto JSON-LD JobPosting"""
+    lines = []
+    if posting.get("title"):
+        lines.append(str(posting["title"]))
+    for label, key in (("Empresa", "hiringOrganization"), ("Local", "jobLocation"),
+                       ("Tipo", "employmentType")):
+        names = _names(posting.get(key))
+        if names:
+            lines.append(f"{label}: {', '.join(names)}")
+    for key in ("description", "responsibilities", "qualifications", "skills",
+                "experienceRequirements", "educationRequirements"):
+        value = posting.get(key)
+        if isinstance(value, str) and value.strip():
+            lines.append(html_fragment_to_text(value))
+        elif value:
+            lines.extend(_names(value))
+    return "\n".join(line for line in lines if line)
+
+
+def job_text_from_json_ld(script: str) -> Optional[str]:
+    try:
+        posting = _find_job_posting(json.loads(script, strict=False))
+    except ValueError:
+        return None
+    if posting is None:
+        return None
+    text = job_posting_text(posting)
+    return text or None
+
+
+class _Finished(Exception):
+    """Interrompe o HTMLParser no meio de um `feed` assim que o texto está pronto"""
+
+
+class JobPageParser(HTMLParser):
+    """
+    Parser incremental: alimentar com `feed` em partes e consultar `done`.
+
+    Conclui (`done`) quando encontra um JSON-LD JobPosting completo, quando
+    fecha o primeiro contêiner de descrição da lista `containers`, ao passar
+    por um dos `stop_markers` ou no fim do <body>. Enquanto isso, guarda o
+    texto visível da página como último recurso.
+    """
+
+    def __init__(
+        self,
+        containers: Sequence[Container],
+        stop_markers: Sequence[Container] = (),
+        max_page_chars: int = 200000
+    ):
+        super().__init__(convert_charrefs=True)
+        self.containers = containers
+        self.stop_markers = stop_markers
+        self.max_page_chars = max_page_chars
+        self.done = False
+        self.json_ld_text: Optional[str] = None
+        self._container_depth = 0
+        self._container_parts: List[str] = []
+        self._container_text: Optional[str] = None
+        self._page_parts: List[str] = []
+        self._page_chars = 0
+        self._skip_depth = 0
+        self._chrome_depth = 0
+        self._script_parts: Optional[List[str]] = None
+
+    def feed(self, data: str) -> None:
+        if self.done:
+            return
+        try:
+            super().feed(data)
+        except _Finished:
+            pass
+
+    @staticmethod
+    def _matches(selectors: Sequence[Container], tag: str, attrs) -> bool:
+        values = dict(attrs)
+        for container_tag, attribute, fragment in selectors:
+            if container_tag is not None and container_tag != tag:
+                continue
+            if attribute is None:
+                return True
+            value = values.get(attribute)
+            if value is not None and (fragment is None or fragment in value):
+                return True
+        return False
+
+    def _emit(self, text: str) -> None:
+        if self._container_depth:
+            self._container_parts.append(text)
+        elif not self._chrome_depth and self._page_chars < self.max_page_chars:
+            self._page_parts.append(text)
+            self._page_chars += len(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "script" and ("type", "application/ld+json") in [(k, (v or "").lower()) for k, v in attrs]:
+            self._script_parts = []
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if self._container_depth:
+            if tag not in VOID_TAGS:
+                self._container_depth += 1
+        elif self._container_text is None and self._matches(self.containers, tag, attrs):
+            self._container_depth = 1
+        elif self.stop_markers and self._matches(self.stop_markers, tag, attrs):
+            self.done = True
+            raise _Finished
+        elif tag in CHROME_TAGS:
+            self._chrome_depth += 1
+        if tag in BLOCK_TAGS:
+            self._emit("\n- " if tag == "li" else "\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.done and not self._skip_depth and tag in BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "script" and self._script_parts is not None:
+            text = job_text_from_json_ld("".join(self._script_parts))
+            self._script_parts = None
+            if text:
+                self.json_ld_text = text
+                self.done = True
+                raise _Finished
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "body" and self.containers:
+            # Scripts depois do </body> não trazem a descrição
+            self.done = True
+            raise _Finished
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+        if self._container_depth and tag not in VOID_TAGS:
+            self._container_depth -= 1
+            if self._container_depth == 0:
+                self._container_text = _clean_lines(self._container_parts)
+                if self._container_text:
+                    self.done = True
+                    raise _Finished
+                else:
+                    self._container_text = None
+                    self._container_parts = []
+        elif tag in CHROME_TAGS and self._chrome_depth:
+            self._chrome_depth -= 1
+
+    def handle_data(self, data):
+        if self.done:
+            return
+        if self._script_parts is not None:
+            self._script_parts.append(data)
+        elif not self._skip_depth:
+            self._emit(data)
+
+    def page_text(self) -> str:
+        return _clean_lines(self._page_parts)
+
+    def result(self) -> str:
+        """Melhor texto disponível: JSON-LD, contêiner de descrição ou página"""
+        if self.json_ld_text:
+            return self.json_ld_text
+        if self._container_text:
+            return self._container_text
+        if self._container_parts:
+            # Contêiner interrompido pelo limite de bytes
+            return _clean_lines(self._container_parts)
+        return self.page_text()
+
+
+def parse_job_page(
+    html: str,
+    containers: Sequence[Container] = GENERIC_CONTAINERS,
+    stop_markers: Sequence[Container] = (),
+    max_chars: Optional[int] = None,
+    chunk_size: int = 64 * 1024
+) -> str:
+    """
+    Texto da vaga em uma página já baixada. O JSON-LD é procurado primeiro
+    com uma expressão regular; sem ele, o HTML é parseado em partes até o
+    contêiner da descrição terminar ou `max_chars` ser atingido.
+    """
+    # A busca por substring evita percorrer com a regex páginas sem JSON-LD
+    if "ld+json" in html:
+        for match in _JSON_LD.finditer(html):
+            text = job_text_from_json_ld(match.group(1))
+            if text:
+                return text
+
+    limit = len(html) if max_chars is None else min(len(html), max_chars)
+    parser = JobPageParser(containers, stop_markers)
+    for start in range(0, limit, chunk_size):
+        parser.feed(html[start:min(start + chunk_size, limit)])
+        if parser.done:
+            break
+    return parser.result()
+
+
+def parse_linkedin_job(url: str, html: str) -> str:
+    return parse_job_page(html, LINKEDIN_CONTAINERS, LINKEDIN_STOP_MARKERS)
+
+
+def parse_indeed_job(url: str, html: str) -> str:
+    return parse_job_page(html, INDEED_CONTAINERS, INDEED_STOP_MARKERS)
+
+
+def parse_gupy_job(url: str, html: str) -> str:
+    return parse_job_page(html, GUPY_CONTAINERS)
+
+
+def parse_generic_job(url: str, html: str) -> str:
+    return parse_job_page(html, GENERIC_CONTAINERS)
+
+
+# Parsers por domínio (url_canonical.extract_domain); os demais usam o genérico
+SITE_PARSERS = {
+    "linkedin.com": parse_linkedin_job,
+    "indeed.com": parse_indeed_job,
+    "gupy.io": parse_gupy_job,
+}
+
+SITE_CONTAINERS = {
+    "linkedin.com": LINKEDIN_CONTAINERS,
+    "indeed.com": INDEED_CONTAINERS,
+    "gupy.io": GUPY_CONTAINERS,
+}
+
+SITE_STOP_MARKERS = {
+    "linkedin.com": LINKEDIN_STOP_MARKERS,
+    "indeed.com": INDEED_STOP_MARKERS,
+}
+
+
+def parse_job_html(url: str, html: str) -> str:
+    """Texto da vaga em uma página já baixada, com o parser do domínio"""
+    return SITE_PARSERS.get(extract_domain(url), parse_generic_job)(url, html)
+
+
+def create_page_parser(domain: str) -> JobPageParser:
+    """Parser incremental do domínio (extract_domain), para alimentar durante o download"""
+    return JobPageParser(
+        SITE_CONTAINERS.get(domain, GENERIC_CONTAINERS),
+        stop_markers=SITE_STOP_MARKERS.get(domain, ())
+    )
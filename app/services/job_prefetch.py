@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.utils.metrics import metrics
+from app.utils.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Busca o texto da vaga ("" em caso de falha)
+FetchJob = Callable[[str], Awaitable[str]]
+# Calcula (e coloca em cache) os embeddings dos textos
+EmbedTexts = Callable[[List[str]], Awaitable[object]]
+
+
+class PrefetchLimitError(Exception):
+    """Usuário já tem o máximo de pré-carregamentos ativos"""
+
+
+@dataclass
+class PrefetchEntry:
+    handle: str
+    url: str
+    canonical: str
+    task: asyncio.Task
+    # Dono do handle; usuários diferentes compartilham a tarefa, não o handle
+    user_id: Any = None
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "pending"
+        if self.task.cancelled() or not self.task.result():
+            return "failed"
+        return "ready"
+
+
+class JobPrefetcher:
+    """
+    Busca, parseia e calcula o embedding de uma vaga em segundo plano, assim
+    que o usuário cola o link, enquanto ele ainda escolhe o arquivo.
+
+    `start` devolve um handle; `fetch` (usado pela análise) aguarda a busca
+    em andamento do mesmo link canônico em vez de começar outra. Os
+    resultados ficam nos caches compartilhados (job_cache e embedding_cache),
+    então a análise aproveita o pré-carregamento mesmo em outro worker; o
+    registro de handles é só do processo e expira após `ttl_seconds`.
+
+    Cada handle pertence ao usuário que o criou (`get` não o mostra a outros)
+    e cada usuário tem no máximo `max_per_user` handles ativos.
+    """
+
+    def __init__(
+        self,
+        fetch_job: FetchJob,
+        embed_texts: EmbedTexts,
+        ttl_seconds: float = 600,
+        max_entries: int = 1000,
+        max_per_user: int = 10
+    ):
+        self.fetch_job = fetch_job
+        self.embed_texts = embed_texts
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_per_user = max_per_user
+        self._entries: "OrderedDict[str, PrefetchEntry]" = OrderedDict()
+        self._by_url: Dict[str, str] = {}
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            handle, entry = next(iter(self._entries.items()))
+            if now - entry.created_at < self.ttl_seconds and len(self._entries) <= self.max_entries:
+                break
+            self._discard(handle)
+
+    def _discard(self, handle: str) -> None:
+        entry = self._entries.pop(handle, None)
+        if entry is not None and self._by_url.get(entry.canonical) == handle:
+            del self._by_url[entry.canonical]
+
+    def _live(self, canonical: str) -> Optional[PrefetchEntry]:
+        handle = self._by_url.get(canonical)
+        entry = self._entries.get(handle) if handle else None
+        if entry is None or entry.status == "failed":
+            return None
+        return entry
+
+    def start(self, url: str, user_id: Any = None) -> PrefetchEntry:
+        """
+        Inicia (ou reaproveita) o pré-carregamento do link.
+
+        Raises:
+            PrefetchLimitError: o usuário já tem `max_per_user` handles ativos
+        """
+        self._expire()
+        canonical = canonicalize_url(url)
+        live = self._live(canonical)
+        own = next(
+            (
+                entry for entry in self._entries.values()
+                if entry.canonical == canonical and entry.user_id == user_id and entry.status != "failed"
+            ),
+            None
+        )
+        if own is not None:
+            metrics.counter("job_prefetch_total", outcome="reused").inc()
+            return own
+
+        owned = sum(1 for entry in self._entries.values() if entry.user_id == user_id)
+        if owned >= self.max_per_user:
+            metrics.counter("job_prefetch_total", outcome="limited").inc()
+            raise PrefetchLimitError(f"Máximo de {self.max_per_user} pré-carregamentos ativos por usuário")
+
+        if live is not None:
+            # Mesmo link de outro usuário: handle próprio sobre a mesma busca
+            entry = PrefetchEntry(
+                handle=secrets.token_urlsafe(16),
+                url=url,
+                canonical=canonical,
+                task=live.task,
+                user_id=user_id
+            )
+            self._entries[entry.handle] = entry
+            metrics.counter("job_prefetch_total", outcome="reused").inc()
+            return entry
+
+        entry = PrefetchEntry(
+            handle=secrets.token_urlsafe(16),
+            url=url,
+            canonical=canonical,
+            task=asyncio.create_task(self._prefetch(url)),
+            user_id=user_id
+        )
+        self._entries[entry.handle] = entry
+        self._by_url[canonical] = entry.handle
+        metrics.counter("job_prefetch_total", outcome="started").inc()
+        return entry
+
+    def get(self, handle: str, user_id: Any = None) -> Optional[PrefetchEntry]:
+        """Entrada do handle, se existir e pertencer a `user_id`"""
+        self._expire()
+        entry = self._entries.get(handle)
+        if entry is None or entry.user_id != user_id:
+            return None
+        return entry
+
+    async def _prefetch(self, url: str) -> str:
+        try:
+            text = await self.fetch_job(url)
+        except Exception as e:
+            logger.warning(f"Falha ao pré-carregar vaga {url}: {str(e)}")
+            return ""
+        if text:
+            try:
+                await self.embed_texts([text])
+            except Exception as e:
+                # A análise recalcula o embedding; só o texto é essencial aqui
+                logger.warning(f"Falha ao pré-calcular embedding da vaga {url}: {str(e)}")
+        return text
+
+    async def fetch(self, url: str) -> str:
+        """Texto da vaga, aproveitando um pré-carregamento em andamento ou concluído"""
+        entry = self._live(canonicalize_url(url))
+        if entry is None:
+            metrics.counter("job_prefetch_used_total", state="miss").inc()
+            return await self.fetch_job(url)
+        metrics.counter("job_prefetch_used_total", state=entry.status).inc()
+        # shield: uma análise cancelada não cancela o pré-carregamento
+        return await asyncio.shield(entry.task)
@@ -0,0 +1,207 @@
+import abc
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+import httpx
+from openai import AsyncOpenAI
+from app.config.settings import settings
+from app.services.fake_llm import fake_analysis, fake_embedding
+from app.utils import deadline
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider(abc.ABC):
+    """
+    Interface assíncrona dos provedores de LLM usados na análise.
+
+    Todas as chamadas passam por um semáforo que limita as requisições
+    simultâneas do worker; as demais aguardam sem bloquear o event loop.
+    """
+
+    name = "base"
+
+    def __init__(self, max_concurrency: int = 16):
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # Criado dentro do event loop em execução
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _call(self, op: str, coro_factory):
+        inflight = metrics.gauge("llm_inflight_requests", provider=self.name)
+        waited_at = time.perf_counter()
+        async with self._limiter():
+            metrics.histogram("llm_queue_wait_seconds", op=op).observe(time.perf_counter() - waited_at)
+            inflight.inc()
+            start = time.perf_counter()
+            try:
+                return await coro_factory()
+            except Exception:
+                metrics.counter("llm_errors_total", provider=self.name, op=op).inc()
+                raise
+            finally:
+                inflight.dec()
+                metrics.histogram("llm_request_seconds", provider=self.name, op=op).observe(
+                    time.perf_counter() - start
+                )
+
+    async def embed(self, texts: List[str], model: str, dimensions: Optional[int] = None) -> List[List[float]]:
+        return await self._call("embed", lambda: self._embed(texts, model, dimensions))
+
+    async def complete_json(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000
+    ) -> str:
+        """Retorna o conteúdo (JSON) da primeira escolha"""
+        return await self._call(
+            "chat", lambda: self._complete_json(messages, model, temperature, max_tokens)
+        )
+
+    @abc.abstractmethod
+    async def _embed(self, texts, model, dimensions) -> List[List[float]]:
+        """Um vetor por texto, na ordem recebida"""
+
+    @abc.abstractmethod
+    async def _complete_json(self, messages, model, temperature, max_tokens) -> str:
+        """Conteúdo (JSON) da resposta do modelo"""
+
+    async def aclose(self) -> None:
+        pass
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    Cliente AsyncOpenAI sobre um httpx.AsyncClient com pool de conexões
+    keep-alive, compartilhado por todas as requisições do worker.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        max_concurrency: int = 16,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        embedding_timeout: float = 15,
+        chat_timeout: float = 60,
+        max_retries: int = 2
+    ):
+        super().__init__(max_concurrency)
+        self.embedding_timeout = embedding_timeout
+        self.chat_timeout = chat_timeout
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=30
+            ),
+            timeout=httpx.Timeout(chat_timeout, connect=5)
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=max_retries,
+            http_client=self.http_client
+        )
+
+    async def _embed(self, texts, model, dimensions) -> List[List[float]]:
+        # A versão do SDK em uso não aceita `dimensions` diretamente
+        extra_body = {"dimensions": dimensions} if dimensions else None
+        response = await self.client.embeddings.create(
+            input=texts,
+            model=model,
+            extra_body=extra_body,
+            timeout=self.embedding_timeout
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    async def _complete_json(self, messages, model, temperature, max_tokens) -> str:
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            # Limitado ao prazo da análise; embeddings não, porque o lote do
+            # micro-batcher é compartilhado entre requisições
+            timeout=deadline.cap(self.chat_timeout)
+        )
+        return response.choices[0].message.content
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
+
+class FakeLLMProvider(LLMProvider):
+    """Provedor determinístico em processo (ver fake_llm), com latência simulada"""
+
+    name = "fake"
+
+    def __init__(self, latency_seconds: float = 0.0, max_concurrency: int = 16):
+        super().__init__(max_concurrency)
+        self.latency_seconds = latency_seconds
+
+    async def _embed(self, texts, model, dimensions) -> List[List[float]]:
+        await asyncio.sleep(self.latency_seconds)
+        return [fake_embedding(text, dimensions) for text in texts]
+
+    async def _complete_json(self, messages, model, temperature, max_tokens) -> str:
+        await asyncio.sleep(self.latency_seconds)
+        return fake_analysis(messages[-1]["content"])
+
+
+def create_provider() -> LLMProvider:
+    """Instancia o provedor configurado em LLM_PROVIDER"""
+    if settings.LLM_PROVIDER == "fake":
+        return FakeLLMProvider(
+            latency_seconds=settings.FAKE_LLM_LATENCY_MS / 1000,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY
+        )
+    if settings.LLM_PROVIDER == "openai":
+        return OpenAIProvider(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.LLM_BASE_URL,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            embedding_timeout=settings.LLM_EMBEDDING_TIMEOUT_SECONDS,
+            chat_timeout=settings.LLM_CHAT_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+    raise ValueError(f"Provedor de LLM desconhecido: {settings.LLM_PROVIDER}")
+
+
+_provider: Optional[LLMProvider] = None
+
+
+def get_llm_provider() -> LLMProvider:
+    """Provedor compartilhado do worker, criado no primeiro uso"""
+    global _provider
+    if _provider is None:
+        _provider = create_provider()
+        logger.info(f"Provedor de LLM: {_provider.name}")
+    return _provider
+
+
+def set_llm_provider(provider: Optional[LLMProvider]) -> None:
+    """Substitui o provedor compartilhado (testes e scripts de carga)"""
+    global _provider
+    _provider = provider
+
+
+async def close_llm_provider() -> None:
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
@@ -0,0 +1,163 @@
+"""
+Embeddings locais em CPU, sem rede: hashing de n-gramas + pesos IDF
+opcionais + projeção aleatória esparsa para poucas centenas de dimensões.
+
+Qualidade inferior à do modelo hospedado, mas suficiente para ordenar vagas
+por similaridade quando a OpenAI está lenta ou indisponível. A projeção é
+gerada a partir de uma semente fixa, então vetores de workers e deploys
+diferentes são comparáveis; apenas os pesos IDF (scripts/fit_local_embeddings.py)
+são ajustados em um corpus.
+"""
+import logging
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Nome usado nas chaves de cache e em EMBEDDING_MODEL para selecionar o backend
+LOCAL_EMBEDDING_MODEL = "local-hashing-v1"
+N_FEATURES = 2 ** 18
+PROJECTION_SEED = 20240601
+# Palavras com n-gramas de caracteres já calculados (~400 bytes cada)
+CHAR_NGRAM_CACHE_WORDS = 20000
+
+
+def is_local_model(model: str) -> bool:
+    return model == LOCAL_EMBEDDING_MODEL
+
+
+@lru_cache(maxsize=1)
+def _vectorizers():
+    from sklearn.feature_extraction.text import HashingVectorizer
+    common = dict(n_features=N_FEATURES, alternate_sign=False, norm=None, lowercase=True)
+    return (
+        HashingVectorizer(analyzer="word", ngram_range=(1, 2), token_pattern=r"(?u)\b\w[\w+#.]*\b", **common),
+        HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), **common),
+    )
+
+
+# palavra -> (posições de hash, contagens) dos seus n-gramas de caracteres
+_char_ngrams: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _char_features(texts: List[str]):
+    """
+    Mesmo resultado de `chars.transform(texts)`, calculando os n-gramas de
+    cada palavra distinta uma única vez. O analisador char_wb trabalha
+    palavra a palavra (separadas por espaço), então a contagem do texto é a
+    soma das contagens das palavras; como o vocabulário se repete dentro do
+    texto e entre currículos e vagas, quase todas já estão no cache.
+    """
+    from scipy.sparse import csr_matrix
+    _, chars = _vectorizers()
+    documents = [Counter(text.lower().split()) for text in texts]
+
+    # Cópia local: outra thread pode limpar o cache durante a montagem
+    features = {}
+    missing = []
+    for word in {word for document in documents for word in document}:
+        cached = _char_ngrams.get(word)
+        if cached is None:
+            missing.append(word)
+        else:
+            features[word] = cached
+    if missing:
+        if len(_char_ngrams) + len(missing) > CHAR_NGRAM_CACHE_WORDS:
+            _char_ngrams.clear()
+        matrix = chars.transform(missing)
+        for row, word in enumerate(missing):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            # Cópias: fatias manteriam a matriz do lote inteira em memória
+            features[word] = _char_ngrams[word] = (
+                matrix.indices[start:end].astype(np.int32),
+                matrix.data[start:end].astype(np.float32)
+            )
+
+    indices, counts, repeats, lengths, indptr = [], [], [], [], [0]
+    for document in documents:
+        total = 0
+        for word, repeat in document.items():
+            word_indices, word_counts = features[word]
+            indices.append(word_indices)
+            counts.append(word_counts)
+            repeats.append(repeat)
+            lengths.append(len(word_indices))
+            total += lengths[-1]
+        indptr.append(indptr[-1] + total)
+
+    if indices:
+        # Contagens da palavra vezes o número de ocorrências no texto, em uma operação
+        data = np.concatenate(counts) * np.repeat(np.asarray(repeats, dtype=np.float32), lengths)
+        indices = np.concatenate(indices)
+    else:
+        data, indices = np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int32)
+    matrix = csr_matrix((data, indices, np.array(indptr)), shape=(len(texts), N_FEATURES))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def hashed_features(texts: List[str]):
+    """Matriz esparsa (textos, N_FEATURES) com contagens sublineares de palavras e n-gramas"""
+    words, _ = _vectorizers()
+    # Palavras e n-gramas de caracteres compartilham o espaço de hash
+    matrix = (words.transform(texts) + _char_features(texts)).tocsr()
+    matrix.data = 1 + np.log(matrix.data)
+    return matrix
+
+
+def fit_idf(texts: List[str]) -> np.ndarray:
+    """Pesos IDF suavizados por posição de hash, ajustados em um corpus"""
+    matrix = hashed_features(texts)
+    document_frequency = np.bincount(matrix.indices, minlength=N_FEATURES)
+    return (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+class LocalEmbedder:
+    """Gera embeddings float32 normalizados de `dimensions` dimensões"""
+
+    def __init__(self, dimensions: int = 384, idf_path: Optional[str] = None):
+        self.dimensions = dimensions
+        self.idf_path = idf_path
+        self._projection = None
+        self._idf: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Importa scikit-learn e monta a projeção apenas no primeiro uso
+        with self._lock:
+            if self._projection is not None:
+                return
+            from sklearn.random_projection import SparseRandomProjection
+            from scipy.sparse import csr_matrix
+            projection = SparseRandomProjection(n_components=self.dimensions, random_state=PROJECTION_SEED)
+            projection.fit(csr_matrix((1, N_FEATURES), dtype=np.float32))
+            self._projection = projection.components_.T.tocsr().astype(np.float32)
+            if self.idf_path:
+                try:
+                    self._idf = np.load(self.idf_path).astype(np.float32)
+                except OSError as e:
+                    logger.warning(f"Pesos IDF locais indisponíveis ({self.idf_path}): {str(e)}")
+
+    def warm_up(self) -> None:
+        """Carrega scikit-learn e a projeção antes da primeira requisição"""
+        self.embed(["aquecimento"])
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        self._load()
+        features = hashed_features(texts)
+        if self._idf is not None:
+            features = features.multiply(self._idf).tocsr()
+        dense = np.asarray((features @ self._projection).todense(), dtype=np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        np.divide(dense, norms, out=dense, where=norms > 0)
+        return list(dense)
+
+
+local_embedder = LocalEmbedder(
+    dimensions=settings.LOCAL_EMBEDDING_DIMENSIONS,
+    idf_path=settings.LOCAL_EMBEDDING_IDF_PATH
+)
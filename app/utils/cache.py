@@ -0,0 +1,424 @@
+import os
+import fcntl
+import hashlib
+import mmap
+import sqlite3
+import struct
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LRUByteCache:
+    """
+    Cache LRU em memória limitado pelo total de bytes armazenados.
+    Entradas maiores que o limite total não são armazenadas.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """
+    Armazenamento chave/valor persistente em SQLite (modo WAL).
+    O arquivo é compartilhado por todos os workers do mesmo host.
+    """
+
+    # Frequência (em gravações) da remoção por tamanho máximo
+    PRUNE_INTERVAL = 100
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+            self.delete(key)
+            return None
+        return bytes(value)
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), time.time())
+            )
+            self._conn.commit()
+            self._writes += 1
+            should_prune = self._writes % self.PRUNE_INTERVAL == 0
+        if should_prune:
+            self.prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Remove entradas expiradas e as mais antigas além de max_entries"""
+        removed = self.purge_expired()
+        if self.max_entries is None:
+            return removed
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+            return removed + cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Remove entradas expiradas e retorna a quantidade removida"""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+
+class MappedStore:
+    """
+    Armazenamento chave/valor em um arquivo de log (append-only) lido via mmap.
+
+    Todos os workers do host mapeiam o mesmo arquivo, então os valores ficam
+    uma única vez no page cache do sistema operacional: `get` devolve um
+    memoryview sobre o mapa, sem cópia. Cada worker mantém apenas o índice
+    (hash da chave -> posição), ~240 bytes por entrada. Gravações usam flock;
+    a compactação (TTL e max_entries) reescreve o arquivo e o substitui
+    atomicamente, e os demais workers reabrem ao perceber a troca.
+
+    Mapas substituídos (arquivo cresceu ou foi compactado) são fechados assim
+    que nenhum memoryview devolvido por `get` os referencia mais.
+    """
+
+    MAGIC = b"RAMS0001"
+    # hash da chave, created_at (negativo = removido), tamanho do valor
+    RECORD = struct.Struct("<32sdI")
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, path: str, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._inode: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        # Mapas substituídos que ainda tinham memoryviews em uso ao serem trocados
+        self._retired: List[mmap.mmap] = []
+        self._scanned = 0
+        # hash da chave -> (posição do valor, tamanho, created_at)
+        self._index: Dict[bytes, Tuple[int, int, float]] = {}
+        self._writes = 0
+        with self._lock:
+            self._reopen()
+
+    @staticmethod
+    def _hash(key: str) -> bytes:
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+    def _retire_map(self) -> None:
+        """Fecha o mapa corrente e os já substituídos que não têm mais memoryviews"""
+        if self._map is not None:
+            self._retired.append(self._map)
+            self._map = None
+        still_exported = []
+        for old_map in self._retired:
+            try:
+                old_map.close()
+            except BufferError:
+                still_exported.append(old_map)
+        self._retired = still_exported
+
+    def _reopen(self) -> None:
+        self._retire_map()
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, self.MAGIC)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._inode = os.fstat(self._fd).st_ino
+        self._scanned = len(self.MAGIC)
+        self._index = {}
+
+    def _refresh(self) -> None:
+        """Reabre se o arquivo foi compactado e indexa registros novos"""
+        try:
+            if os.stat(self.path).st_ino != self._inode:
+                self._reopen()
+        except FileNotFoundError:
+            self._reopen()
+
+        size = os.fstat(self._fd).st_size
+        if size <= self._scanned:
+            return
+        if self._map is None or len(self._map) < size:
+            self._retire_map()
+            self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+
+        position = self._scanned
+        header = self.RECORD.size
+        while position + header <= size:
+            key_hash, created_at, length = self.RECORD.unpack_from(self._map, position)
+            if position + header + length > size:
+                break  # registro ainda sendo gravado por outro worker
+            if created_at < 0:
+                self._index.pop(key_hash, None)
+            else:
+                self._index[key_hash] = (position + header, length, created_at)
+            position += header + length
+        self._scanned = position
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[memoryview]:
+        key_hash = self._hash(key)
+        with self._lock:
+            entry = self._index.get(key_hash)
+            if entry is None:
+                self._refresh()
+                entry = self._index.get(key_hash)
+            if entry is None:
+                return None
+            offset, length, created_at = entry
+            if self._expired(created_at):
+                return None
+            return memoryview(self._map)[offset:offset + length]
+
+    def _append(self, record: bytes) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            # Outro worker pode ter compactado o arquivo desde a última leitura
+            if os.stat(self.path).st_ino != self._inode:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                self._reopen()
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            os.write(self._fd, record)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def set(self, key: str, value: bytes) -> None:
+        record = self.RECORD.pack(self._hash(key), time.time(), len(value)) + value
+        with self._lock:
+            self._append(record)
+            self._writes += 1
+            should_prune = self._writes % self.PRUNE_INTERVAL == 0
+        if should_prune:
+            self.prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._append(self.RECORD.pack(self._hash(key), -1.0, 0))
+
+    def prune(self) -> int:
+        """Reescreve o arquivo sem entradas expiradas, removidas ou além de max_entries"""
+        with self._lock:
+            self._refresh()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.stat(self.path).st_ino != self._inode:
+                    return 0  # outro worker acabou de compactar
+                self._refresh()
+                total = self._scanned - len(self.MAGIC)
+                live = sorted(
+                    ((created_at, key_hash, offset, length)
+                     for key_hash, (offset, length, created_at) in self._index.items()
+                     if not self._expired(created_at)),
+                    reverse=True
+                )
+                if self.max_entries is not None:
+                    live = live[:self.max_entries]
+                kept_bytes = sum(self.RECORD.size + length for _, _, _, length in live)
+                if kept_bytes == total:
+                    return 0
+
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(self.MAGIC)
+                    for created_at, key_hash, offset, length in reversed(live):
+                        f.write(self.RECORD.pack(key_hash, created_at, length))
+                        f.write(self._map[offset:offset + length])
+                os.replace(temp_path, self.path)
+                removed = len(self._index) - len(live)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._reopen()
+            return removed
+
+    def purge_expired(self) -> int:
+        return self.prune()
+
+
+class TieredCache:
+    """
+    Cache de duas camadas com contadores de acerto/erro:
+    - LRU em memória, limitada por bytes, local a cada worker
+    - SQLite (backend "sqlite") ou arquivo mapeado em memória (backend
+      "mmap") em disco, compartilhado por todos os workers do host
+
+    Com o backend "mmap" a LRU não é usada: o arquivo mapeado já fica no
+    page cache, e copiar os valores para cada worker desfaria o
+    compartilhamento. Os valores lidos dele são memoryviews.
+
+    Falhas na camada persistente são registradas e tratadas como miss.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory_bytes: int,
+        store_path: Optional[str],
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        backend: str = "sqlite"
+    ):
+        self.name = name
+        self.memory = LRUByteCache(0 if backend == "mmap" else memory_bytes)
+        self.store_path = store_path
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._store = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    @property
+    def store(self):
+        # Abre o armazenamento sob demanda para não criar arquivos na importação
+        if self._store is None and self.store_path:
+            try:
+                if self.backend == "mmap":
+                    self._store = MappedStore(self.store_path, self.ttl_seconds, self.max_entries)
+                else:
+                    self._store = SQLiteStore(self.store_path, self.name, self.ttl_seconds, self.max_entries)
+            except Exception as e:
+                logger.warning(f"Cache persistente {self.name} indisponível: {str(e)}")
+                self.store_path = None
+        return self._store
+
+    def get_bytes(self, key: str) -> Optional[Union[bytes, memoryview]]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits_memory += 1
+            metrics.counter(f"{self.name}_cache_hits_total", tier="memory").inc()
+            return value
+
+        store = self.store
+        if store is not None:
+            try:
+                value = store.get(key)
+            except Exception as e:
+                logger.warning(f"Erro ao ler cache persistente {self.name}: {str(e)}")
+                value = None
+            if value is not None:
+                self.hits_disk += 1
+                metrics.counter(f"{self.name}_cache_hits_total", tier="disk").inc()
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        metrics.counter(f"{self.name}_cache_misses_total").inc()
+        return None
+
+    def set_bytes(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+
+        store = self.store
+        if store is not None:
+            try:
+                store.set(key, value)
+            except Exception as e:
+                logger.warning(f"Erro ao gravar cache persistente {self.name}: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size_bytes,
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses
+        }
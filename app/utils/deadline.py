@@ -0,0 +1,48 @@
+"""
+Prazo (deadline) da requisição, propagado por contextvars.
+
+O pipeline da análise abre um prazo para a requisição inteira e um prazo
+menor para cada etapa; chamadas internas (extração, busca de vagas, LLM)
+consultam `remaining`/`cap` para limitar seus próprios timeouts e, quando
+sabem aproveitar resultados parciais, param um pouco antes do prazo.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Folga para quem aproveita resultado parcial terminar antes do timeout rígido da etapa
+PARTIAL_MARGIN_SECONDS = 0.25
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining(margin: float = 0.0) -> Optional[float]:
+    """Segundos até o prazo corrente menos `margin` (mínimo 0); None se não há prazo"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic() - margin)
+
+
+def cap(timeout: Optional[float], margin: float = 0.0) -> Optional[float]:
+    """`timeout` limitado ao prazo corrente"""
+    left = remaining(margin)
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Prazo daqui a `seconds`, nunca além do prazo já em vigor"""
+    current = _deadline.get()
+    deadline = current
+    if seconds is not None:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if current is None else min(current, candidate)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
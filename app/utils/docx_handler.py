@@ -0,0 +1,117 @@
+import io
+import re
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Proteção contra zip bombs: tamanho máximo descompactado de cada parte XML
+MAX_PART_SIZE = 50 * 1024 * 1024  # 50MB
+
+HEADER_PATTERN = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PATTERN = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _iter_part_text(archive: zipfile.ZipFile, name: str) -> Iterator[str]:
+    """
+    Percorre uma parte XML do DOCX com iterparse, emitindo parágrafos e
+    linhas de tabela na ordem do documento. Elementos já processados são
+    descartados para manter a memória constante.
+
+    - Células de uma linha são separadas por tabulação
+    - Caixas de texto são lidas uma única vez (o conteúdo VML duplicado
+      em mc:Fallback é ignorado)
+    """
+    info = archive.getinfo(name)
+    if info.file_size > MAX_PART_SIZE:
+        raise ValueError(f"Parte {name} excede o tamanho máximo permitido")
+
+    paragraphs: List[List[str]] = []
+    cells: List[List[str]] = []
+    rows: List[List[str]] = []
+    fallback_depth = 0
+    body = None
+
+    with archive.open(info) as xml_file:
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            tag = elem.tag
+
+            if event == "start":
+                if tag == MC_FALLBACK:
+                    fallback_depth += 1
+                elif fallback_depth:
+                    continue
+                elif tag == W_NS + "p":
+                    paragraphs.append([])
+                elif tag == W_NS + "tc":
+                    cells.append([])
+                elif tag == W_NS + "tr":
+                    rows.append([])
+                elif tag in (W_NS + "body", W_NS + "hdr", W_NS + "ftr"):
+                    body = elem
+                continue
+
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+                elem.clear()
+                continue
+            if fallback_depth:
+                continue
+
+            if tag == W_NS + "t":
+                if paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == W_NS + "tab":
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (W_NS + "br", W_NS + "cr"):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == W_NS + "p":
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text + "\n"
+            elif tag == W_NS + "tc":
+                cell_text = " ".join(p.strip() for p in cells.pop() if p.strip())
+                rows[-1].append(cell_text)
+            elif tag == W_NS + "tr":
+                line = "\t".join(c for c in rows.pop() if c)
+                if cells:
+                    # Tabela aninhada dentro de uma célula
+                    cells[-1].append(line)
+                elif line:
+                    yield line + "\n"
+            else:
+                continue
+
+            # Parágrafo ou tabela de nível superior concluído: libera a árvore
+            if body is not None and not paragraphs and not rows:
+                body.clear()
+
+
+def iter_docx_text(content: Union[bytes, BinaryIO]) -> Iterator[str]:
+    """
+    Extrai o texto do DOCX sem montar o modelo de objetos do python-docx.
+    Aceita os bytes do arquivo ou um stream (ex: arquivo mapeado em memória).
+
+    Ordem de emissão: cabeçalhos, corpo do documento (parágrafos, tabelas e
+    caixas de texto) e rodapés.
+    """
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    with zipfile.ZipFile(stream) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("Arquivo DOCX sem word/document.xml")
+
+        headers = sorted(n for n in names if HEADER_PATTERN.match(n))
+        footers = sorted(n for n in names if FOOTER_PATTERN.match(n))
+
+        for name in headers + ["word/document.xml"] + footers:
+            yield from _iter_part_text(archive, name)
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Recebe (textos, modelo, dimensões) e retorna um vetor por texto, na mesma ordem
+EmbedBatch = Callable[[List[str], str, Optional[int]], Awaitable[List[List[float]]]]
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+# Limite de entrada dos modelos text-embedding-* da OpenAI
+MAX_INPUT_TOKENS = 8191
+
+# Piso de caracteres por token usado no corte: textos com muitos números,
+# URLs ou símbolos rendem bem menos que os ~4 da estimativa média
+_MIN_CHARS_PER_TOKEN = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa conservadora de tokens (~4 caracteres por token)"""
+    return len(text) // 4 + 1
+
+
+def truncate_input(text: str, max_input_tokens: int) -> str:
+    """Corta o texto para caber no limite de tokens de entrada do modelo"""
+    max_chars = max_input_tokens * _MIN_CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    metrics.counter("embedding_inputs_truncated_total").inc()
+    return text[:max_chars]
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.texts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.enqueued_at: List[float] = []
+        self.tokens = 0
+        self.timer: Optional[asyncio.Task] = None
+
+
+class EmbeddingBatcher:
+    """
+    Agrupa pedidos de embedding de análises concorrentes em uma única
+    chamada à API.
+
+    O primeiro texto de um lote abre uma janela de `window_seconds`; o lote
+    é enviado ao fim da janela ou antes, se atingir `max_batch_size` textos
+    ou `max_tokens` tokens estimados. Lotes são separados por (modelo,
+    dimensões), já que não podem ser misturados na mesma requisição.
+
+    Cada texto é cortado ao limite de entrada do modelo antes de entrar no
+    lote. Como um lote mistura textos de várias análises, se a chamada do
+    lote falha os textos são reenviados um a um, e só quem causou o erro o
+    recebe.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        window_seconds: float = 0.01,
+        max_batch_size: int = 64,
+        max_tokens: int = 100000,
+        max_input_tokens: int = MAX_INPUT_TOKENS
+    ):
+        self.embed_batch = embed_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.max_tokens = max_tokens
+        self.max_input_tokens = max_input_tokens
+        self._pending: Dict[Tuple[str, Optional[int]], _PendingBatch] = {}
+        # O event loop guarda só referências fracas às tarefas
+        self._sending: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: List[str], model: str, dimensions: Optional[int] = None) -> List[List[float]]:
+        """Enfileira os textos e aguarda os vetores, na ordem recebida"""
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        key = (model, dimensions)
+        futures = []
+        for text in texts:
+            text = truncate_input(text, self.max_input_tokens)
+            tokens = estimate_tokens(text)
+            batch = self._pending.get(key)
+            # Fecha o lote atual se o novo texto estourar o limite de tokens
+            if batch is not None and batch.texts and batch.tokens + tokens > self.max_tokens:
+                self._flush(key)
+                batch = None
+            if batch is None:
+                batch = self._pending[key] = _PendingBatch()
+                batch.timer = loop.create_task(self._flush_later(key, batch))
+
+            future = loop.create_future()
+            batch.texts.append(text)
+            batch.futures.append(future)
+            batch.enqueued_at.append(time.perf_counter())
+            batch.tokens += tokens
+            futures.append(future)
+
+            if len(batch.texts) >= self.max_batch_size or batch.tokens >= self.max_tokens:
+                self._flush(key)
+
+        return list(await asyncio.gather(*futures))
+
+    async def _flush_later(self, key, batch: _PendingBatch) -> None:
+        await asyncio.sleep(self.window_seconds)
+        if self._pending.get(key) is batch:
+            self._flush(key)
+
+    def _flush(self, key) -> None:
+        batch = self._pending.pop(key)
+        if batch.timer is not None and batch.timer is not asyncio.current_task():
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key, batch: _PendingBatch) -> None:
+        model, dimensions = key
+        sent_at = time.perf_counter()
+        metrics.histogram("embedding_batch_size", buckets=BATCH_SIZE_BUCKETS).observe(len(batch.texts))
+        wait_histogram = metrics.histogram("embedding_batch_wait_seconds")
+        for enqueued_at in batch.enqueued_at:
+            wait_histogram.observe(sent_at - enqueued_at)
+
+        try:
+            vectors = await self._call(batch.texts, model, dimensions)
+        except Exception as e:
+            if len(batch.texts) == 1:
+                logger.error(f"Erro no embedding: {str(e)}")
+                self._resolve(batch.futures[0], error=e)
+                return
+            logger.error(f"Erro no lote de {len(batch.texts)} embeddings, reenviando um a um: {str(e)}")
+            metrics.counter("embedding_batch_splits_total").inc()
+            await asyncio.gather(*[
+                self._send_single(text, future, model, dimensions)
+                for text, future in zip(batch.texts, batch.futures)
+            ])
+            return
+
+        for future, vector in zip(batch.futures, vectors):
+            self._resolve(future, vector)
+
+    async def _call(self, texts: List[str], model: str, dimensions: Optional[int]) -> List[List[float]]:
+        vectors = await self.embed_batch(texts, model, dimensions)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Esperados {len(texts)} embeddings, recebidos {len(vectors)}")
+        return vectors
+
+    async def _send_single(self, text: str, future: asyncio.Future, model: str, dimensions: Optional[int]) -> None:
+        if future.done():
+            return
+        try:
+            vectors = await self._call([text], model, dimensions)
+        except Exception as e:
+            logger.error(f"Erro no embedding de um texto do lote: {str(e)}")
+            self._resolve(future, error=e)
+            return
+        self._resolve(future, vectors[0])
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, vector=None, error: Optional[Exception] = None) -> None:
+        # O pedido pode ter sido cancelado (prazo da análise) enquanto o lote estava em voo
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(vector)
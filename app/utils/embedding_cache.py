@@ -0,0 +1,109 @@
+import hashlib
+import os
+import logging
+import struct
+from typing import Optional, Sequence, Union
+import numpy as np
+from app.config.settings import settings
+from app.utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# Formatos de armazenamento dos vetores: código gravado no cabeçalho e dtype
+STORAGE_DTYPES = {
+    "float32": (0, np.float32),
+    "float16": (1, np.float16),
+    "int8": (2, np.int8),
+}
+_DTYPE_BY_CODE = {code: (name, dtype) for name, (code, dtype) in STORAGE_DTYPES.items()}
+# código do formato, fator de escala
+_HEADER = struct.Struct("<Bf")
+
+
+def embedding_key(model: str, dimensions: Optional[int], text: str) -> str:
+    """Chave (modelo, dimensões, SHA-256 do texto normalizado)"""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{dimensions or 'default'}:{digest}"
+
+
+def pack_vector(vector: Union[Sequence[float], np.ndarray], dtype: str = "float32") -> bytes:
+    """
+    Serializa o vetor no formato compacto indicado:
+    - float32: 4 bytes por dimensão, sem perdas
+    - float16: 2 bytes por dimensão
+    - int8: 1 byte por dimensão, quantização simétrica com escala por vetor
+    """
+    code, numpy_dtype = STORAGE_DTYPES[dtype]
+    values = np.asarray(vector, dtype=np.float32)
+    scale = 1.0
+    if numpy_dtype is np.int8:
+        peak = float(np.abs(values).max()) if values.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        values = np.clip(np.rint(values / scale), -127, 127)
+    return _HEADER.pack(code, scale) + values.astype(numpy_dtype).tobytes()
+
+
+def unpack_vector(data: Union[bytes, memoryview]) -> np.ndarray:
+    """
+    Restaura o vetor como float32, qualquer que seja o formato armazenado.
+    Vetores já em float32 não são copiados: o array (somente leitura) aponta
+    para `data`, inclusive quando é um memoryview sobre o arquivo mapeado.
+    """
+    code, scale = _HEADER.unpack_from(data)
+    _, numpy_dtype = _DTYPE_BY_CODE[code]
+    values = np.frombuffer(data, dtype=numpy_dtype, offset=_HEADER.size).astype(np.float32, copy=False)
+    if numpy_dtype is np.int8:
+        values *= scale
+    return values
+
+
+class EmbeddingCache(TieredCache):
+    """
+    Cache de embeddings, endereçado pelo modelo, dimensões e hash do texto
+    já normalizado (text_normalization.normalize_document).
+
+    Os vetores são guardados no formato compacto `dtype` nas duas camadas;
+    em float16 um embedding de 1536 dimensões ocupa 3KB, em int8 1,5KB, em
+    vez de ~37KB como lista Python. Com o backend "mmap" a camada em disco é
+    um arquivo mapeado em memória compartilhado por todos os workers, sem
+    LRU por worker (ver TieredCache).
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        store_path: Optional[str],
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        dtype: str = "float32",
+        backend: str = "sqlite"
+    ):
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Formato de embedding desconhecido: {dtype}")
+        super().__init__("embedding", memory_bytes, store_path, ttl_seconds, max_entries, backend)
+        self.dtype = dtype
+
+    def get(self, model: str, dimensions: Optional[int], text: str) -> Optional[np.ndarray]:
+        value = self.get_bytes(embedding_key(model, dimensions, text))
+        return unpack_vector(value) if value is not None else None
+
+    def set(self, model: str, dimensions: Optional[int], text: str, vector) -> np.ndarray:
+        """Armazena o vetor e o retorna como será lido do cache"""
+        data = pack_vector(vector, self.dtype)
+        self.set_bytes(embedding_key(model, dimensions, text), data)
+        return unpack_vector(data)
+
+
+_STORE_FILES = {"sqlite": "embeddings.sqlite3", "mmap": "embeddings.bin"}
+
+embedding_cache = EmbeddingCache(
+    memory_bytes=settings.EMBEDDING_CACHE_MEMORY_BYTES,
+    store_path=(
+        os.path.join(settings.CACHE_DIR, _STORE_FILES.get(settings.EMBEDDING_STORE_BACKEND, "embeddings.bin"))
+        if settings.CACHE_DIR else None
+    ),
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES or None,
+    dtype=settings.EMBEDDING_STORE_DTYPE,
+    backend=settings.EMBEDDING_STORE_BACKEND
+)
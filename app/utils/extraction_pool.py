@@ -0,0 +1,383 @@
+import asyncio
+import mmap
+import multiprocessing
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple, Union
+from app.config.settings import settings
+from app.utils.extractors import iter_document_text, probe_document
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """Falha do parser ao extrair o texto do documento"""
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    complete: bool
+    elapsed: float
+    # (página, motivo) das páginas não extraídas; ver pdf_handler.SkippedPage
+    skipped_pages: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def truncated(self) -> bool:
+        """Indica se a extração parou ao atingir o orçamento de caracteres"""
+        return any(reason == "budget" for _, reason in self.skipped_pages)
+
+
+@dataclass
+class _JobOutcome:
+    chunks: List[str]
+    skipped_pages: List[Tuple[int, str]]
+    finished: bool
+    value: object = None
+
+
+class _MappedFile(mmap.mmap):
+    """mmap com a interface de arquivo exigida pelo zipfile (seekable)"""
+
+    def seekable(self) -> bool:
+        return True
+
+
+def _send_chunks(conn, chunks: Iterator) -> None:
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            conn.send(("chunk", chunk))
+        else:
+            conn.send(("skip", tuple(chunk)))
+
+
+def _run_operation(conn, op: str, kind: str, buffer, options: Optional[dict]) -> None:
+    if op == "extract":
+        _send_chunks(conn, iter_document_text(kind, buffer, options))
+    elif op == "probe":
+        conn.send(("result", probe_document(kind, buffer)))
+    else:
+        raise ValueError(f"Operação desconhecida: {op}")
+
+
+def _worker_main(conn) -> None:
+    """
+    Loop do processo de extração. Cada parte do texto é enviada assim que
+    extraída, permitindo ao processo pai aproveitar o texto parcial caso
+    o worker precise ser encerrado por timeout.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+
+        op, kind, source, options = job
+        try:
+            if isinstance(source, str):
+                # Caminho do upload em disco: mapeia o arquivo em vez de copiá-lo pelo pipe;
+                # workers que processam o mesmo arquivo compartilham as páginas em cache do SO
+                with open(source, "rb") as f, _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    _run_operation(conn, op, kind, buffer, options)
+            else:
+                _run_operation(conn, op, kind, source, options)
+            conn.send(("done", None))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        finally:
+            self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=5)
+        except Exception:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Pool de processos dedicados à extração de texto de documentos.
+
+    O parsing roda fora do event loop; documentos que excedem o limite
+    de tempo têm o worker encerrado e substituído, devolvendo o texto
+    extraído até aquele momento.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        start_method: str = "spawn",
+        parallel_page_threshold: int = 0
+    ):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.parallel_page_threshold = parallel_page_threshold
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queue_depth = metrics.gauge("extraction_queue_depth")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                return
+            for _ in range(self.size):
+                self._idle.put(_Worker(self._context))
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size,
+                thread_name_prefix="extraction"
+            )
+            logger.info(f"Pool de extração iniciado com {self.size} workers")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                return
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            while not self._idle.empty():
+                self._idle.get_nowait().stop()
+            logger.info("Pool de extração encerrado")
+
+    async def extract(
+        self,
+        kind: str,
+        source: Union[bytes, str],
+        options: Optional[dict] = None,
+        timeout: Optional[float] = None
+    ) -> ExtractionResult:
+        """
+        Extrai o texto de `source`, que pode ser o conteúdo do arquivo ou,
+        preferencialmente, o caminho do upload em disco (evita copiar os
+        bytes para o processo worker).
+
+        PDFs em disco com mais páginas que `parallel_page_threshold` são
+        divididos em intervalos de páginas extraídos por vários workers em
+        paralelo; o texto é remontado na ordem das páginas. O número de
+        páginas vem em `options["total_pages"]` (a verificação rápida já o
+        calculou); sem ele, a extração é feita por um só worker.
+        """
+        self.start()
+        timeout = timeout if timeout is not None else self.timeout
+        options = dict(options or {})
+        total_pages = options.pop("total_pages", None)
+        start = time.monotonic()
+
+        outcome = None
+        if self._can_split(kind, source, total_pages):
+            outcome = await self._extract_parallel(kind, source, options, timeout, total_pages)
+        if outcome is None:
+            outcome = await self._submit("extract", kind, source, options, timeout)
+
+        elapsed = time.monotonic() - start
+        metrics.histogram("extraction_parse_seconds", kind=kind).observe(elapsed)
+        return ExtractionResult(
+            text="".join(outcome.chunks),
+            complete=outcome.finished,
+            elapsed=elapsed,
+            skipped_pages=sorted(outcome.skipped_pages)
+        )
+
+    async def probe(
+        self,
+        kind: str,
+        source: Union[bytes, str],
+        timeout: Optional[float] = None
+    ) -> Optional[dict]:
+        """
+        Verificação rápida da camada de texto (ver extractors.probe_document).
+        Retorna None se o formato não tem verificação ou se ela não terminou a tempo.
+        """
+        self.start()
+        start = time.monotonic()
+        outcome = await self._submit("probe", kind, source, None, timeout if timeout is not None else self.timeout)
+        metrics.histogram("extraction_probe_seconds", kind=kind).observe(time.monotonic() - start)
+        return outcome.value if outcome.finished else None
+
+    def _can_split(self, kind: str, source: Union[bytes, str], total_pages: Optional[int]) -> bool:
+        # Apenas arquivos em disco: bytes teriam de ser copiados para cada worker
+        return (
+            kind == "pdf"
+            and isinstance(source, str)
+            and self.size > 1
+            and self.parallel_page_threshold > 0
+            and total_pages is not None
+            and total_pages > self.parallel_page_threshold
+        )
+
+    async def _extract_parallel(
+        self,
+        kind: str,
+        path: str,
+        options: dict,
+        timeout: float,
+        total_pages: int
+    ) -> _JobOutcome:
+        max_pages = options.get("max_pages")
+        if max_pages is not None and total_pages > max_pages:
+            raise ExtractionError(f"PDF exceeds maximum page limit of {max_pages}")
+
+        parts = min(self.size, total_pages)
+        step = -(-total_pages // parts)
+        ranges = [(first, min(first + step, total_pages)) for first in range(0, total_pages, step)]
+        metrics.counter("extraction_parallel_total", kind=kind).inc()
+        logger.info(f"Extraindo PDF de {total_pages} páginas em {len(ranges)} intervalos")
+
+        outcomes = await asyncio.gather(*[
+            self._submit("extract", kind, path, {**options, "page_range": page_range}, timeout)
+            for page_range in ranges
+        ])
+        return self._merge_ranges(ranges, outcomes, options.get("max_chars"))
+
+    @staticmethod
+    def _merge_ranges(ranges, outcomes: List[_JobOutcome], max_chars: Optional[int]) -> _JobOutcome:
+        """
+        Remonta os intervalos na ordem das páginas, reaplicando o orçamento de
+        caracteres sobre o documento inteiro (cada intervalo o aplica sozinho).
+        """
+        chunks: List[str] = []
+        skipped_pages: List[Tuple[int, str]] = []
+        remaining = max_chars
+
+        for (first, last), outcome in zip(ranges, outcomes):
+            skipped = {page for page, _ in outcome.skipped_pages}
+            skipped_pages.extend(outcome.skipped_pages)
+            # Cada parte de texto do extrator de PDF corresponde a uma página não ignorada
+            text_pages = [page for page in range(first, last) if page not in skipped]
+            for page, chunk in zip(text_pages, outcome.chunks):
+                if remaining is not None:
+                    if remaining <= 0:
+                        skipped_pages.append((page, "budget"))
+                        continue
+                    chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+                chunks.append(chunk)
+
+        return _JobOutcome(
+            chunks=chunks,
+            skipped_pages=skipped_pages,
+            finished=all(outcome.finished for outcome in outcomes)
+        )
+
+    async def _submit(
+        self,
+        op: str,
+        kind: str,
+        source: Union[bytes, str],
+        options: Optional[dict],
+        timeout: float
+    ) -> _JobOutcome:
+        # O prazo começa na submissão: a espera por um worker livre também conta,
+        # e um job cuja requisição já desistiu não chega a ocupar o worker
+        deadline = time.monotonic() + timeout
+        self._queue_depth.inc()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self._run_job,
+            op,
+            kind,
+            source,
+            options,
+            timeout,
+            deadline
+        )
+
+    def _run_job(
+        self,
+        op: str,
+        kind: str,
+        source: Union[bytes, str],
+        options: Optional[dict],
+        timeout: float,
+        deadline: float
+    ) -> _JobOutcome:
+        try:
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                raise queue.Empty
+            worker = self._idle.get(timeout=wait)
+        except queue.Empty:
+            logger.warning(f"Operação {op} em {kind} aguardou {timeout:.1f}s sem worker livre")
+            metrics.counter("extraction_queue_timeouts_total", kind=kind).inc()
+            return _JobOutcome(chunks=[], skipped_pages=[], finished=False)
+        finally:
+            self._queue_depth.dec()
+
+        chunks: List[str] = []
+        skipped_pages: List[Tuple[int, str]] = []
+        value = None
+        finished = False
+        healthy = False
+        error: Optional[str] = None
+
+        try:
+            worker.conn.send((op, kind, source, options))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    break
+                status, payload = worker.conn.recv()
+                if status == "chunk":
+                    chunks.append(payload)
+                elif status == "skip":
+                    skipped_pages.append(payload)
+                elif status == "result":
+                    value = payload
+                elif status == "done":
+                    finished = healthy = True
+                    break
+                else:
+                    error = payload
+                    healthy = True
+                    break
+        except (EOFError, OSError) as e:
+            error = f"Worker de extração finalizado inesperadamente: {str(e)}"
+
+        if not finished and error is None:
+            logger.warning(f"Operação {op} em {kind} excedeu {timeout:.1f}s; reiniciando worker")
+            metrics.counter("extraction_timeouts_total", kind=kind).inc()
+        if not healthy:
+            # Worker travado ou em estado desconhecido: substitui por um novo
+            worker.kill()
+            metrics.counter("extraction_worker_restarts_total").inc()
+            worker = _Worker(self._context)
+        self._idle.put(worker)
+
+        if error is not None:
+            raise ExtractionError(error)
+        return _JobOutcome(chunks=chunks, skipped_pages=skipped_pages, finished=finished, value=value)
+
+
+extraction_pool = ExtractionPool(
+    size=settings.EXTRACTION_WORKERS,
+    timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+    start_method=settings.EXTRACTION_START_METHOD,
+    parallel_page_threshold=settings.EXTRACTION_PARALLEL_PAGE_THRESHOLD
+)
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple, Union
+
+# Um extrator recebe os bytes (ou stream) do documento e os limites, e produz
+# partes de texto (str) ou páginas ignoradas (pdf_handler.SkippedPage)
+Extractor = Callable[[Union[bytes, BinaryIO], "ExtractionLimits"], Iterator]
+
+
+# Incrementar sempre que a saída de algum extrator mudar, invalidando o texto
+# já armazenado em cache (app.utils.text_cache)
+EXTRACTOR_VERSION = "5"
+
+
+class UnsupportedFormatError(Exception):
+    """Formato identificado pelo magic number sem extrator registrado"""
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    """Limites aplicados igualmente a todos os formatos"""
+    max_pages: Optional[int] = None
+    max_chars: Optional[int] = None
+    # Intervalo [início, fim) de páginas a extrair (extração paralela de PDFs)
+    page_range: Optional[Tuple[int, int]] = None
+
+    def as_options(self) -> dict:
+        return {
+            "max_pages": self.max_pages,
+            "max_chars": self.max_chars,
+            "page_range": self.page_range
+        }
+
+    def cache_tag(self) -> str:
+        """Identifica os limites na chave do cache de texto"""
+        return f"p{self.max_pages or 0}:c{self.max_chars or 0}"
+
+
+def _extract_pdf(content, limits: ExtractionLimits) -> Iterator:
+    from app.utils.pdf_handler import iter_pdf_pages
+    return iter_pdf_pages(
+        content,
+        max_pages=limits.max_pages,
+        max_chars=limits.max_chars,
+        page_range=limits.page_range
+    )
+
+
+def _extract_docx(content, limits: ExtractionLimits) -> Iterator:
+    from app.utils.docx_handler import iter_docx_text
+    return iter_docx_text(content)
+
+
+# Registro de extratores, indexado pelo formato de upload_ingest.sniff_format
+EXTRACTORS: Dict[str, Extractor] = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+}
+
+
+def probe_document(kind: str, content: Union[bytes, BinaryIO]) -> Optional[dict]:
+    """
+    Verificação rápida, antes da extração completa, se o documento tem
+    camada de texto. Retorna None para formatos sem verificação.
+    """
+    if kind == "pdf":
+        from app.utils.pdf_handler import probe_pdf_text_layer
+        probe = probe_pdf_text_layer(content)
+        return {**probe._asdict(), "image_only": probe.image_only, "empty": probe.empty}
+    return None
+
+
+def register_extractor(kind: str, extractor: Extractor) -> None:
+    EXTRACTORS[kind] = extractor
+
+
+def is_supported(kind: str) -> bool:
+    return kind in EXTRACTORS
+
+
+def _apply_char_budget(chunks: Iterator, max_chars: int) -> Iterator:
+    """
+    Garante o orçamento de caracteres para qualquer extrator. Extratores que
+    já param sozinhos (como o de PDF) passam por aqui sem alteração.
+    """
+    remaining = max_chars
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            yield chunk
+            continue
+        if remaining <= 0:
+            return
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+
+
+def iter_document_text(
+    kind: str,
+    content: Union[bytes, BinaryIO],
+    options: Optional[dict] = None
+) -> Iterator:
+    """Despacha para o extrator registrado do formato, produzindo o texto em partes"""
+    extractor = EXTRACTORS.get(kind)
+    if extractor is None:
+        raise UnsupportedFormatError(f"Formato não suportado: {kind}")
+
+    limits = ExtractionLimits(**(options or {}))
+    chunks = extractor(content, limits)
+    if limits.max_chars is not None:
+        chunks = _apply_char_budget(chunks, limits.max_chars)
+    return chunks
@@ -1,52 +1,180 @@
 from pypdf import PdfReader
 import io
 import logging
-from fastapi import HTTPException
-import time
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
-def process_pdf(content: bytes, max_pages: int = 100) -> str:
+class SkippedPage(NamedTuple):
+    """Página não extraída: 'image_only', 'empty', 'error' ou 'budget'"""
+    page: int
+    reason: str
+
+def classify_page(page) -> Optional[str]:
+    """
+    Inspeciona apenas o dicionário de recursos da página, sem decodificar
+    o conteúdo, e retorna o motivo para ignorá-la (ou None se pode ter texto).
+    """
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    if resources.get("/Font"):
+        return None
+
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    subtypes = {xobjects[name].get_object().get("/Subtype") for name in xobjects}
+    if "/Form" in subtypes:
+        # Form XObjects podem conter texto com fontes próprias
+        return None
+    if "/Image" in subtypes:
+        return "image_only"
+    return "empty"
+
+class PdfTextProbe(NamedTuple):
+    total_pages: int
+    font_pages: int
+    form_pages: int  # páginas sem fontes, mas com Form XObjects
+    image_pages: int
+    sampled: int
+    sampled_with_text: int
+
+    @property
+    def image_only(self) -> bool:
+        """PDF digitalizado: nenhuma página com camada de texto utilizável"""
+        if self.form_pages:
+            return False
+        if self.font_pages == 0:
+            return self.image_pages > 0
+        return self.sampled_with_text == 0
+
+    @property
+    def empty(self) -> bool:
+        return self.font_pages == 0 and self.form_pages == 0 and self.image_pages == 0
+
+def _is_text_stream(data: bytes) -> bool:
+    return b"BT" in data and (b"Tj" in data or b"TJ" in data)
+
+def _forms_have_text(resources, depth: int = 2) -> bool:
+    """Texto desenhado por Form XObjects (`/Fm1 Do`), inclusive aninhados"""
+    xobjects = resources.get("/XObject") if resources is not None else None
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    for name in xobjects:
+        xobject = xobjects[name].get_object()
+        if xobject.get("/Subtype") != "/Form":
+            continue
+        if _is_text_stream(xobject.get_data()):
+            return True
+        inner = xobject.get("/Resources")
+        if depth > 1 and inner is not None and _forms_have_text(inner.get_object(), depth - 1):
+            return True
+    return False
+
+def _has_text_operators(page) -> bool:
+    contents = page.get_contents()
+    if contents is not None and _is_text_stream(contents.get_data()):
+        return True
+    # Páginas com /Font podem desenhar o texto só dentro de um Form XObject
+    resources = page.get("/Resources")
+    return _forms_have_text(resources.get_object() if resources is not None else None)
+
+def probe_pdf_text_layer(content: Union[bytes, BinaryIO], sample_pages: int = 3) -> PdfTextProbe:
+    """
+    Verificação rápida da camada de texto, sem extrair texto:
+    - classifica todas as páginas apenas pelo dicionário de recursos
+    - em uma amostra de páginas com fontes (início, meio e fim), confirma a
+      presença de operadores de texto (BT ... Tj/TJ) no content stream ou nos
+      Form XObjects usados pela página
     """
-    Processa arquivo PDF com proteções contra loops infinitos e validações de segurança
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    pdf_reader = PdfReader(stream)
+
+    font_pages = []
+    form_pages = image_pages = 0
+    for index, page in enumerate(pdf_reader.pages):
+        try:
+            reason = classify_page(page)
+            resources = page.get("/Resources")
+            has_fonts = resources is not None and bool(resources.get_object().get("/Font"))
+        except Exception:
+            # Na dúvida, deixa a extração decidir
+            reason, has_fonts = None, True
+        if has_fonts:
+            font_pages.append(index)
+        elif reason is None:
+            form_pages += 1
+        elif reason == "image_only":
+            image_pages += 1
+
+    if len(font_pages) <= sample_pages:
+        sample = font_pages
+    else:
+        step = (len(font_pages) - 1) / (sample_pages - 1) if sample_pages > 1 else 0
+        sample = sorted({font_pages[round(i * step)] for i in range(sample_pages)})
+
+    sampled_with_text = 0
+    for index in sample:
+        try:
+            if _has_text_operators(pdf_reader.pages[index]):
+                sampled_with_text += 1
+        except Exception as e:
+            logger.warning(f"Erro ao inspecionar página {index}: {str(e)}")
+            sampled_with_text += 1
+
+    return PdfTextProbe(
+        total_pages=len(pdf_reader.pages),
+        font_pages=len(font_pages),
+        form_pages=form_pages,
+        image_pages=image_pages,
+        sampled=len(sample),
+        sampled_with_text=sampled_with_text
+    )
+
+def iter_pdf_pages(
+    content: Union[bytes, BinaryIO],
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    page_range: Optional[Tuple[int, int]] = None
+) -> Iterator[Union[str, SkippedPage]]:
+    """
+    Extrai o texto do PDF página a página.
+    Aceita os bytes do arquivo ou um stream (ex: arquivo mapeado em memória).
+
+    Páginas sem fontes (somente imagem ou vazias) e páginas com erro de
+    extração são ignoradas e reportadas como SkippedPage. Com `max_chars`,
+    a extração para assim que o orçamento de caracteres é atingido e as
+    páginas restantes são reportadas com o motivo 'budget'. Com `page_range`
+    (início, fim), apenas esse intervalo de páginas é processado.
     """
-    try:
-        # Proteção contra arquivos muito grandes
-        MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail="PDF file size exceeds maximum limit"
-            )
-
-        # Timeout global para todo o processamento
-        start_time = time.time()
-        MAX_PROCESSING_TIME = 30  # 30 segundos total
-
-        pdf_reader = PdfReader(io.BytesIO(content))
-        
-        if len(pdf_reader.pages) > max_pages:
-            raise HTTPException(
-                status_code=400,
-                detail=f"PDF exceeds maximum page limit of {max_pages}"
-            )
-        
-        text = ""
-        for page in pdf_reader.pages:
-            # Verifica timeout global
-            if time.time() - start_time > MAX_PROCESSING_TIME:
-                logger.warning("PDF processing timeout reached")
-                break
-
-            try:
-                page_text = page.extract_text()
-                text += page_text
-            except Exception as e:
-                logger.error(f"Error extracting text from page: {str(e)}")
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    pdf_reader = PdfReader(stream)
+    total_pages = len(pdf_reader.pages)
+
+    if max_pages is not None and total_pages > max_pages:
+        raise ValueError(f"PDF exceeds maximum page limit of {max_pages}")
+
+    first, last = page_range if page_range is not None else (0, total_pages)
+    last = min(last, total_pages)
+
+    remaining = max_chars
+    for index in range(first, last):
+        if remaining is not None and remaining <= 0:
+            for skipped in range(index, last):
+                yield SkippedPage(skipped, "budget")
+            return
+
+        page = pdf_reader.pages[index]
+        try:
+            reason = classify_page(page)
+            if reason is not None:
+                yield SkippedPage(index, reason)
                 continue
-                
-        return text.strip()
-        
-    except Exception as e:
-        logger.error(f"Error processing PDF: {str(e)}")
-        raise HTTPException(status_code=400, detail="Error processing PDF file")
+            page_text = page.extract_text() or ""
+        except Exception as e:
+            logger.error(f"Error extracting text from page: {str(e)}")
+            yield SkippedPage(index, "error")
+            continue
+
+        if remaining is not None:
+            page_text = page_text[:remaining]
+            remaining -= len(page_text)
+        yield page_text
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+from app.utils import deadline
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Uma etapa recebe os resultados das dependências como argumentos nomeados
+StageFunc = Callable[..., Awaitable[Any]]
+
+
+class StageTimeoutError(Exception):
+    """Uma etapa do pipeline excedeu seu tempo limite"""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Etapa '{stage}' excedeu {timeout:.1f}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+@dataclass
+class _Stage:
+    name: str
+    func: StageFunc
+    deps: Sequence[str]
+    timeout: Optional[float]
+
+
+class StagePipeline:
+    """
+    Pequeno grafo de dependências entre etapas assíncronas.
+
+    Cada etapa começa assim que suas dependências terminam, então etapas
+    independentes (ex.: extrair o currículo e buscar as vagas) se sobrepõem e
+    a latência total tende à do caminho mais longo, não à soma das etapas.
+    Se uma etapa falha ou excede o timeout, as demais são canceladas e o erro
+    é propagado. As durações de cada etapa ficam em `timings` e na métrica
+    `{name}_stage_seconds`; os resultados das etapas concluídas ficam em
+    `results` mesmo quando outra etapa falha.
+
+    Com `deadline_seconds`, a execução inteira tem um prazo: cada etapa roda
+    com o menor entre o seu timeout e o tempo que resta (app.utils.deadline),
+    então a latência total é limitada mesmo que o caminho crítico some mais.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._stages: Dict[str, _Stage] = {}
+        self.timings: Dict[str, float] = {}
+        self.results: Dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        func: StageFunc,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None
+    ) -> "StagePipeline":
+        unknown = [dep for dep in deps if dep not in self._stages]
+        if unknown:
+            # Dependências declaradas antes garantem que o grafo não tem ciclos
+            raise ValueError(f"Etapa '{name}' depende de etapas não declaradas: {unknown}")
+        self._stages[name] = _Stage(name, func, tuple(deps), timeout)
+        return self
+
+    async def _run_stage(self, stage: _Stage, tasks: Dict[str, asyncio.Task]) -> Any:
+        inputs = {dep: await tasks[dep] for dep in stage.deps}
+        start = time.perf_counter()
+        # O prazo da etapa vale também para o que ela chamar (deadline.remaining)
+        with deadline.deadline_scope(stage.timeout):
+            timeout = deadline.remaining()
+            try:
+                if timeout is not None and timeout <= 0:
+                    raise asyncio.TimeoutError
+                result = await asyncio.wait_for(stage.func(**inputs), timeout=timeout)
+            except asyncio.TimeoutError:
+                metrics.counter(f"{self.name}_stage_timeouts_total", stage=stage.name).inc()
+                raise StageTimeoutError(stage.name, timeout or 0.0)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.timings[stage.name] = elapsed
+                metrics.histogram(f"{self.name}_stage_seconds", stage=stage.name).observe(elapsed)
+        self.results[stage.name] = result
+        return result
+
+    async def run(self, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Executa todas as etapas e devolve {etapa: resultado}"""
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        # As tarefas herdam o prazo do contexto em que são criadas
+        with deadline.deadline_scope(deadline_seconds):
+            for stage in self._stages.values():
+                tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, tasks))
+
+        try:
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            return {name: task.result() for name, task in tasks.items()}
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            # Recolhe as tarefas canceladas (e exceções secundárias) antes de sair
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            total = time.perf_counter() - started
+            summary = " ".join(f"{name}={seconds:.2f}s" for name, seconds in self.timings.items())
+            logger.info(f"Pipeline {self.name}: {summary} total={total:.2f}s")
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from app.utils.text_normalization import normalize_document
+
+# Vocabulário de cabeçalhos de seção (formas normalizadas, minúsculas)
+SECTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "resumo": ("resumo", "sobre mim", "perfil", "objetivo", "apresentação"),
+    "experiência": ("experiência", "experiencias", "profissional", "trabalho", "carreira"),
+    "formação": ("formação", "educação", "acadêmico", "escolaridade"),
+    "habilidades": ("habilidades", "competências", "conhecimentos", "tecnologias", "skills"),
+    "certificações": ("certificações", "certificados", "cursos", "qualificações"),
+    "idiomas": ("idiomas", "línguas"),
+    "projetos": ("projetos", "portfolio", "realizações"),
+}
+
+# Peso de cada seção na similaridade agregada do currículo
+SECTION_WEIGHTS: Dict[str, float] = {
+    "experiência": 1.5,
+    "habilidades": 1.5,
+    "projetos": 1.2,
+    "resumo": 1.0,
+    "certificações": 0.8,
+    "formação": 0.8,
+    "geral": 0.8,
+    "idiomas": 0.5,
+}
+
+# Linhas mais longas que isso são conteúdo, não cabeçalho de seção
+MAX_HEADER_LENGTH = 40
+
+
+@dataclass(frozen=True)
+class ResumeChunk:
+    section: str
+    text: str
+
+    @property
+    def weight(self) -> float:
+        return SECTION_WEIGHTS.get(self.section, 1.0)
+
+
+def match_section(line: str) -> Optional[str]:
+    """Seção cujo vocabulário aparece na linha (normalizada), ou None"""
+    for section_name, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in line for keyword in keywords):
+            return section_name
+    return None
+
+
+def chunk_resume(text: str, max_chars: int = 2000) -> List[ResumeChunk]:
+    """
+    Divide o currículo (forma normalizada) em trechos alinhados às seções.
+
+    Um novo trecho começa a cada cabeçalho de seção; seções maiores que
+    `max_chars` são quebradas em limites de linha. Como cada trecho depende
+    apenas das próprias linhas, editar uma seção não altera os demais, que
+    continuam com o mesmo hash no cache de embeddings.
+    """
+    chunks: List[ResumeChunk] = []
+    section = "geral"
+    current: List[str] = []
+    size = 0
+
+    def flush():
+        if current:
+            chunks.append(ResumeChunk(section, "\n".join(current)))
+
+    for line in normalize_document(text).lines:
+        header = match_section(line) if len(line) <= MAX_HEADER_LENGTH else None
+        if header is not None or (current and size + len(line) + 1 > max_chars):
+            flush()
+            current, size = [], 0
+            if header is not None:
+                section = header
+        # Linhas isoladas maiores que o limite são divididas
+        while len(line) > max_chars:
+            chunks.append(ResumeChunk(section, line[:max_chars]))
+            line = line[max_chars:]
+        current.append(line)
+        size += len(line) + 1
+
+    flush()
+    return chunks
@@ -0,0 +1,67 @@
+"""
+Similaridade de cosseno vetorizada sobre matrizes float32.
+
+Os embeddings são convertidos uma única vez em matrizes contíguas com linhas
+de norma 1; a similaridade entre todos os pares vira um único produto de
+matrizes, sem a conversão e validação por par do scikit-learn.
+"""
+from typing import Sequence, Union
+import numpy as np
+
+Vectors = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def to_unit_matrix(vectors: Vectors) -> np.ndarray:
+    """
+    Matriz (n, d) float32 contígua com cada linha normalizada.
+    Linhas nulas permanecem nulas (similaridade 0 com qualquer vetor).
+    """
+    matrix = np.array(vectors, dtype=np.float32, order="C", ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def cosine_matrix(queries: Vectors, candidates: Vectors) -> np.ndarray:
+    """Similaridade de todas as consultas contra todos os candidatos, shape (q, c)"""
+    return to_unit_matrix(queries) @ to_unit_matrix(candidates).T
+
+
+def cosine_scores(query: Vectors, candidates: Vectors) -> np.ndarray:
+    """Similaridade de um vetor contra cada candidato, shape (c,)"""
+    return cosine_matrix(query, candidates)[0]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices dos k maiores valores em ordem decrescente (por linha, se 2D).
+    Usa argpartition, O(n) em vez de ordenar todos os candidatos.
+    """
+    scores = np.asarray(scores)
+    size = scores.shape[-1]
+    k = min(k, size)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if k < size:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(size), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def pool_chunk_scores(
+    scores: np.ndarray,
+    weights: Sequence[float],
+    max_weight: float = 0.5
+) -> np.ndarray:
+    """
+    Agrega a matriz (trechos, vagas) em uma similaridade por vaga.
+
+    Combina o melhor trecho (max) com a média ponderada pelos pesos dos
+    trechos: `max_weight * max + (1 - max_weight) * média ponderada`.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    weights = np.asarray(weights, dtype=np.float32)
+    weighted_mean = weights @ scores / weights.sum()
+    return max_weight * scores.max(axis=0) + (1 - max_weight) * weighted_mean
@@ -0,0 +1,51 @@
+import hashlib
+import os
+import logging
+from typing import Optional
+from app.config.settings import settings
+from app.utils.cache import TieredCache
+from app.utils.extractors import EXTRACTOR_VERSION, ExtractionLimits
+
+logger = logging.getLogger(__name__)
+
+# Gravado no lugar do texto para documentos rejeitados como digitalizados
+# (somente imagens); nenhuma extração produz exatamente este valor
+IMAGE_ONLY = "\x00image-only"
+
+
+def content_digest(content: bytes) -> str:
+    """Retorna o SHA-256 (hex) do conteúdo enviado"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ExtractedTextCache(TieredCache):
+    """
+    Cache do texto extraído de currículos, endereçado pelo SHA-256 do arquivo,
+    pela versão dos extratores e pelos limites de extração (texto truncado com
+    outros limites não é reaproveitado).
+
+    Possui duas camadas:
+    - LRU em memória, limitada por bytes, local a cada worker
+    - SQLite em disco, compartilhada por todos os workers do host
+    """
+
+    def __init__(self, memory_bytes: int, store_path: Optional[str], ttl_seconds: Optional[int] = None):
+        super().__init__("text", memory_bytes, store_path, ttl_seconds)
+
+    @staticmethod
+    def _key(digest: str, limits: ExtractionLimits) -> str:
+        return f"v{EXTRACTOR_VERSION}:{limits.cache_tag()}:{digest}"
+
+    def get(self, digest: str, limits: ExtractionLimits = ExtractionLimits()) -> Optional[str]:
+        value = self.get_bytes(self._key(digest, limits))
+        return str(value, "utf-8") if value is not None else None
+
+    def set(self, digest: str, text: str, limits: ExtractionLimits = ExtractionLimits()) -> None:
+        self.set_bytes(self._key(digest, limits), text.encode("utf-8"))
+
+
+text_cache = ExtractedTextCache(
+    memory_bytes=settings.TEXT_CACHE_MEMORY_BYTES,
+    store_path=os.path.join(settings.CACHE_DIR, "extracted_text.sqlite3") if settings.CACHE_DIR else None,
+    ttl_seconds=settings.TEXT_CACHE_TTL_SECONDS
+)
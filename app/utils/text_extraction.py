@@ -1,28 +1,167 @@
-from app.utils.pdf_handler import process_pdf
-from fastapi import UploadFile
+from app.config.settings import settings
+from app.utils import deadline
+from app.utils.extraction_pool import extraction_pool, ExtractionError
+from app.utils.extractors import ExtractionLimits, is_supported
+from app.utils.metrics import metrics
+from app.utils.text_cache import IMAGE_ONLY, text_cache
+from app.utils.upload_ingest import IngestedUpload, ingest_bytes, ingest_upload
+from fastapi import HTTPException, UploadFile
+from typing import Iterable, Optional
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+IMAGE_ONLY_MESSAGE = (
+    "Não foi possível encontrar texto no arquivo. Ele parece ser um documento "
+    "digitalizado (somente imagens); envie um PDF ou DOCX com texto selecionável."
+)
+
+def default_limits() -> ExtractionLimits:
+    """Limites de extração configurados, iguais para todos os formatos"""
+    return ExtractionLimits(
+        max_pages=settings.EXTRACTION_MAX_PAGES or None,
+        max_chars=settings.EXTRACTION_MAX_CHARS or None
+    )
+
+def _ensure_text(text: str) -> str:
+    """Evita enviar documentos sem texto para as etapas de embedding e análise"""
+    if not text.strip():
+        metrics.counter("empty_text_rejections_total").inc()
+        raise HTTPException(status_code=422, detail=IMAGE_ONLY_MESSAGE)
+    return text
+
+async def check_upload(upload: IngestedUpload, allowed_kinds: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Verificações rápidas, sem a extração completa: formato suportado, texto
+    já extraído no cache e a verificação de PDFs digitalizados (somente
+    imagens), que leva milissegundos.
+
+    Returns:
+        O texto, se o mesmo arquivo já foi extraído; senão None
+
+    Raises:
+        HTTPException: formato não suportado, arquivo inválido ou documento
+            sem texto (422)
+    """
+    if not is_supported(upload.kind) or (allowed_kinds is not None and upload.kind not in allowed_kinds):
+        raise HTTPException(status_code=400, detail="Formato de arquivo não suportado")
+
+    limits = default_limits()
+    # Reenvios do mesmo arquivo reutilizam o texto já extraído
+    cached_text = text_cache.get(upload.digest, limits)
+    if cached_text == IMAGE_ONLY:
+        metrics.counter("image_only_rejections_total", kind=upload.kind).inc()
+        raise HTTPException(status_code=422, detail=IMAGE_ONLY_MESSAGE)
+    if cached_text is not None:
+        logger.info(f"Texto obtido do cache ({upload.digest[:12]})")
+        return _ensure_text(cached_text)
+
+    try:
+        probe = await extraction_pool.probe(
+            upload.kind,
+            upload.path,
+            timeout=deadline.cap(settings.EXTRACTION_PROBE_TIMEOUT_SECONDS)
+        )
+    except ExtractionError as e:
+        logger.error(f"Erro ao processar arquivo: {str(e)}")
+        raise HTTPException(status_code=400, detail="Erro ao processar arquivo")
+    if probe is not None and probe["image_only"]:
+        logger.info(f"Documento sem camada de texto rejeitado: {probe}")
+        metrics.counter("image_only_rejections_total", kind=upload.kind).inc()
+        # Reenvios do mesmo arquivo são rejeitados direto pelo cache
+        text_cache.set(upload.digest, IMAGE_ONLY, limits)
+        raise HTTPException(status_code=422, detail=IMAGE_ONLY_MESSAGE)
+    if probe is not None:
+        # A extração reaproveita a contagem em vez de abrir o PDF de novo
+        upload.total_pages = probe["total_pages"]
+    return None
+
+async def extract_ingested_text(upload: IngestedUpload) -> str:
+    """
+    Extração completa de um upload que já passou por check_upload, no pool
+    de processos e com os limites configurados; o texto vai para o cache.
+    """
+    limits = default_limits()
+    try:
+        # O parsing roda no pool de processos, fora do event loop; dentro
+        # do prazo da análise, termina a tempo de devolver o texto parcial
+        result = await extraction_pool.extract(
+            upload.kind,
+            upload.path,
+            options={**limits.as_options(), "total_pages": upload.total_pages},
+            timeout=deadline.cap(settings.EXTRACTION_TIMEOUT_SECONDS, margin=deadline.PARTIAL_MARGIN_SECONDS)
+        )
+    except ExtractionError as e:
+        logger.error(f"Erro ao processar arquivo: {str(e)}")
+        raise HTTPException(status_code=400, detail="Erro ao processar arquivo")
+
+    if result.skipped_pages:
+        logger.info(f"Páginas ignoradas na extração: {result.skipped_pages}")
+
+    if not result.complete:
+        logger.warning(f"Extração interrompida após {result.elapsed:.1f}s; usando texto parcial")
+        if not result.text.strip():
+            raise HTTPException(status_code=400, detail="Tempo limite excedido ao processar arquivo")
+        return result.text
+
+    text_cache.set(upload.digest, result.text, limits)
+    return _ensure_text(result.text)
+
+async def extract_upload_text(file: UploadFile, allowed_kinds: Optional[Iterable[str]] = None) -> str:
+    """
+    Ponto único de extração de texto para todas as rotas de upload.
+
+    O upload é lido uma única vez (upload_ingest), o extrator é escolhido
+    pelo magic number identificado nessa leitura, o parsing roda no pool
+    de processos com os limites configurados e o resultado é armazenado
+    no cache por hash do conteúdo.
+
+    PDFs digitalizados (somente imagens) são rejeitados por uma verificação
+    rápida antes da extração completa (check_upload).
+
+    Raises:
+        HTTPException: formato não suportado, arquivo inválido, documento sem
+            texto (422) ou timeout sem texto
+    """
+    upload = await ingest_upload(file, settings.MAX_UPLOAD_SIZE)
+
+    with upload:
+        cached_text = await check_upload(upload, allowed_kinds)
+        if cached_text is not None:
+            return cached_text
+        return await extract_ingested_text(upload)
+
+async def extract_stored_text(data: bytes) -> str:
+    """
+    Extrai o texto de um upload guardado por inteiro (fila de análises: o
+    envio só faz check_upload e o worker extrai)
+    """
+    upload = await asyncio.to_thread(ingest_bytes, data)
+    with upload:
+        cached_text = await check_upload(upload)
+        if cached_text is not None:
+            return cached_text
+        return await extract_ingested_text(upload)
+
 async def extract_text_from_pdf(file: UploadFile) -> str:
     """
-    Extracts text from a PDF file using the pdf_handler module.
-    
+    Extracts text from a PDF file using the shared extraction pipeline.
+
     Args:
         file (UploadFile): The uploaded PDF file
-        
+
     Returns:
         str: Extracted text from the PDF
-        
+
     Raises:
         HTTPException: If there's an error processing the PDF
     """
     try:
-        content = await file.read()
-        text = process_pdf(content)
+        text = await extract_upload_text(file, allowed_kinds={"pdf"})
         await file.seek(0)  # Reset file pointer for potential future reads
-        return text
-        
+        return text.strip()
+
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
-        raise
\ No newline at end of file
+        raise
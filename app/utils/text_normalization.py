@@ -0,0 +1,117 @@
+import re
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+# Hífen seguido de quebra de linha no meio de uma palavra ("desenvol-\nvimento")
+_HYPHEN_BREAK = re.compile(r"[-\u2010\u00ad][ \t]*\r?\n[ \t]*(?=[^\W\d_])")
+_LINE_BREAKS = {"\n", "\r", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029"}
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """
+    Forma normalizada de um documento, calculada uma única vez.
+
+    - text: NFKC (inclui ligaduras), hifenização desfeita, espaços colapsados,
+      minúsculas e sem linhas vazias
+    - offsets: para cada caractere de `text`, o índice correspondente no original
+    - lines: linhas de `text`
+    - match_lines: linhas sem pontuação, usadas na comparação de palavras-chave
+    """
+    original: str
+    text: str
+    offsets: array
+    lines: Tuple[str, ...]
+    match_lines: Tuple[str, ...]
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Converte um intervalo [start, end) de `text` para o texto original"""
+        if start >= end:
+            position = self.offsets[start] if start < len(self.offsets) else len(self.original)
+            return position, position
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+
+def comparison_form(text: str) -> str:
+    """Forma usada para comparar palavras-chave: normalizada e sem pontuação"""
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(_NON_WORD.sub(" ", normalized).split())
+
+
+def _normalize(original: str) -> Tuple[str, array]:
+    chars: List[str] = []
+    offsets = array("I")
+    pending_space = -1  # índice do primeiro espaço pendente, ou -1
+    at_line_start = True
+    i, length = 0, len(original)
+
+    while i < length:
+        char = original[i]
+
+        if char in _LINE_BREAKS:
+            if not at_line_start:
+                chars.append("\n")
+                offsets.append(i)
+                at_line_start = True
+            pending_space = -1
+            i += 1
+            continue
+
+        if char in "-\u2010\u00ad" and chars and chars[-1].isalpha():
+            match = _HYPHEN_BREAK.match(original, i)
+            if match and original[match.end()].islower():
+                i = match.end()
+                continue
+        if char == "\u00ad":
+            i += 1
+            continue
+
+        # Agrupa o caractere base com as marcas combinantes seguintes
+        end = i + 1
+        while end < length and unicodedata.combining(original[end]):
+            end += 1
+        cluster = original[i:end]
+        if not cluster.isascii():
+            cluster = unicodedata.normalize("NFKC", cluster)
+
+        for out in cluster.lower():
+            if out.isspace():
+                if pending_space < 0:
+                    pending_space = i
+                continue
+            if pending_space >= 0 and not at_line_start:
+                chars.append(" ")
+                offsets.append(pending_space)
+            pending_space = -1
+            at_line_start = False
+            chars.append(out)
+            offsets.append(i)
+        i = end
+
+    if chars and chars[-1] == "\n":
+        chars.pop()
+        offsets.pop()
+    return "".join(chars), offsets
+
+
+@lru_cache(maxsize=64)
+def normalize_document(original: str) -> NormalizedText:
+    """
+    Normaliza o documento uma única vez por processo; chamadas repetidas com
+    o mesmo texto (matcher de palavras-chave, detector de seções, embeddings)
+    reutilizam o resultado.
+    """
+    text, offsets = _normalize(original)
+    lines = tuple(text.split("\n")) if text else ()
+    match_lines = tuple(" ".join(_NON_WORD.sub(" ", line).split()) for line in lines)
+    return NormalizedText(
+        original=original,
+        text=text,
+        offsets=offsets,
+        lines=lines,
+        match_lines=match_lines
+    )
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import tempfile
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC_NUMBERS = {
+    b'%PDF': 'pdf',
+    b'\xD0\xCF\x11\xE0': 'doc',
+    b'PK\x03\x04': 'docx'
+}
+HEADER_SIZE = 4
+
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """Identifica o formato do arquivo pelos primeiros bytes (magic number)"""
+    for magic, kind in MAGIC_NUMBERS.items():
+        if header.startswith(magic):
+            return kind
+    return None
+
+
+@dataclass
+class IngestedUpload:
+    """Upload já gravado em disco, com hash e formato identificados"""
+    path: str
+    size: int
+    digest: str
+    kind: str
+    header: bytes
+    # Preenchido pela verificação rápida (text_extraction.check_upload)
+    total_pages: Optional[int] = None
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "IngestedUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def ingest_upload(
+    file: UploadFile,
+    max_size: int,
+    chunk_size: Optional[int] = None
+) -> IngestedUpload:
+    """
+    Lê o upload em blocos, numa única passada:
+    - valida o magic number no primeiro bloco
+    - calcula o SHA-256 incrementalmente
+    - aplica o limite de tamanho sem carregar o arquivo inteiro em memória
+    - grava o conteúdo num arquivo temporário que os extratores mapeiam em memória
+
+    O chamador é responsável por chamar close() (ou usar como context manager).
+    """
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    hasher = hashlib.sha256()
+    header = b""
+    kind = None
+    size = 0
+
+    spool = tempfile.NamedTemporaryFile(
+        prefix="upload-",
+        dir=settings.UPLOAD_SPOOL_DIR,
+        delete=False
+    )
+    try:
+        with spool:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+
+                if kind is None:
+                    header = (header + chunk)[:HEADER_SIZE]
+                    if len(header) >= HEADER_SIZE:
+                        kind = sniff_format(header)
+                        if kind is None:
+                            raise HTTPException(status_code=400, detail="Conteúdo do arquivo inválido")
+
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(status_code=400, detail="Arquivo muito grande")
+
+                hasher.update(chunk)
+                spool.write(chunk)
+
+        if kind is None:
+            raise HTTPException(status_code=400, detail="Conteúdo do arquivo inválido")
+
+        return IngestedUpload(
+            path=spool.name,
+            size=size,
+            digest=hasher.hexdigest(),
+            kind=kind,
+            header=header
+        )
+    except BaseException:
+        os.unlink(spool.name)
+        raise
+
+
+def ingest_bytes(data: bytes) -> IngestedUpload:
+    """
+    Grava um upload já recebido por inteiro (ex.: guardado na fila de
+    análises) como IngestedUpload, para passar pela mesma extração.
+    Síncrona: quem está no event loop chama via asyncio.to_thread.
+    """
+    kind = sniff_format(data[:HEADER_SIZE])
+    if kind is None:
+        raise HTTPException(status_code=400, detail="Conteúdo do arquivo inválido")
+
+    with tempfile.NamedTemporaryFile(prefix="upload-", dir=settings.UPLOAD_SPOOL_DIR, delete=False) as spool:
+        spool.write(data)
+    return IngestedUpload(
+        path=spool.name,
+        size=len(data),
+        digest=hashlib.sha256(data).hexdigest(),
+        kind=kind,
+        header=data[:HEADER_SIZE]
+    )
@@ -0,0 +1,111 @@
+import ipaddress
+import re
+from typing import List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parâmetros (em minúsculas) que só identificam a origem do clique, nunca a vaga
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "igshid", "_ga", "_gl",
+    "ref", "refid", "trackingid", "trk", "trkinfo", "lipi", "ebp", "recommendedflavor",
+    "originalsubdomain", "jobboardsource", "tk", "advn", "sjdu",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Sufixos públicos de dois níveis mais comuns nos links recebidos
+_TWO_LEVEL_SUFFIXES = {"com.br", "net.br", "org.br", "gov.br", "co.uk", "com.pt", "com.ar", "com.mx"}
+
+_LINKEDIN_JOB_PATH = re.compile(r"/(?:comm/)?jobs/view/(?:[^/]*?-)?(\d+)")
+
+
+def extract_domain(url: str) -> str:
+    """Domínio registrável do link: https://empresa.gupy.io/jobs/1 -> gupy.io"""
+    host = (urlsplit(url).hostname or "").lower().rstrip(".")
+    labels = host.split(".")
+    if len(labels) >= 3 and ".".join(labels[-2:]) in _TWO_LEVEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _is_tracking(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def _query(params: List[Tuple[str, str]]) -> str:
+    return urlencode(sorted(params))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Forma canônica de um link de vaga, usada como chave de cache e para a busca:
+    - esquema e host em minúsculas, sem porta padrão nem fragmento
+    - parâmetros de rastreamento removidos e os demais ordenados
+    - variantes do LinkedIn (currentJobId, /comm/, subdomínios de país, slug)
+      reduzidas a https://www.linkedin.com/jobs/view/<id>/
+    - variantes do Indeed (viewjob, rc/clk, vjk) reduzidas a /viewjob?jk=<id>
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    port = parts.port
+    netloc = host if port is None or (scheme, port) in {("http", 80), ("https", 443)} else f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+              if not _is_tracking(name)]
+    domain = extract_domain(url)
+
+    if domain == "linkedin.com":
+        job_id = dict(params).get("currentJobId")
+        match = _LINKEDIN_JOB_PATH.search(path)
+        if match:
+            job_id = match.group(1)
+        if job_id:
+            return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+    if domain == "indeed.com":
+        values = dict(params)
+        job_key = values.get("jk") or values.get("vjk")
+        if job_key:
+            return urlunsplit(("https", netloc, "/viewjob", _query([("jk", job_key)]), ""))
+
+    return urlunsplit((scheme, netloc, path, _query(params), ""))
+
+
+class BlockedURLError(ValueError):
+    """Link que o servidor não deve buscar: esquema não http(s) ou host interno"""
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Endereço IP público. Loopback, redes privadas, link-local (inclusive o
+    serviço de metadados da nuvem, 169.254.169.254) e multicast não são.
+    """
+    try:
+        # Endereços IPv6 com escopo vêm como "fe80::1%eth0"
+        ip = ipaddress.ip_address(address.split("%")[0])
+    except ValueError:
+        return False
+    return ip.is_global and not ip.is_multicast
+
+
+def check_fetch_url(url: str, allow_private: bool = False) -> None:
+    """
+    Verifica um link antes de cada requisição (inclusive em redirecionamentos).
+    Hosts com IP literal são conferidos aqui; hosts por nome, na resolução
+    de DNS da sessão (http_session.PublicResolver), que fornece os endereços
+    usados na conexão.
+
+    Raises:
+        BlockedURLError: esquema inválido ou IP literal não público
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BlockedURLError(f"Link não suportado: {url}")
+    if allow_private:
+        return
+    try:
+        ipaddress.ip_address(parts.hostname.split("%")[0])
+    except ValueError:
+        return
+    if not is_public_address(parts.hostname):
+        raise BlockedURLError(f"Endereço interno não permitido: {parts.hostname}")
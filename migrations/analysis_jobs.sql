@@ -0,0 +1,25 @@
+-- Fila de análises assíncronas (POST /cv/analyze/submit, scripts/analysis_worker.py)
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id UUID PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES users(id),
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    resume_text TEXT,
+    resume_file BYTEA,
+    job_links JSONB NOT NULL,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    visible_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    locked_by VARCHAR,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_analysis_jobs_user_id ON analysis_jobs (user_id);
+
+-- Só as linhas que os workers ainda podem pegar entram no índice da fila
+CREATE INDEX IF NOT EXISTS ix_analysis_jobs_claim
+ON analysis_jobs (visible_at)
+WHERE status IN ('queued', 'running');
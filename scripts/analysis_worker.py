@@ -0,0 +1,83 @@
+"""
+Worker de análises assíncronas: consome a fila analysis_jobs (Postgres) das
+análises enviadas por POST /cv/analyze/submit.
+
+Uso:
+    python scripts/analysis_worker.py [--concorrencia 4] [--id worker-1]
+
+Vários workers (processos ou máquinas) podem rodar contra o mesmo banco;
+cada análise é pega por um só deles (FOR UPDATE SKIP LOCKED). SIGINT/SIGTERM
+param de pegar análises novas e aguardam as que estão em execução.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.routes.cv_analysis import run_analysis_job
+from app.services import analysis_queue
+from app.services.http_session import close_http_session
+from app.services.llm import close_llm_provider
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("analysis_worker")
+
+
+async def work(worker_id: str, stopping: asyncio.Event) -> None:
+    while not stopping.is_set():
+        db = SessionLocal()
+        try:
+            # Consultas síncronas fora do event loop, que é compartilhado
+            # com as outras análises deste processo (run_analysis_job faz o
+            # mesmo com as suas)
+            job = await asyncio.to_thread(
+                analysis_queue.claim, db, worker_id, settings.ANALYSIS_QUEUE_VISIBILITY_TIMEOUT_SECONDS
+            )
+            if job is None:
+                # Jitter evita que todos os workers consultem a fila juntos
+                poll = settings.ANALYSIS_QUEUE_POLL_SECONDS * random.uniform(0.5, 1.5)
+                try:
+                    await asyncio.wait_for(stopping.wait(), timeout=poll)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            logger.info(f"{worker_id}: análise {job.id} (tentativa {job.attempts}/{job.max_attempts})")
+            status = await run_analysis_job(db, job, worker_id)
+            logger.info(f"{worker_id}: análise {job.id} -> {status}")
+        except Exception as e:
+            logger.error(f"{worker_id}: erro no worker: {str(e)}")
+            await asyncio.to_thread(db.rollback)
+            await asyncio.sleep(settings.ANALYSIS_QUEUE_POLL_SECONDS)
+        finally:
+            await asyncio.to_thread(db.close)
+
+
+async def main(args) -> None:
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    base_id = args.id or f"{socket.gethostname()}-{os.getpid()}"
+    logger.info(f"Worker {base_id} com {args.concorrencia} análises simultâneas")
+    try:
+        await asyncio.gather(*[work(f"{base_id}-{n}", stopping) for n in range(args.concorrencia)])
+    finally:
+        await close_llm_provider()
+        await close_http_session()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker da fila de análises")
+    parser.add_argument("--concorrencia", type=int, default=settings.ANALYSIS_WORKER_CONCURRENCY)
+    parser.add_argument("--id", default=None, help="Identificador do worker (padrão: host-pid)")
+    asyncio.run(main(parser.parse_args()))
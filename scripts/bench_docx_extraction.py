@@ -0,0 +1,87 @@
+"""
+Compara o extrator DOCX em streaming com o python-docx (tempo e pico de memória).
+
+Uso:
+    python scripts/bench_docx_extraction.py [diretorio_com_docx] [--repeticoes N]
+
+Sem diretório, gera um corpus sintético com cabeçalho, tabelas e vários
+parágrafos, semelhante aos modelos de currículo mais comuns.
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+from app.utils.docx_handler import iter_docx_text
+
+
+def extract_with_python_docx(content: bytes) -> str:
+    doc = docx.Document(io.BytesIO(content))
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+
+def extract_streaming(content: bytes) -> str:
+    return "".join(iter_docx_text(content))
+
+
+def synthetic_corpus() -> dict:
+    corpus = {}
+    for sections in (5, 20, 80):
+        doc = docx.Document()
+        doc.sections[0].header.paragraphs[0].text = "Nome Sobrenome - email@exemplo.com - (11) 99999-9999"
+        for i in range(sections):
+            doc.add_heading(f"Experiência {i}", level=2)
+            doc.add_paragraph("Responsável por desenvolvimento de APIs, gestão de equipe ágil e " * 3)
+            table = doc.add_table(rows=4, cols=2)
+            for row in range(4):
+                table.cell(row, 0).text = f"Competência {row}"
+                table.cell(row, 1).text = "Python, SQL, AWS, Docker, Kubernetes"
+        output = io.BytesIO()
+        doc.save(output)
+        corpus[f"sintetico_{sections}_secoes.docx"] = output.getvalue()
+    return corpus
+
+
+def measure(func, content: bytes, repetitions: int):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        text = func(content)
+    elapsed = (time.perf_counter() - start) / repetitions
+
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(text)
+
+
+def run(directory: str = None, repetitions: int = 20):
+    if directory:
+        corpus = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.docx"))):
+            with open(path, "rb") as f:
+                corpus[os.path.basename(path)] = f.read()
+    else:
+        corpus = synthetic_corpus()
+
+    print(f"{'arquivo':<32} {'KB':>6} | {'python-docx ms':>14} {'pico KB':>9} {'chars':>7} | "
+          f"{'streaming ms':>12} {'pico KB':>9} {'chars':>7}")
+    for name, content in corpus.items():
+        base_time, base_peak, base_chars = measure(extract_with_python_docx, content, repetitions)
+        new_time, new_peak, new_chars = measure(extract_streaming, content, repetitions)
+        print(f"{name:<32} {len(content) // 1024:>6} | {base_time * 1000:>14.2f} {base_peak // 1024:>9} {base_chars:>7} | "
+              f"{new_time * 1000:>12.2f} {new_peak // 1024:>9} {new_chars:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    run(args.directory, args.repeticoes)
@@ -0,0 +1,100 @@
+"""
+Precisão vs. tamanho dos formatos de armazenamento de embeddings.
+
+Uso:
+    python scripts/bench_embedding_quantization.py [--provedor openai|fake]
+        [--dimensoes 1536,512,256] [--dir pasta_com_curriculos_e_vagas]
+
+Com --dir, usa os arquivos <dir>/curriculos/*.txt e <dir>/vagas/*.txt; sem
+ele, um pequeno conjunto embutido de currículos e vagas. Para cada dimensão
+(parâmetro `dimensions` dos modelos text-embedding-3) e formato (float32,
+float16, int8), compara a similaridade de cada par currículo/vaga com a
+referência float32 na dimensão completa.
+"""
+import argparse
+import asyncio
+import glob
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.config.settings import settings
+from app.services.llm import FakeLLMProvider, OpenAIProvider
+from app.utils.embedding_cache import STORAGE_DTYPES, pack_vector, unpack_vector
+from app.utils.similarity import cosine_matrix
+
+RESUMES = [
+    "Desenvolvedor back-end Python com 6 anos de experiência em FastAPI, Django, PostgreSQL e AWS.",
+    "Analista de dados com SQL, Power BI, Python, pandas e modelagem estatística para varejo.",
+    "Designer de produto com foco em UX research, Figma, prototipação e testes de usabilidade.",
+    "Engenheira DevOps: Kubernetes, Terraform, CI/CD com GitHub Actions, observabilidade e AWS.",
+    "Gerente de projetos PMP, Scrum Master, gestão de equipes ágeis e orçamento de TI.",
+]
+
+JOBS = [
+    "Vaga para desenvolvedor Python sênior com FastAPI, microsserviços e AWS.",
+    "Cientista de dados com Python, machine learning, SQL e comunicação com o negócio.",
+    "Product designer para aplicativo mobile, pesquisa com usuários e design system.",
+    "SRE com Kubernetes, Terraform, monitoramento e resposta a incidentes.",
+    "Coordenador de projetos de TI com experiência em metodologias ágeis e PMO.",
+    "Desenvolvedor front-end React, TypeScript e testes automatizados.",
+]
+
+
+def load_texts(directory):
+    if not directory:
+        return RESUMES, JOBS
+    read = lambda pattern: [open(path, encoding="utf-8").read() for path in sorted(glob.glob(pattern))]
+    return read(os.path.join(directory, "curriculos", "*.txt")), read(os.path.join(directory, "vagas", "*.txt"))
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    rank = lambda values: np.argsort(np.argsort(values)).astype(np.float64)
+    return float(np.corrcoef(rank(a), rank(b))[0, 1])
+
+
+async def run(args):
+    resumes, jobs = load_texts(args.dir)
+    if args.provedor == "fake":
+        provider = FakeLLMProvider()
+    else:
+        provider = OpenAIProvider(api_key=settings.OPENAI_API_KEY, base_url=settings.LLM_BASE_URL)
+
+    try:
+        baseline_vectors = await provider.embed(resumes + jobs, settings.EMBEDDING_MODEL)
+        baseline = cosine_matrix(baseline_vectors[:len(resumes)], baseline_vectors[len(resumes):])
+        full_dimensions = len(baseline_vectors[0])
+        best_baseline = baseline.argmax(axis=1)
+
+        print(f"{len(resumes)} currículos x {len(jobs)} vagas | referência: float32, {full_dimensions} dimensões")
+        print(f"{'dims':>5} | {'formato':>8} | {'bytes':>6} | {'redução':>7} | "
+              f"{'erro máx':>8} | {'spearman':>8} | {'top-1':>6}")
+
+        for dimensions in [int(d) for d in args.dimensoes.split(",")]:
+            if dimensions >= full_dimensions:
+                vectors, dimensions = baseline_vectors, full_dimensions
+            else:
+                vectors = await provider.embed(resumes + jobs, settings.EMBEDDING_MODEL, dimensions)
+
+            for dtype in STORAGE_DTYPES:
+                packed = [pack_vector(vector, dtype) for vector in vectors]
+                restored = [unpack_vector(data) for data in packed]
+                scores = cosine_matrix(restored[:len(resumes)], restored[len(resumes):])
+                size = len(packed[0])
+                error = float(np.abs(scores - baseline).max())
+                top1 = float((scores.argmax(axis=1) == best_baseline).mean())
+                print(f"{dimensions:>5} | {dtype:>8} | {size:>6} | {full_dimensions * 4 / size:>6.1f}x | "
+                      f"{error:>8.4f} | {spearman(scores.ravel(), baseline.ravel()):>8.4f} | {top1:>6.0%}")
+    finally:
+        await provider.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--provedor", choices=["openai", "fake"], default="openai")
+    parser.add_argument("--dimensoes", default="1536,512,256")
+    parser.add_argument("--dir")
+    args = parser.parse_args()
+    asyncio.run(run(args))
@@ -0,0 +1,97 @@
+"""
+Compara uma ClientSession nova por análise (comportamento anterior) com a
+sessão compartilhada do worker (app.services.http_session) em buscas
+repetidas contra um servidor HTTP local.
+
+Uso:
+    python scripts/bench_http_session.py [--analises 200] [--links 2] [--tls]
+
+Com --tls o servidor usa um certificado autoassinado gerado na hora, para
+incluir o custo do handshake TLS que a sessão compartilhada evita.
+"""
+import argparse
+import asyncio
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from aiohttp import web
+from app.config.settings import settings
+from app.services.http_session import create_http_session
+
+PAGE = "<html><body><h1>Desenvolvedor Python</h1>" + "<p>Requisitos: Python, AWS.</p>" * 200 + "</body></html>"
+
+
+def self_signed_context(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    server = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server.load_cert_chain(cert, key)
+    client = ssl.create_default_context(cafile=cert)
+    return server, client
+
+
+async def fetch_all(session: aiohttp.ClientSession, urls, ssl_context):
+    async def fetch(url):
+        async with session.get(url, ssl=ssl_context) as response:
+            return await response.read()
+    return await asyncio.gather(*[fetch(url) for url in urls])
+
+
+async def run(args):
+    async def job(request):
+        return web.Response(text=PAGE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/vagas/{job_id}", job)
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server_ssl, client_ssl = self_signed_context(directory) if args.tls else (None, None)
+        site = web.TCPSite(runner, "localhost", 0, ssl_context=server_ssl)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        scheme = "https" if args.tls else "http"
+        urls = [f"{scheme}://localhost:{port}/vagas/{i}" for i in range(args.links)]
+
+        start = time.perf_counter()
+        for _ in range(args.analises):
+            async with aiohttp.ClientSession() as session:
+                await fetch_all(session, urls, client_ssl)
+        per_request = (time.perf_counter() - start) / args.analises
+
+        # O servidor de teste é local: libera hosts privados na sessão compartilhada
+        settings.JOB_FETCH_ALLOW_PRIVATE_HOSTS = True
+        session = create_http_session()
+        try:
+            start = time.perf_counter()
+            for _ in range(args.analises):
+                await fetch_all(session, urls, client_ssl)
+            shared = (time.perf_counter() - start) / args.analises
+        finally:
+            await session.close()
+        await runner.cleanup()
+
+    print(f"{args.analises} análises x {args.links} links ({scheme})")
+    print(f"Sessão por análise:   {per_request * 1000:.2f} ms/análise")
+    print(f"Sessão compartilhada: {shared * 1000:.2f} ms/análise ({per_request / shared:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--analises", type=int, default=200)
+    parser.add_argument("--links", type=int, default=2)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args))
@@ -0,0 +1,78 @@
+"""
+Mede tempo e pico de memória (tracemalloc) dos parsers de vaga
+(app.services.job_parsers) contra o parse completo com BeautifulSoup, nas
+páginas salvas em tests/fixtures/jobs.
+
+Uso:
+    python scripts/bench_job_parsers.py [--repeticoes 50] [--enchimento-kb 1024]
+
+--enchimento-kb acrescenta scripts e HTML de navegação depois da descrição,
+como nas páginas reais do LinkedIn/Indeed, que passam de alguns megabytes.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from app.services.job_parsers import parse_job_html
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "jobs"
+URLS = {
+    "linkedin": "https://www.linkedin.com/jobs/view/1/",
+    "indeed": "https://br.indeed.com/viewjob?jk=1",
+    "gupy": "https://empresa.gupy.io/jobs/1",
+    "generic": "https://vagas.empresa.com.br/designer",
+}
+
+
+def pad(html: str, kilobytes: int) -> str:
+    if not kilobytes:
+        return html
+    block = ('<script>window.__data = {"items": [' + ", ".join(["1"] * 500) + "]};</script>"
+             '<div class="related"><ul>' + "<li><a href='/vaga'>Outra vaga</a></li>" * 20 + "</ul></div>")
+    filler = block * max(1, kilobytes * 1024 // len(block))
+    return html.replace("</body>", filler + "</body>")
+
+
+def parse_bs4(url: str, html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style", "noscript", "svg"]):
+        element.decompose()
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def measure(parse, url: str, html: str, repetitions: int):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        parse(url, html)
+    elapsed = (time.perf_counter() - start) / repetitions
+    tracemalloc.start()
+    parse(url, html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--enchimento-kb", type=int, default=1024)
+    args = parser.parse_args()
+
+    print(f"{'página':<10}{'tamanho':>10}{'parser ms':>12}{'parser KB':>12}{'bs4 ms':>10}{'bs4 KB':>10}")
+    for name, url in URLS.items():
+        html = pad((FIXTURES / f"{name}.html").read_text(encoding="utf-8"), args.enchimento_kb)
+        new_time, new_peak = measure(parse_job_html, url, html, args.repeticoes)
+        old_time, old_peak = measure(parse_bs4, url, html, max(1, args.repeticoes // 10))
+        print(f"{name:<10}{len(html) // 1024:>8}KB{new_time * 1000:>12.2f}{new_peak / 1024:>12.0f}"
+              f"{old_time * 1000:>10.1f}{old_peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Mede o ganho de tempo da extração paralela de PDFs por número de páginas.
+
+Uso:
+    python scripts/bench_parallel_pdf.py [--workers N] [--paginas 10,40,120]
+
+Compara o pool com a extração paralela desativada (um worker por documento)
+e ativada (intervalos de páginas divididos entre N workers).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.extraction_pool import ExtractionPool
+
+
+def build_dense_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Gera um PDF com várias linhas de texto por página"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = " ".join(
+            f"0 -14 Td (Pagina {page} linha {line}: desenvolvimento de APIs, Python, AWS, Scrum) Tj"
+            for line in range(lines_per_page)
+        )
+        stream = f"BT /F1 10 Tf 40 760 Td {lines} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+async def measure(pool: ExtractionPool, path: str, repetitions: int) -> float:
+    # Aquecimento: garante que todos os workers já importaram o pypdf
+    await asyncio.gather(*[pool.extract("pdf", path) for _ in range(pool.size)])
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        await pool.extract("pdf", path)
+    return (time.perf_counter() - start) / repetitions
+
+
+async def run(workers: int, page_counts, repetitions: int):
+    serial = ExtractionPool(size=workers, timeout=300, parallel_page_threshold=0)
+    parallel = ExtractionPool(size=workers, timeout=300, parallel_page_threshold=1)
+    print(f"CPUs disponíveis: {os.cpu_count()} | workers: {workers}")
+    print(f"{'páginas':>8} | {'serial ms':>10} | {'paralelo ms':>11} | {'ganho':>6}")
+    try:
+        for pages in page_counts:
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+                f.write(build_dense_pdf(pages))
+                f.flush()
+                serial_time = await measure(serial, f.name, repetitions)
+                parallel_time = await measure(parallel, f.name, repetitions)
+            print(f"{pages:>8} | {serial_time * 1000:>10.1f} | {parallel_time * 1000:>11.1f} | "
+                  f"{serial_time / parallel_time:>5.2f}x")
+    finally:
+        serial.shutdown()
+        parallel.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--paginas", default="10,40,120")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.workers, [int(p) for p in args.paginas.split(",")], args.repeticoes))
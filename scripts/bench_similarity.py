@@ -0,0 +1,62 @@
+"""
+Compara o cálculo de similaridade anterior (cosine_similarity do scikit-learn,
+um par por vez sobre listas) com o módulo vetorizado app.utils.similarity.
+
+Uso:
+    python scripts/bench_similarity.py [--vagas 1,5,20,100] [--dimensoes 1536]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.utils.similarity import cosine_scores, top_k
+
+
+def best_of(function, repetitions: int) -> float:
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(job_counts, dimensions: int, repetitions: int):
+    start = time.perf_counter()
+    from sklearn.metrics.pairwise import cosine_similarity
+    print(f"Importação do scikit-learn: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = np.random.default_rng(42)
+    print(f"{'vagas':>6} | {'sklearn por par ms':>18} | {'vetorizado ms':>13} | {'ganho':>7}")
+    for jobs in job_counts:
+        # Embeddings chegam da API como listas de float
+        resume = rng.normal(size=dimensions).tolist()
+        job_embeddings = rng.normal(size=(jobs, dimensions)).tolist()
+
+        def legacy():
+            similarities = [cosine_similarity([resume], [job])[0][0] for job in job_embeddings]
+            return sum(similarities) / len(similarities)
+
+        def vectorized():
+            scores = cosine_scores(resume, job_embeddings)
+            top_k(scores, 3)
+            return float(scores.mean())
+
+        assert abs(legacy() - vectorized()) < 1e-4
+        legacy_time = best_of(legacy, repetitions)
+        vectorized_time = best_of(vectorized, repetitions)
+        print(f"{jobs:>6} | {legacy_time * 1000:>18.2f} | {vectorized_time * 1000:>13.3f} | "
+              f"{legacy_time / vectorized_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vagas", default="1,5,20,100")
+    parser.add_argument("--dimensoes", type=int, default=1536)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    run([int(v) for v in args.vagas.split(",")], args.dimensoes, args.repeticoes)
@@ -0,0 +1,80 @@
+"""
+Compara a ordenação de vagas do backend local de embeddings com a do
+modelo hospedado, e mede o tempo por currículo do backend local.
+
+Uso:
+    python scripts/compare_local_embeddings.py [--dir pasta] [--idf idf.npy]
+
+Usa os mesmos textos de scripts/bench_embedding_quantization.py (ou
+<dir>/curriculos/*.txt e <dir>/vagas/*.txt). A comparação com a referência
+hospedada requer OPENAI_API_KEY; sem ela, apenas o tempo é medido.
+
+O tempo é medido duas vezes: com o cache de n-gramas por palavra vazio
+(primeiras análises do worker) e já aquecido pelos mesmos textos.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.config.settings import settings
+from app.services.llm import OpenAIProvider
+from app.services import local_embeddings
+from app.services.local_embeddings import LocalEmbedder
+from app.utils.similarity import cosine_matrix
+from app.utils.text_normalization import normalize_document
+from bench_embedding_quantization import load_texts, spearman
+
+
+async def run(args):
+    resumes, jobs = load_texts(args.dir)
+    texts = [normalize_document(text).text for text in resumes + jobs]
+
+    embedder = LocalEmbedder(dimensions=args.dimensoes, idf_path=args.idf)
+    embedder.warm_up()
+    local_embeddings._char_ngrams.clear()
+    timings = {"frio": [], "aquecido": []}
+    local = []
+    for phase in timings:
+        local = []
+        for text in texts:
+            start = time.perf_counter()
+            local.extend(embedder.embed([text]))
+            timings[phase].append(time.perf_counter() - start)
+
+    print(f"{len(resumes)} currículos x {len(jobs)} vagas | local: {args.dimensoes} dims")
+    for phase, values in timings.items():
+        print(f"Tempo local por texto ({phase}): p50 {np.median(values) * 1000:.1f} ms | "
+              f"máx {max(values) * 1000:.1f} ms")
+
+    if not settings.OPENAI_API_KEY and not settings.LLM_BASE_URL:
+        print("OPENAI_API_KEY não definida: comparação com o modelo hospedado não executada")
+        return
+
+    provider = OpenAIProvider(api_key=settings.OPENAI_API_KEY, base_url=settings.LLM_BASE_URL)
+    try:
+        hosted = await provider.embed(texts, settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSIONS)
+    finally:
+        await provider.aclose()
+
+    reference = cosine_matrix(hosted[:len(resumes)], hosted[len(resumes):])
+    scores = cosine_matrix(local[:len(resumes)], local[len(resumes):])
+
+    per_resume = [spearman(scores[i], reference[i]) for i in range(len(resumes))]
+    top1 = float((scores.argmax(axis=1) == reference.argmax(axis=1)).mean())
+    print(f"Spearman médio por currículo: {np.nanmean(per_resume):.3f}")
+    print(f"Spearman global dos pares:    {spearman(scores.ravel(), reference.ravel()):.3f}")
+    print(f"Mesma melhor vaga (top-1):    {top1:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir")
+    parser.add_argument("--idf")
+    parser.add_argument("--dimensoes", type=int, default=settings.LOCAL_EMBEDDING_DIMENSIONS)
+    args = parser.parse_args()
+    asyncio.run(run(args))
@@ -0,0 +1,29 @@
+"""
+Servidor local compatível com a API da OpenAI, com respostas determinísticas.
+
+Uso:
+    python scripts/fake_llm_server.py [--porta 8100] [--latencia-ms 500]
+
+Para apontar a API para ele:
+    LLM_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=fake uvicorn app.main:app
+
+Também serve páginas de vaga em http://127.0.0.1:8100/vagas/<id>; para a API
+buscá-las, inicie-a também com JOB_FETCH_ALLOW_PRIVATE_HOSTS=true.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from app.services.fake_llm import create_fake_app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8100)
+    parser.add_argument("--latencia-ms", type=float, default=500)
+    args = parser.parse_args()
+    web.run_app(create_fake_app(args.latencia_ms / 1000), host=args.host, port=args.porta)
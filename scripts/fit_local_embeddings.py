@@ -0,0 +1,35 @@
+"""
+Ajusta os pesos IDF do backend local de embeddings em um corpus próprio.
+
+Uso:
+    python scripts/fit_local_embeddings.py <pasta_com_txt> [--saida idf.npy]
+
+Lê todos os arquivos .txt da pasta (currículos e descrições de vagas) e grava
+os pesos em --saida; aponte LOCAL_EMBEDDING_IDF_PATH para o arquivo gerado.
+Mudar os pesos altera os vetores: limpe o cache de embeddings locais ou
+troque o arquivo somente junto com um novo deploy.
+"""
+import argparse
+import glob
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.services.local_embeddings import fit_idf
+from app.utils.text_normalization import normalize_document
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pasta")
+    parser.add_argument("--saida", default="local_embedding_idf.npy")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.pasta, "**", "*.txt"), recursive=True))
+    if not paths:
+        sys.exit(f"Nenhum .txt encontrado em {args.pasta}")
+    texts = [normalize_document(open(path, encoding="utf-8").read()).text for path in paths]
+    np.save(args.saida, fit_idf(texts))
+    print(f"Pesos IDF de {len(texts)} documentos gravados em {args.saida}")
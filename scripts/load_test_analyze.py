@@ -0,0 +1,143 @@
+"""
+Teste de carga do caminho de análise com o backend de LLM falso.
+
+Uso:
+    # Somente a camada de LLM (sem banco): sobe o servidor falso no próprio
+    # processo e mede o OpenAIProvider real, com pool de conexões
+    python scripts/load_test_analyze.py provedor [--latencia-ms 500] [--concorrencia 1,4,16]
+
+    # Caminho completo /cv/analyze de uma API já em execução com
+    # LLM_BASE_URL apontando para scripts/fake_llm_server.py (e
+    # JOB_FETCH_ALLOW_PRIVATE_HOSTS=true, para buscar as vagas locais)
+    python scripts/load_test_analyze.py api --token <jwt> --curriculo cv.pdf \
+        [--url http://localhost:8000] [--vaga http://127.0.0.1:8100/vagas/1]
+
+Para cada nível de concorrência imprime vazão (análises/s) e latências p50/p95
+das análises bem-sucedidas, e à parte as falhas (no modo api, respostas
+diferentes de 200). Com o event loop livre, a vazão deve crescer junto com a
+concorrência até o limite de LLM_MAX_CONCURRENCY. Termina com código 1 se
+alguma requisição falhou.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from aiohttp import web
+from app.services.fake_llm import create_fake_app
+from app.services.llm import OpenAIProvider
+
+RESUME = "Desenvolvedor Python com experiência em FastAPI, AWS, Docker e Scrum. " * 40
+JOB = "Buscamos desenvolvedor Python com FastAPI, PostgreSQL, AWS e metodologias ágeis. " * 20
+
+
+async def run_level(concurrency: int, requests: int, call) -> tuple:
+    """`call` retorna False quando a requisição falha; falhas não entram na vazão"""
+    latencies = []
+    failures = 0
+    queue = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(index)
+
+    async def worker():
+        nonlocal failures
+        while not queue.empty():
+            index = queue.get_nowait()
+            start = time.perf_counter()
+            if await call(index) is False:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    if not latencies:
+        return 0.0, float("nan"), float("nan"), failures
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return len(latencies) / elapsed, statistics.median(latencies), p95, failures
+
+
+def report(levels, results) -> int:
+    """Imprime a tabela e retorna o total de falhas"""
+    print(f"{'concorrência':>12} | {'análises/s':>10} | {'p50 ms':>8} | {'p95 ms':>8} | {'falhas':>6}")
+    for level, (throughput, p50, p95, failures) in zip(levels, results):
+        print(f"{level:>12} | {throughput:>10.2f} | {p50 * 1000:>8.0f} | {p95 * 1000:>8.0f} | {failures:>6}")
+    return sum(failures for *_, failures in results)
+
+
+async def run_provider(args, levels):
+    runner = web.AppRunner(create_fake_app(args.latencia_ms / 1000))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    provider = OpenAIProvider(
+        api_key="fake",
+        base_url=f"http://127.0.0.1:{port}/v1",
+        max_concurrency=max(levels)
+    )
+
+    async def analysis(index: int):
+        # Mesmo formato de analyze_resume: um lote de embeddings e um chat
+        await provider.embed([f"{RESUME} {index}", JOB], "text-embedding-3-small")
+        await provider.complete_json([{"role": "user", "content": f"{RESUME}\n{JOB}"}], "gpt-4-1106-preview")
+
+    try:
+        results = [await run_level(level, args.requisicoes or level * 4, analysis) for level in levels]
+    finally:
+        await provider.aclose()
+        await runner.cleanup()
+    return report(levels, results)
+
+
+async def run_api(args, levels):
+    with open(args.curriculo, "rb") as f:
+        content = f.read()
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def analysis(index: int):
+            form = aiohttp.FormData()
+            form.add_field("file", content, filename=os.path.basename(args.curriculo),
+                           content_type="application/pdf")
+            form.add_field("job_links", f"{args.vaga.rstrip('/')}-{index}")
+            async with session.post(f"{args.url}/cv/analyze", data=form) as response:
+                if response.status != 200:
+                    print(f"HTTP {response.status}: {(await response.text())[:200]}")
+                    return False
+                return True
+
+        results = [await run_level(level, args.requisicoes or level * 4, analysis) for level in levels]
+    return report(levels, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modo", choices=["provedor", "api"])
+    parser.add_argument("--concorrencia", default="1,4,16")
+    parser.add_argument("--requisicoes", type=int, default=0, help="por nível; padrão 4x a concorrência")
+    parser.add_argument("--latencia-ms", type=float, default=500)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token")
+    parser.add_argument("--curriculo")
+    parser.add_argument("--vaga", default="http://127.0.0.1:8100/vagas/1")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concorrencia.split(",")]
+    if args.modo == "provedor":
+        failures = asyncio.run(run_provider(args, levels))
+    else:
+        if not args.token or not args.curriculo:
+            parser.error("modo api requer --token e --curriculo")
+        failures = asyncio.run(run_api(args, levels))
+    if failures:
+        print(f"{failures} requisições falharam; a vazão considera só as bem-sucedidas")
+        sys.exit(1)
@@ -0,0 +1,92 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.utils import url_canonical
+
+
+def build_pdf(pages_text, form_pages=()):
+    """
+    Gera um PDF mínimo com uma linha de texto (Helvetica) por página.
+    Entradas None geram uma página contendo apenas uma imagem (PDF escaneado).
+    Nas páginas em `form_pages` o texto é desenhado por um Form XObject
+    (`/Fm1 Do`), com a fonte declarada também nos recursos da página.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, preenchido abaixo
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages_text:
+        if text is None:
+            objects.append(
+                b"<< /Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray "
+                b"/BitsPerComponent 8 /Length 1 >>\nstream\n\x00\nendstream"
+            )
+            image_id = len(objects)
+            stream = b"q 612 0 0 792 0 0 cm /Im1 Do Q"
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % image_id
+        elif len(kids) in form_pages:
+            form = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+            objects.append(
+                b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 3 0 R >> >> /Length %d >>\nstream\n" % len(form)
+                + form + b"\nendstream"
+            )
+            form_id = len(objects)
+            stream = b"q /Fm1 Do Q"
+            resources = b"<< /Font << /F1 3 0 R >> /XObject << /Fm1 %d 0 R >> >>" % form_id
+        else:
+            stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+            resources = b"<< /Font << /F1 3 0 R >> >>"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources " + resources + b" /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
+
+
+@pytest.fixture
+def loopback_publico(monkeypatch):
+    """Nos testes, 127.0.0.1 faz o papel de host público; 127.0.0.2, da rede interna"""
+    monkeypatch.setattr(url_canonical, "is_public_address", lambda address: address == "127.0.0.1")
+
+
+@pytest_asyncio.fixture
+async def internal_server():
+    """Serviço interno (ex.: metadados da nuvem) que não pode ser alcançado"""
+    hits = []
+
+    async def secret(request):
+        hits.append(request.path)
+        return web.Response(text="<html><body><p>credenciais</p></body></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/segredo", secret)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.2", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.2:{port}/segredo", hits
+    await runner.cleanup()
@@ -0,0 +1,111 @@
+"""
+Links de vaga que apontam para a rede interna, de ponta a ponta em /analyze.
+Importar app.routes conecta no banco (payment.py), então o módulo só roda
+com TEST_DATABASE_URL (ver test_analysis_queue.py).
+"""
+import io
+import os
+import uuid
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL não definido", allow_module_level=True)
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.user import User
+from app.models.user_credits import UserCredits
+from app.routes import cv_analysis
+from app.services.http_session import close_http_session
+from app.services.llm import FakeLLMProvider, set_llm_provider
+
+
+@pytest.fixture
+def user_session():
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.create_all(engine, tables=[User.__table__, UserCredits.__table__])
+    db = sessionmaker(bind=engine)()
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4()}@teste.com")
+    db.add(user)
+    db.flush()
+    db.add(UserCredits(user_id=user.id, remaining_analyses=1))
+    db.commit()
+    set_llm_provider(FakeLLMProvider())
+    yield user, db
+    set_llm_provider(None)
+    db.close()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM user_credits WHERE user_id = :id"), {"id": user.id})
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user.id})
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def redirect_server():
+    """Host "público" que redireciona para o destino em ?para="""
+    async def redirect(request):
+        raise web.HTTPFound(request.query["para"])
+
+    app = web.Application()
+    app.router.add_get("/vaga", redirect)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/vaga"
+    await close_http_session()
+    await runner.cleanup()
+
+
+def resume_upload(make_pdf) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(make_pdf(["Desenvolvedor Python com AWS"])),
+        filename="cv.pdf",
+        headers=Headers({"content-type": "application/pdf"})
+    )
+
+
+def remaining_credits(db, user) -> int:
+    db.expire_all()
+    return db.query(UserCredits).filter(UserCredits.user_id == user.id).one().remaining_analyses
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("link", [
+    "http://169.254.169.254/latest/meta-data/",
+    "http://127.0.0.1:8000/admin",
+    "10.0.0.5/jobs/1",
+])
+async def test_analyze_recusa_link_interno(user_session, make_pdf, link):
+    user, db = user_session
+    with pytest.raises(HTTPException) as error:
+        await cv_analysis.analyze_cv(file=resume_upload(make_pdf), job_links=[link], current_user=user, db=db)
+    assert error.value.status_code == 400
+    assert remaining_credits(db, user) == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_nao_segue_redirecionamento_interno(
+    user_session, make_pdf, redirect_server, internal_server, loopback_publico
+):
+    user, db = user_session
+    secret, hits = internal_server
+    link = f"{redirect_server}?para={secret}"
+
+    with pytest.raises(HTTPException) as error:
+        await cv_analysis.analyze_cv(file=resume_upload(make_pdf), job_links=[link], current_user=user, db=db)
+    assert "Nenhuma descrição de vaga" in error.value.detail
+    # O serviço interno nunca recebe a requisição e nenhum crédito é consumido
+    assert hits == []
+    assert remaining_credits(db, user) == 1
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_analyze_links.py"])
@@ -0,0 +1,60 @@
+import asyncio
+import time
+import pytest
+from app.utils import deadline
+from app.utils.pipeline import StagePipeline, StageTimeoutError
+
+
+def test_prazo_interno_nunca_passa_do_externo():
+    assert deadline.remaining() is None
+    assert deadline.cap(5) == 5
+    with deadline.deadline_scope(1.0):
+        with deadline.deadline_scope(10.0):
+            assert deadline.remaining() <= 1.0
+            assert deadline.cap(5) <= 1.0
+        with deadline.deadline_scope(0.1):
+            assert deadline.remaining(margin=0.05) <= 0.05
+    assert deadline.remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_prazo_total_limita_o_caminho_critico():
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def after(first):
+        return first
+
+    # Cada etapa aceitaria 1s, mas a requisição inteira só tem 0,15s
+    pipeline = StagePipeline("test").add("first", slow, timeout=1).add("second", after, deps=["first"], timeout=1)
+    start = time.perf_counter()
+    with pytest.raises(StageTimeoutError) as error:
+        await pipeline.run(deadline_seconds=0.15)
+    assert error.value.stage == "first"
+    assert time.perf_counter() - start < 0.3
+
+
+@pytest.mark.asyncio
+async def test_etapa_usa_resultado_parcial_dentro_do_prazo():
+    async def fetch(delay, value):
+        await asyncio.sleep(delay)
+        return value
+
+    async def jobs():
+        tasks = [asyncio.ensure_future(fetch(0.01, "vaga 1")), asyncio.ensure_future(fetch(10, "vaga 2"))]
+        done, pending = await asyncio.wait(tasks, timeout=deadline.remaining(deadline.PARTIAL_MARGIN_SECONDS))
+        for task in pending:
+            task.cancel()
+        return [task.result() for task in tasks if task in done]
+
+    async def analysis(jobs):
+        return jobs
+
+    pipeline = StagePipeline("test").add("jobs", jobs, timeout=0.4).add("analysis", analysis, deps=["jobs"])
+    results = await pipeline.run(deadline_seconds=5)
+    assert results["analysis"] == ["vaga 1"]
+    assert pipeline.timings["jobs"] < 0.4
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_deadline.py"])
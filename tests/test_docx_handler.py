@@ -0,0 +1,63 @@
+import io
+import zipfile
+import pytest
+from app.utils.docx_handler import iter_docx_text
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def build_docx(body: str, header: str = None) -> bytes:
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document {W} {MC}><w:body>{body}</w:body></w:document>'
+        )
+        if header:
+            archive.writestr("word/header1.xml", f'<w:hdr {W}>{header}</w:hdr>')
+    return output.getvalue()
+
+
+def paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_paragrafos_tabelas_e_cabecalho_em_ordem():
+    body = (
+        paragraph("Resumo")
+        + "<w:tbl><w:tr>"
+        + f"<w:tc>{paragraph('Habilidades')}</w:tc>"
+        + f"<w:tc>{paragraph('Python')}{paragraph('SQL')}</w:tc>"
+        + "</w:tr></w:tbl>"
+        + paragraph("Experiência")
+    )
+    text = "".join(iter_docx_text(build_docx(body, header=paragraph("Maria Silva"))))
+
+    assert text == "Maria Silva\nResumo\nHabilidades\tPython SQL\nExperiência\n"
+
+
+def test_caixa_de_texto_sem_duplicar_fallback():
+    """Testa que o texto da caixa aparece uma única vez"""
+    textbox = (
+        "<w:p><w:r><mc:AlternateContent>"
+        f"<mc:Choice><w:txbxContent>{paragraph('Skills: AWS')}</w:txbxContent></mc:Choice>"
+        f"<mc:Fallback><w:txbxContent>{paragraph('Skills: AWS')}</w:txbxContent></mc:Fallback>"
+        "</mc:AlternateContent></w:r></w:p>"
+    )
+    text = "".join(iter_docx_text(build_docx(textbox)))
+
+    assert text.count("Skills: AWS") == 1
+
+
+def test_arquivo_sem_documento():
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        archive.writestr("outro.xml", "<x/>")
+    with pytest.raises(ValueError):
+        list(iter_docx_text(output.getvalue()))
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_docx_handler.py"])
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from app.utils.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingBackend:
+    """Backend falso que registra cada lote recebido"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts, model, dimensions):
+        self.calls.append((list(texts), model, dimensions))
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_analises_concorrentes_compartilham_um_lote():
+    backend = RecordingBackend()
+    batcher = EmbeddingBatcher(backend, window_seconds=0.05)
+
+    first, second = await asyncio.gather(
+        batcher.embed(["curriculo", "vaga a"], "modelo"),
+        batcher.embed(["vaga bb"], "modelo")
+    )
+
+    assert len(backend.calls) == 1
+    assert first == [[9.0], [6.0]]
+    assert second == [[7.0]]
+
+
+@pytest.mark.asyncio
+async def test_lote_respeita_tamanho_maximo_e_modelo():
+    backend = RecordingBackend()
+    batcher = EmbeddingBatcher(backend, window_seconds=0.05, max_batch_size=2)
+
+    await asyncio.gather(
+        batcher.embed(["a", "b", "c"], "modelo"),
+        batcher.embed(["d"], "outro", 256)
+    )
+
+    batches = sorted((texts, model) for texts, model, _ in backend.calls)
+    assert batches == [(["a", "b"], "modelo"), (["c"], "modelo"), (["d"], "outro")]
+
+
+@pytest.mark.asyncio
+async def test_lote_respeita_limite_de_tokens():
+    backend = RecordingBackend()
+    batcher = EmbeddingBatcher(backend, window_seconds=0.05, max_tokens=30)
+
+    await batcher.embed(["x" * 80, "y" * 80], "modelo")
+
+    assert [len(texts) for texts, _, _ in backend.calls] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_erro_no_backend_chega_a_todos_do_lote():
+    async def failing(texts, model, dimensions):
+        raise RuntimeError("indisponível")
+
+    batcher = EmbeddingBatcher(failing, window_seconds=0.01)
+    results = await asyncio.gather(
+        batcher.embed(["a"], "modelo"),
+        batcher.embed(["b"], "modelo"),
+        return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_texto_invalido_nao_derruba_o_lote():
+    """Só a análise que enviou o texto problemático recebe o erro"""
+    calls = []
+
+    async def rejects_bad(texts, model, dimensions):
+        calls.append(list(texts))
+        if "ruim" in texts:
+            raise ValueError("entrada inválida")
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(rejects_bad, window_seconds=0.05)
+    good, bad = await asyncio.gather(
+        batcher.embed(["curriculo", "vaga"], "modelo"),
+        batcher.embed(["ruim"], "modelo"),
+        return_exceptions=True
+    )
+
+    assert good == [[9.0], [4.0]]
+    assert isinstance(bad, ValueError)
+    assert calls[0] == ["curriculo", "vaga", "ruim"]
+    assert sorted(calls[1:]) == [["curriculo"], ["ruim"], ["vaga"]]
+    assert not batcher._sending
+
+
+@pytest.mark.asyncio
+async def test_texto_cortado_ao_limite_do_modelo():
+    backend = RecordingBackend()
+    batcher = EmbeddingBatcher(backend, window_seconds=0.01, max_input_tokens=10)
+
+    vectors = await batcher.embed(["x" * 1000], "modelo")
+
+    assert vectors == [[20.0]]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_embedding_batcher.py"])
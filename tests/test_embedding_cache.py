@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from app.utils.cache import MappedStore, SQLiteStore
+from app.utils.embedding_cache import EmbeddingCache, embedding_key, pack_vector, unpack_vector
+
+
+def test_vetor_empacotado_em_float32():
+    vector = [0.5, -0.25, 1.0]
+    data = pack_vector(vector)
+    assert len(data) == 5 + 4 * len(vector)
+    assert unpack_vector(data).tolist() == vector
+
+
+@pytest.mark.parametrize("dtype,bytes_per_dim,tolerance", [("float16", 2, 1e-3), ("int8", 1, 1e-2)])
+def test_quantizacao_com_escala(dtype, bytes_per_dim, tolerance):
+    rng = np.random.default_rng(0)
+    vector = rng.normal(scale=0.03, size=1536).astype(np.float32)
+
+    data = pack_vector(vector, dtype)
+    restored = unpack_vector(data)
+
+    assert len(data) == 5 + bytes_per_dim * 1536
+    assert restored.dtype == np.float32
+    cosine = restored @ vector / (np.linalg.norm(restored) * np.linalg.norm(vector))
+    assert cosine > 1 - tolerance
+
+
+def test_chave_depende_do_modelo_e_dimensoes():
+    base = embedding_key("text-embedding-3-small", None, "python aws")
+    assert base != embedding_key("text-embedding-3-large", None, "python aws")
+    assert base != embedding_key("text-embedding-3-small", 256, "python aws")
+    assert base == embedding_key("text-embedding-3-small", None, "python aws")
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "mmap"])
+def test_cache_compartilhado_entre_workers(tmp_path, backend):
+    """Um segundo worker reutiliza o vetor gravado pelo primeiro"""
+    store_path = str(tmp_path / "embeddings")
+    worker_a = EmbeddingCache(memory_bytes=1024, store_path=store_path, backend=backend)
+    worker_b = EmbeddingCache(memory_bytes=1024, store_path=store_path, backend=backend)
+
+    assert worker_b.get("modelo", None, "texto") is None
+    worker_a.set("modelo", None, "texto", [0.125, 0.5])
+
+    assert worker_b.get("modelo", None, "texto").tolist() == [0.125, 0.5]
+    assert worker_b.get("modelo", None, "texto").tolist() == [0.125, 0.5]
+    if backend == "mmap":
+        # Sem LRU por worker: toda leitura vem do arquivo mapeado compartilhado
+        assert worker_b.stats()["hits_disk"] == 2
+        assert worker_b.stats()["memory_entries"] == 0
+    else:
+        assert worker_b.stats()["hits_disk"] == 1
+        assert worker_b.stats()["hits_memory"] == 1
+    assert worker_b.stats()["misses"] == 1
+
+
+def test_store_mapeado_le_sem_copia(tmp_path):
+    """Vetores float32 lidos do mapa apontam para o arquivo mapeado"""
+    cache = EmbeddingCache(memory_bytes=1024, store_path=str(tmp_path / "emb.bin"), backend="mmap")
+    cache.set("modelo", None, "texto", [0.125, 0.5])
+
+    vector = cache.get("modelo", None, "texto")
+    assert vector.tolist() == [0.125, 0.5]
+    assert not vector.flags.owndata
+    assert not vector.flags.writeable
+
+
+def test_store_mapeado_fecha_mapas_substituidos(tmp_path):
+    store = MappedStore(str(tmp_path / "store.bin"))
+    store.set("a", b"1234")
+    first = store.get("a")
+    old_map = store._map
+
+    # O arquivo cresce: o mapa antigo fica retido enquanto `first` o referencia
+    store.set("b", b"5678")
+    assert store.get("b") == b"5678"
+    assert store._map is not old_map
+    assert not old_map.closed
+    assert first == b"1234"
+
+    del first
+    store.set("c", b"9")
+    assert store.get("c") == b"9"
+    assert old_map.closed
+    assert store._retired == []
+
+
+def test_store_remove_entradas_alem_do_limite(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.sqlite3"), "embedding", max_entries=2)
+    for key in ("a", "b", "c"):
+        store.set(key, b"1234")
+    assert store.prune() == 1
+    assert store.get("a") is None
+    assert store.get("c") == b"1234"
+
+
+def test_store_mapeado_compacta_e_outro_worker_reabre(tmp_path):
+    path = tmp_path / "store.bin"
+    writer = MappedStore(str(path), max_entries=1)
+    reader = MappedStore(str(path))
+    for key in ("a", "b", "c"):
+        writer.set(key, key.encode() * 3)
+    writer.set("b", b"novo")
+    writer.delete("c")
+
+    assert reader.get("b") == b"novo"
+    assert reader.get("c") is None
+
+    size_before = path.stat().st_size
+    assert writer.prune() == 1  # "a" excede max_entries
+    assert path.stat().st_size < size_before
+
+    # O leitor percebe a troca do arquivo e continua gravando no novo
+    assert reader.get("b") == b"novo"
+    reader.set("d", b"depois")
+    assert writer.get("d") == b"depois"
+    assert writer.get("b") == b"novo"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_embedding_cache.py"])
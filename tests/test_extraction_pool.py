@@ -0,0 +1,105 @@
+import time
+import pytest
+from app.utils.extraction_pool import ExtractionPool, ExtractionError, _JobOutcome
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(size=1, timeout=30)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_extrai_pdf_no_pool(pool, make_pdf):
+    """Testa a extração completa de um PDF em processo separado"""
+    content = make_pdf(["Desenvolvedor Python", "Experiencia com AWS"])
+    result = await pool.extract("pdf", content)
+
+    assert result.complete
+    assert "Desenvolvedor Python" in result.text
+    assert "Experiencia com AWS" in result.text
+
+
+@pytest.mark.asyncio
+async def test_timeout_reinicia_worker(pool, make_pdf):
+    """Testa que um worker que excede o limite é substituído"""
+    content = make_pdf(["Pagina um", "Pagina dois"])
+    result = await pool.extract("pdf", content, timeout=0.0001)
+    assert not result.complete
+
+    # O pool continua funcional com o novo worker
+    result = await pool.extract("pdf", content)
+    assert result.complete
+    assert "Pagina dois" in result.text
+
+
+@pytest.mark.asyncio
+async def test_espera_por_worker_conta_no_timeout(pool, make_pdf):
+    """Sem worker livre, a operação termina incompleta dentro do prazo"""
+    pool.start()
+    busy = pool._idle.get()  # simula o único worker ocupado
+    try:
+        start = time.monotonic()
+        result = await pool.extract("pdf", make_pdf(["Pagina um"]), timeout=0.2)
+        assert not result.complete
+        assert result.text == ""
+        assert time.monotonic() - start < 2
+    finally:
+        pool._idle.put(busy)
+
+    result = await pool.extract("pdf", make_pdf(["Pagina um"]))
+    assert result.complete
+
+
+@pytest.mark.asyncio
+async def test_erro_de_parsing(pool):
+    with pytest.raises(ExtractionError):
+        await pool.extract("pdf", b"%PDF-corrompido")
+
+
+@pytest.mark.asyncio
+async def test_extracao_paralela_mantem_ordem(make_pdf, tmp_path):
+    """Testa a divisão em intervalos de páginas e a remontagem em ordem"""
+    path = tmp_path / "portfolio.pdf"
+    path.write_bytes(make_pdf([f"Pagina {i}" for i in range(7)]))
+
+    pool = ExtractionPool(size=3, timeout=30, parallel_page_threshold=2)
+    try:
+        result = await pool.extract("pdf", str(path), options={"total_pages": 7})
+        budget = await pool.extract("pdf", str(path), options={"max_chars": 20, "total_pages": 7})
+    finally:
+        pool.shutdown()
+
+    assert result.complete
+    assert [line.strip() for line in result.text.split("Pagina ") if line.strip()] == [str(i) for i in range(7)]
+    assert len(budget.text) == 20
+    assert budget.truncated
+    assert (6, "budget") in budget.skipped_pages
+
+
+@pytest.mark.asyncio
+async def test_contagem_de_paginas_vem_da_verificacao(tmp_path):
+    """O PDF não é aberto só para contar páginas: o total vem nas opções"""
+    path = tmp_path / "curriculo.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    pool = ExtractionPool(size=2, timeout=30, parallel_page_threshold=2)
+    submitted = []
+
+    async def fake_submit(op, kind, source, options, timeout):
+        submitted.append((op, options.get("page_range")))
+        return _JobOutcome(chunks=["texto"], skipped_pages=[], finished=True)
+
+    pool._submit = fake_submit
+    try:
+        await pool.extract("pdf", str(path), options={"total_pages": 2})
+        await pool.extract("pdf", str(path))
+        await pool.extract("pdf", str(path), options={"total_pages": 4})
+    finally:
+        pool.shutdown()
+
+    assert submitted == [("extract", None), ("extract", None), ("extract", (0, 2)), ("extract", (2, 4))]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_extraction_pool.py"])
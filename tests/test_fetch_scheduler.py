@@ -0,0 +1,87 @@
+import asyncio
+import time
+import pytest
+from email.utils import formatdate
+from app.services.fetch_scheduler import FetchScheduler, ThrottledError, parse_retry_after
+
+
+@pytest.mark.asyncio
+async def test_single_flight_unifica_buscas_iguais():
+    scheduler = FetchScheduler()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "vaga"
+
+    results = await asyncio.gather(*[scheduler.run("https://gupy.io/1", "gupy.io", fetch) for _ in range(5)])
+    assert results == ["vaga"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_limite_de_concorrencia_por_dominio():
+    scheduler = FetchScheduler(concurrency=4, rate=1000, burst=1000,
+                               domain_limits={"linkedin.com": {"concurrency": 2}})
+    active = {"linkedin.com": 0, "gupy.io": 0}
+    peak = dict(active)
+
+    def fetcher(domain):
+        async def fetch():
+            active[domain] += 1
+            peak[domain] = max(peak[domain], active[domain])
+            await asyncio.sleep(0.01)
+            active[domain] -= 1
+        return fetch
+
+    await asyncio.gather(*[
+        scheduler.run(f"{domain}/{i}", domain, fetcher(domain))
+        for domain in active for i in range(8)
+    ])
+    assert peak == {"linkedin.com": 2, "gupy.io": 4}
+
+
+@pytest.mark.asyncio
+async def test_backoff_respeita_retry_after_e_reduz_taxa():
+    scheduler = FetchScheduler(rate=100, burst=100, max_retries=2)
+    attempts = []
+
+    async def fetch():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise ThrottledError("indeed.com", 429, retry_after=0.05)
+        return "ok"
+
+    assert await scheduler.run("k", "indeed.com", fetch) == "ok"
+    assert attempts[1] - attempts[0] >= 0.05
+    assert scheduler._state("indeed.com").bucket.rate < 100
+
+
+@pytest.mark.asyncio
+async def test_falha_rapido_quando_espera_excede_limite():
+    scheduler = FetchScheduler(max_retries=0, max_backoff=1)
+
+    async def throttled():
+        raise ThrottledError("linkedin.com", 503, retry_after=120)
+
+    with pytest.raises(ThrottledError):
+        await scheduler.run("a", "linkedin.com", throttled)
+
+    async def never_called():
+        raise AssertionError("não deveria buscar durante o Retry-After")
+
+    with pytest.raises(ThrottledError):
+        await scheduler.run("b", "linkedin.com", never_called)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert 55 <= parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after("amanhã") is None
+    assert parse_retry_after(None) is None
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_fetch_scheduler.py"])
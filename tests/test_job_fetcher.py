@@ -0,0 +1,195 @@
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from app.config.settings import settings
+from app.services.http_session import PublicResolver, create_http_session
+from app.services.job_fetcher import fetch_job_description, stream_job_text
+from app.utils.cache import TieredCache
+from app.utils.url_canonical import BlockedURLError, canonicalize_url, check_fetch_url, extract_domain
+
+
+@pytest.mark.parametrize("url", [
+    "https://br.linkedin.com/jobs/view/desenvolvedor-python-at-acme-3812345678?trk=public_jobs&refId=abc",
+    "https://www.linkedin.com/jobs/search/?currentJobId=3812345678&keywords=python&utm_source=x",
+    "https://www.LinkedIn.com/comm/jobs/view/3812345678/?trackingId=1",
+])
+def test_variantes_do_linkedin_colapsadas(url):
+    assert canonicalize_url(url) == "https://www.linkedin.com/jobs/view/3812345678/"
+
+
+def test_rastreamento_removido_e_host_em_minusculas():
+    url = "HTTPS://Empresa.Gupy.io:443/jobs/12345?jobBoardSource=gupy_public_page&utm_medium=x#top"
+    assert canonicalize_url(url) == "https://empresa.gupy.io/jobs/12345"
+    assert canonicalize_url("https://vagas.empresa.com.br/vaga?id=7&b=2") == "https://vagas.empresa.com.br/vaga?b=2&id=7"
+    assert canonicalize_url("https://br.indeed.com/jobs?q=python&vjk=abc") == "https://br.indeed.com/viewjob?jk=abc"
+
+
+def test_extract_domain():
+    assert extract_domain("https://empresa.gupy.io/jobs/1") == "gupy.io"
+    assert extract_domain("https://www.catho.com.br/vagas/1") == "catho.com.br"
+
+
+async def start_server(app: web.Application, host: str):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def job_server():
+    """Servidor de vagas que responde 304 quando o ETag confere"""
+    requests = []
+
+    async def job(request):
+        requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text="<html><body><h1>Desenvolvedor Python</h1><script>x()</script><p>AWS</p></body></html>",
+            content_type="text/html",
+            headers={"ETag": '"v1"'}
+        )
+
+    async def huge(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(64):
+            await response.write(b"x" * 1024)
+        return response
+
+    async def long_page(request):
+        # Descrição no início e megabytes de scripts depois, como no Indeed
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        response.content_length = 1024 + 512 * 1024
+        await response.prepare(request)
+        head = '<html><body><div id="jobDescriptionText"><p>Requisitos: SQL</p></div>'.encode()
+        await response.write(head.ljust(1024))
+        for _ in range(512):
+            await response.write(b"<script>" + b"x" * 1007 + b"</script>")
+        return response
+
+    async def redirect(request):
+        raise web.HTTPFound(request.query["para"])
+
+    app = web.Application()
+    app.router.add_get("/vaga", job)
+    app.router.add_get("/viewjob", long_page)
+    app.router.add_get("/enorme", huge)
+    app.router.add_get("/redireciona", redirect)
+    runner, port = await start_server(app, "127.0.0.1")
+    yield f"http://127.0.0.1:{port}/vaga", requests
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cache_e_revalidacao_condicional(job_server, loopback_publico, monkeypatch):
+    url, requests = job_server
+    cache = TieredCache("job_test", memory_bytes=1024 * 1024, store_path=None)
+
+    async with aiohttp.ClientSession() as session:
+        first = await fetch_job_description(session, f"{url}?utm_source=linkedin", cache)
+        # Mesmo link canônico dentro da janela de frescor: sem rede
+        second = await fetch_job_description(session, url, cache)
+        assert len(requests) == 1
+
+        monkeypatch.setattr(settings, "JOB_CACHE_FRESH_SECONDS", 0)
+        third = await fetch_job_description(session, url, cache)
+
+    assert first == second == third == "Desenvolvedor Python\nAWS"
+    assert len(requests) == 2
+    assert requests[1]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_download_para_quando_a_descricao_termina(job_server):
+    url, _ = job_server
+    page = url.replace("/vaga", "/viewjob")
+    async with aiohttp.ClientSession() as session:
+        async with session.get(page) as response:
+            text, received = await stream_job_text(response, page, "indeed.com", 4 * 1024 * 1024)
+    assert text == "Requisitos: SQL"
+    assert received < 64 * 1024
+
+
+@pytest.mark.asyncio
+async def test_download_truncado_no_limite(job_server):
+    url, _ = job_server
+    page = url.replace("/vaga", "/enorme")
+    async with aiohttp.ClientSession() as session:
+        async with session.get(page) as response:
+            _, received = await stream_job_text(response, page, "127.0.0.1", 16 * 1024)
+    assert received == 16 * 1024
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/admin",
+    "http://10.0.0.5/jobs/1",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/",
+    "ftp://8.8.8.8/vaga",
+])
+def test_links_internos_recusados(url):
+    with pytest.raises(BlockedURLError):
+        check_fetch_url(url)
+
+
+def test_links_publicos_aceitos():
+    check_fetch_url("https://8.8.8.8/jobs/1")
+    # Hosts por nome são verificados na resolução de DNS da sessão
+    check_fetch_url("https://empresa.gupy.io/jobs/1")
+
+
+@pytest.mark.asyncio
+async def test_redirecionamento_para_endereco_interno_bloqueado(job_server, internal_server, loopback_publico):
+    url, _ = job_server
+    secret, hits = internal_server
+    cache = TieredCache("job_test", memory_bytes=1024 * 1024, store_path=None)
+
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(BlockedURLError):
+            await fetch_job_description(session, url.replace("/vaga", f"/redireciona?para={secret}"), cache)
+        # Redirecionamentos entre hosts públicos continuam sendo seguidos
+        text = await fetch_job_description(session, url.replace("/vaga", f"/redireciona?para={url}"), cache)
+
+    assert hits == []
+    assert text == "Desenvolvedor Python\nAWS"
+
+
+class FakeResolver:
+    def __init__(self, addresses):
+        self.addresses = addresses
+
+    async def resolve(self, host, port=0, family=0):
+        return [{"hostname": host, "host": address, "port": port} for address in self.addresses]
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_resolucao_descarta_enderecos_internos():
+    mixed = PublicResolver(FakeResolver(["192.168.0.10", "8.8.8.8"]))
+    assert [entry["host"] for entry in await mixed.resolve("vagas.exemplo.com", 443)] == ["8.8.8.8"]
+
+    # DNS rebinding: o nome passa a apontar para a rede interna
+    with pytest.raises(OSError):
+        await PublicResolver(FakeResolver(["169.254.169.254"])).resolve("vagas.exemplo.com", 80)
+
+
+@pytest.mark.asyncio
+async def test_sessao_nao_conecta_em_host_interno_por_nome(job_server):
+    url, requests = job_server
+    session = create_http_session()
+    try:
+        with pytest.raises(aiohttp.ClientConnectorError):
+            await session.get(url.replace("127.0.0.1", "localhost"))
+    finally:
+        await session.close()
+    assert requests == []
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_job_fetcher.py"])
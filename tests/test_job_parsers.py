@@ -0,0 +1,82 @@
+from pathlib import Path
+import pytest
+from app.services.job_parsers import (
+    INDEED_CONTAINERS, JobPageParser, create_page_parser, parse_generic_job,
+    parse_gupy_job, parse_indeed_job, parse_job_html, parse_job_page, parse_linkedin_job
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "jobs"
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+
+def test_json_ld_tem_prioridade():
+    text = parse_gupy_job("https://empresa.gupy.io/jobs/1", fixture("gupy"))
+    assert text.startswith("Engenheiro(a) de Software Backend")
+    assert "Empresa: Fintech Exemplo" in text
+    assert "Local: Belo Horizonte, MG" in text
+    assert "- Manter filas com Kafka" in text
+    assert "<" not in text
+
+
+def test_json_ld_em_graph():
+    html = ('<script type="application/ld+json">{"@graph": [{"@type": "WebPage"}, '
+            '{"@type": "JobPosting", "title": "Dev", "description": "Python &amp; SQL"}]}</script>')
+    assert parse_generic_job("", html) == "Dev\nPython & SQL"
+
+
+@pytest.mark.parametrize("name, parse, expected, absent", [
+    ("linkedin", parse_linkedin_job, "- Docker e integração contínua", "Vagas semelhantes"),
+    ("indeed", parse_indeed_job, "Requisitos: Excel avançado, SQL, estatística básica.", "Vagas de Analista"),
+    ("generic", parse_generic_job, "- Prototipar no Figma", "Outras vagas"),
+])
+def test_conteiner_da_descricao(name, parse, expected, absent):
+    text = parse("", fixture(name))
+    assert expected in text
+    assert absent not in text
+    assert "window." not in text
+
+
+def test_parser_incremental_para_no_fim_do_conteiner():
+    html = fixture("indeed")
+    end = html.index("relatedLinks")
+    parser = JobPageParser(INDEED_CONTAINERS)
+    for start in range(0, len(html), 64):
+        parser.feed(html[start:start + 64])
+        if parser.done:
+            break
+    assert parser.done
+    assert start < end
+    assert "Benefícios" in parser.result()
+
+
+def test_limite_de_bytes_devolve_texto_parcial():
+    html = fixture("indeed")
+    cut = html.index("Requisitos: Excel")
+    text = parse_job_page(html, INDEED_CONTAINERS, max_chars=cut)
+    assert "Power BI" in text
+    assert "Benefícios" not in text
+
+
+def test_sem_conteiner_usa_texto_da_pagina():
+    html = "<html><body><nav>Menu</nav><div><p>Vaga de Python</p></div><script>x()</script></body></html>"
+    assert parse_generic_job("", html) == "Vaga de Python"
+
+
+def test_despacho_por_dominio():
+    assert "Power BI" in parse_job_html("https://br.indeed.com/viewjob?jk=abc", fixture("indeed"))
+    assert "Figma" in parse_job_html("https://vagas.empresa.com.br/designer", fixture("generic"))
+
+
+def test_marcador_de_parada_sem_conteiner():
+    parser = create_page_parser("linkedin.com")
+    parser.feed("<html><body><main><h1>Dev</h1><p>Python</p>"
+                "<section class='similar-jobs'><li>Outra vaga</li></section>")
+    assert parser.done
+    assert parser.result() == "Dev\nPython"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_job_parsers.py"])
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from app.services.job_prefetch import JobPrefetcher, PrefetchLimitError
+
+
+class FakeJobs:
+    def __init__(self, delay: float = 0.05, text: str = "Vaga de Python"):
+        self.delay = delay
+        self.text = text
+        self.fetched = []
+        self.embedded = []
+
+    async def fetch(self, url: str) -> str:
+        self.fetched.append(url)
+        await asyncio.sleep(self.delay)
+        return self.text
+
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+
+
+@pytest.mark.asyncio
+async def test_analise_aproveita_prefetch_em_andamento():
+    jobs = FakeJobs()
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed)
+
+    entry = prefetcher.start("https://br.linkedin.com/jobs/view/123?trk=x")
+    assert entry.status == "pending"
+    # Mesmo link canônico: mesmo handle, sem nova busca
+    assert prefetcher.start("https://www.linkedin.com/jobs/view/123/").handle == entry.handle
+
+    text = await prefetcher.fetch("https://www.linkedin.com/jobs/view/123")
+    assert text == "Vaga de Python"
+    assert jobs.fetched == ["https://br.linkedin.com/jobs/view/123?trk=x"]
+    assert jobs.embedded == ["Vaga de Python"]
+    assert prefetcher.get(entry.handle).status == "ready"
+
+
+@pytest.mark.asyncio
+async def test_sem_prefetch_busca_direto():
+    jobs = FakeJobs(delay=0)
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed)
+    assert await prefetcher.fetch("https://empresa.gupy.io/jobs/1") == "Vaga de Python"
+    assert jobs.embedded == []
+
+
+@pytest.mark.asyncio
+async def test_falha_nao_fica_registrada():
+    jobs = FakeJobs(delay=0, text="")
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed)
+    entry = prefetcher.start("https://empresa.gupy.io/jobs/1")
+    await asyncio.sleep(0.01)
+    assert entry.status == "failed"
+
+    jobs.text = "Vaga de Python"
+    assert await prefetcher.fetch("https://empresa.gupy.io/jobs/1") == "Vaga de Python"
+    assert len(jobs.fetched) == 2
+
+
+@pytest.mark.asyncio
+async def test_handles_expiram():
+    jobs = FakeJobs(delay=0)
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed, ttl_seconds=0.01, max_entries=1)
+    first = prefetcher.start("https://empresa.gupy.io/jobs/1")
+    second = prefetcher.start("https://empresa.gupy.io/jobs/2")
+    # Limite de entradas: o mais antigo sai primeiro
+    assert prefetcher.get(first.handle) is None
+    await asyncio.sleep(0.02)
+    assert prefetcher.get(second.handle) is None
+
+
+@pytest.mark.asyncio
+async def test_handle_pertence_ao_usuario():
+    jobs = FakeJobs()
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed)
+    mine = prefetcher.start("https://empresa.gupy.io/jobs/1", user_id=1)
+    assert prefetcher.get(mine.handle, user_id=2) is None
+
+    # Outro usuário recebe o próprio handle, sobre a mesma busca
+    theirs = prefetcher.start("https://empresa.gupy.io/jobs/1", user_id=2)
+    assert theirs.handle != mine.handle
+    assert theirs.task is mine.task
+    assert prefetcher.start("https://empresa.gupy.io/jobs/1", user_id=2).handle == theirs.handle
+    await theirs.task
+    assert len(jobs.fetched) == 1
+    assert prefetcher.get(theirs.handle, user_id=2).status == "ready"
+
+
+@pytest.mark.asyncio
+async def test_limite_de_handles_por_usuario():
+    jobs = FakeJobs()
+    prefetcher = JobPrefetcher(jobs.fetch, jobs.embed, max_per_user=2)
+    prefetcher.start("https://empresa.gupy.io/jobs/1", user_id=1)
+    prefetcher.start("https://empresa.gupy.io/jobs/2", user_id=1)
+    with pytest.raises(PrefetchLimitError):
+        prefetcher.start("https://empresa.gupy.io/jobs/3", user_id=1)
+    # Repetir um link já buscado não conta como novo handle
+    prefetcher.start("https://empresa.gupy.io/jobs/2", user_id=1)
+    prefetcher.start("https://empresa.gupy.io/jobs/3", user_id=2)
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_job_prefetch.py"])
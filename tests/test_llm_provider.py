@@ -0,0 +1,67 @@
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from app.services.fake_llm import create_fake_app, fake_analysis, fake_embedding
+from app.services.llm import FakeLLMProvider, OpenAIProvider
+
+
+def test_embedding_falso_deterministico():
+    assert fake_embedding("Python e AWS") == fake_embedding("Python e AWS")
+    assert len(fake_embedding("Python", 64)) == 64
+
+
+@pytest.mark.asyncio
+async def test_provedor_limita_chamadas_simultaneas():
+    provider = FakeLLMProvider(latency_seconds=0.02, max_concurrency=2)
+    active = peak = 0
+    original = provider._embed
+
+    async def tracking(texts, model, dimensions):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            return await original(texts, model, dimensions)
+        finally:
+            active -= 1
+
+    provider._embed = tracking
+    await asyncio.gather(*[provider.embed(["texto"], "modelo") for _ in range(6)])
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_com_servidor_falso():
+    """O cliente assíncrono real conversa com o servidor falso local"""
+    runner = web.AppRunner(create_fake_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    provider = OpenAIProvider(api_key="fake", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+
+    try:
+        vectors = await provider.embed(["Python", "AWS"], "text-embedding-3-small", 32)
+        content = await provider.complete_json(
+            [{"role": "user", "content": "Vaga com Python e AWS"}], "gpt-4-1106-preview"
+        )
+    finally:
+        await provider.aclose()
+        await runner.cleanup()
+
+    assert vectors == [fake_embedding("Python", 32), fake_embedding("AWS", 32)]
+    assert "match_percentage" in json.loads(content)
+
+
+def test_analise_falsa_aceita_pela_rota():
+    """Mesmos critérios de is_valid_analysis: sem eles /cv/analyze responde 500"""
+    analysis = json.loads(fake_analysis("Vaga com Python, AWS, Docker, Kubernetes, Terraform e Scrum"))
+    assert "error" not in analysis
+    assert "Python" in analysis["extracted_keywords"]["all_keywords"]
+    assert all(" - Em:" in entry for entry in analysis["keywords"]["present"])
+    assert all(" - Add em:" in entry for entry in analysis["keywords"]["missing"])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_llm_provider.py"])
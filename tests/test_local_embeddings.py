@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from app.services import local_embeddings
+from app.services.local_embeddings import LocalEmbedder, fit_idf, N_FEATURES
+
+
+@pytest.fixture(scope="module")
+def embedder():
+    return LocalEmbedder(dimensions=128)
+
+
+def test_vetores_normalizados_e_deterministicos(embedder):
+    first = embedder.embed(["Desenvolvedor Python com FastAPI"])[0]
+    second = LocalEmbedder(dimensions=128).embed(["Desenvolvedor Python com FastAPI"])[0]
+
+    assert first.shape == (128,)
+    assert first.dtype == np.float32
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_textos_relacionados_sao_mais_proximos(embedder):
+    resume, job, other = embedder.embed([
+        "desenvolvedor back-end python com fastapi, postgresql e aws",
+        "vaga de desenvolvedor python com fastapi e aws",
+        "designer de produto com figma e pesquisa com usuários",
+    ])
+    assert resume @ job > resume @ other
+
+
+def test_idf_ajustado_em_corpus(tmp_path):
+    idf = fit_idf(["python aws", "python docker", "python kubernetes"])
+    assert idf.shape == (N_FEATURES,)
+
+    path = tmp_path / "idf.npy"
+    np.save(path, idf)
+    vector = LocalEmbedder(dimensions=64, idf_path=str(path)).embed(["python aws"])[0]
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+
+
+def test_ngramas_por_palavra_iguais_ao_hashing_vectorizer():
+    """O cache por palavra não muda as features (vetores e IDF continuam válidos)"""
+    texts = [
+        "Desenvolvedor  Python\nSênior, C++ e C#; 6 anos com AWS/Azure.",
+        "python python python",
+        "",
+        "a é de",
+    ]
+    _, chars = local_embeddings._vectorizers()
+    local_embeddings._char_ngrams.clear()
+
+    for _ in range(2):  # frio e com cache
+        expected = chars.transform(texts)
+        actual = local_embeddings._char_features(texts)
+        assert (expected != actual).nnz == 0
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_local_embeddings.py"])
@@ -0,0 +1,61 @@
+import pytest
+from app.utils.pdf_handler import iter_pdf_pages, probe_pdf_text_layer, SkippedPage
+
+
+def split_pages(items):
+    items = list(items)
+    texts = [item for item in items if isinstance(item, str)]
+    skipped = [item for item in items if isinstance(item, SkippedPage)]
+    return texts, skipped
+
+
+def test_extrai_todas_as_paginas(make_pdf):
+    texts, skipped = split_pages(iter_pdf_pages(make_pdf(["Python", "AWS", "Docker"])))
+    assert [t.strip() for t in texts] == ["Python", "AWS", "Docker"]
+    assert skipped == []
+
+
+def test_para_ao_atingir_orcamento(make_pdf):
+    """Testa que a extração para ao atingir o limite de caracteres"""
+    content = make_pdf(["A" * 30, "B" * 30, "C" * 30, "D" * 30])
+    texts, skipped = split_pages(iter_pdf_pages(content, max_chars=40))
+
+    assert sum(len(t) for t in texts) == 40
+    assert "C" not in "".join(texts)
+    assert skipped == [SkippedPage(2, "budget"), SkippedPage(3, "budget")]
+
+
+def test_ignora_paginas_somente_imagem(make_pdf):
+    content = make_pdf(["Resumo profissional", None, "Formacao"])
+    texts, skipped = split_pages(iter_pdf_pages(content))
+
+    assert len(texts) == 2
+    assert skipped == [SkippedPage(1, "image_only")]
+
+
+def test_probe_identifica_pdf_digitalizado(make_pdf):
+    """Testa a verificação rápida de PDFs somente com imagens"""
+    probe = probe_pdf_text_layer(make_pdf([None, None, None]))
+    assert probe.image_only
+    assert probe.image_pages == 3
+
+
+def test_probe_aceita_pdf_com_texto(make_pdf):
+    probe = probe_pdf_text_layer(make_pdf([None] * 5 + ["Resumo"] + [None] * 5))
+    assert not probe.image_only
+    assert probe.font_pages == 1
+    assert probe.sampled_with_text == 1
+
+
+def test_probe_considera_texto_em_form_xobject(make_pdf):
+    """Página com /Font que desenha o texto por um Form XObject não é digitalizada"""
+    content = make_pdf(["Experiencia Python"], form_pages=(0,))
+    probe = probe_pdf_text_layer(content)
+
+    assert probe.sampled_with_text == 1
+    assert not probe.image_only
+    assert list(iter_pdf_pages(content)) == ["Experiencia Python"]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_pdf_handler.py"])
@@ -0,0 +1,81 @@
+import asyncio
+import time
+import pytest
+from app.utils.pipeline import StagePipeline, StageTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_etapas_independentes_se_sobrepoem():
+    async def slow(value):
+        await asyncio.sleep(0.1)
+        return value
+
+    async def resume():
+        return await slow("cv")
+
+    async def jobs():
+        return await slow(["vaga"])
+
+    async def combine(resume, jobs):
+        return f"{resume}+{jobs[0]}"
+
+    pipeline = (
+        StagePipeline("test")
+        .add("resume", resume)
+        .add("jobs", jobs)
+        .add("combine", combine, deps=["resume", "jobs"])
+    )
+    start = time.perf_counter()
+    results = await pipeline.run()
+    elapsed = time.perf_counter() - start
+
+    assert results["combine"] == "cv+vaga"
+    # Caminho mais longo (0,1s), não a soma (0,2s)
+    assert elapsed < 0.18
+    assert set(pipeline.timings) == {"resume", "jobs", "combine"}
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancela_as_demais_etapas():
+    cancelled = []
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def other():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("other")
+            raise
+
+    pipeline = StagePipeline("test").add("hang", hang, timeout=0.05).add("other", other)
+    with pytest.raises(StageTimeoutError) as error:
+        await pipeline.run()
+    assert error.value.stage == "hang"
+    assert cancelled == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_falha_propaga_para_dependentes():
+    async def broken():
+        raise ValueError("sem vagas")
+
+    async def dependent(broken):
+        return broken
+
+    pipeline = StagePipeline("test").add("broken", broken).add("dependent", dependent, deps=["broken"])
+    with pytest.raises(ValueError, match="sem vagas"):
+        await pipeline.run()
+
+
+def test_dependencia_nao_declarada():
+    async def stage():
+        return None
+
+    with pytest.raises(ValueError):
+        StagePipeline("test").add("generation", stage, deps=["resume"])
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_pipeline.py"])
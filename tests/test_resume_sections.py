@@ -0,0 +1,51 @@
+import pytest
+from app.utils.resume_sections import chunk_resume, match_section
+
+RESUME = """Maria Silva
+Desenvolvedora Python
+
+Resumo
+Engenheira de software com 8 anos de experiência em back-end.
+
+Experiência Profissional
+Tech Lead na Empresa XYZ (2020-2023)
+Liderou equipe de 8 desenvolvedores usando Scrum.
+
+Habilidades
+Python, FastAPI, AWS, Docker
+"""
+
+
+def test_trechos_alinhados_as_secoes():
+    chunks = chunk_resume(RESUME)
+    assert [chunk.section for chunk in chunks] == ["geral", "resumo", "experiência", "habilidades"]
+    assert chunks[2].text.startswith("experiência profissional")
+    assert "python, fastapi, aws, docker" in chunks[3].text
+
+
+def test_edicao_altera_somente_o_trecho_da_secao():
+    before = chunk_resume(RESUME)
+    after = chunk_resume(RESUME.replace("Docker", "Docker, Kubernetes"))
+
+    changed = [index for index, (old, new) in enumerate(zip(before, after)) if old != new]
+    assert changed == [3]
+
+
+def test_secao_longa_dividida_em_limites_de_linha():
+    lines = "\n".join(f"Projeto {i}: sistema de recomendação em Python" for i in range(20))
+    chunks = chunk_resume(f"Projetos\n{lines}", max_chars=200)
+
+    assert len(chunks) > 1
+    assert all(chunk.section == "projetos" for chunk in chunks)
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    assert "\n".join(chunk.text for chunk in chunks).count("projeto ") == 20
+
+
+def test_linha_longa_nao_e_cabecalho():
+    assert match_section("habilidades") == "habilidades"
+    assert chunk_resume("Trabalhei com várias tecnologias de mercado em projetos grandes")[0].section == "geral"
+    assert chunk_resume("") == []
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_resume_sections.py"])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from app.utils.similarity import cosine_matrix, cosine_scores, pool_chunk_scores, to_unit_matrix, top_k
+
+
+def test_scores_iguais_ao_cosseno_de_referencia():
+    rng = np.random.default_rng(0)
+    resume = rng.normal(size=64)
+    jobs = rng.normal(size=(5, 64))
+
+    expected = jobs @ resume / (np.linalg.norm(jobs, axis=1) * np.linalg.norm(resume))
+    np.testing.assert_allclose(cosine_scores(resume.tolist(), jobs.tolist()), expected, rtol=1e-5)
+
+
+def test_matriz_normalizada_em_float32():
+    matrix = to_unit_matrix([[3.0, 4.0], [0.0, 0.0]])
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_muitos_contra_muitos():
+    scores = cosine_matrix([[1, 0], [0, 1]], [[1, 0], [1, 1], [0, 2]])
+    assert scores.shape == (2, 3)
+    np.testing.assert_allclose(scores[1], [0.0, np.sqrt(0.5), 1.0], rtol=1e-6)
+
+
+def test_top_k_em_ordem_decrescente():
+    scores = np.array([0.1, 0.9, 0.4, 0.7])
+    assert top_k(scores, 2).tolist() == [1, 3]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 0]
+    assert top_k(np.array([[0.2, 0.8], [0.5, 0.1]]), 1).tolist() == [[1], [0]]
+
+
+
+def test_pool_combina_maximo_e_media_ponderada():
+    # 2 trechos x 2 vagas
+    scores = np.array([[0.9, 0.2], [0.3, 0.4]])
+    pooled = pool_chunk_scores(scores, [1.0, 3.0], max_weight=0.5)
+    np.testing.assert_allclose(pooled, [0.5 * 0.9 + 0.5 * 0.45, 0.5 * 0.4 + 0.5 * 0.35], rtol=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_similarity.py"])
@@ -0,0 +1,63 @@
+import pytest
+from app.utils.cache import LRUByteCache
+from app.utils.extractors import ExtractionLimits
+from app.utils.text_cache import ExtractedTextCache, content_digest
+
+
+def test_lru_respeita_limite_de_bytes():
+    """Testa a remoção das entradas mais antigas ao exceder o limite"""
+    cache = LRUByteCache(max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.get("a")  # "a" passa a ser a mais recente
+    cache.set("c", b"12345")
+
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"12345"
+    assert cache.size_bytes == 10
+
+
+def test_lru_ignora_entrada_maior_que_limite():
+    cache = LRUByteCache(max_bytes=4)
+    cache.set("a", b"12345")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_compartilhado_entre_instancias(tmp_path):
+    """Testa que um segundo worker encontra o texto na camada persistente"""
+    store_path = str(tmp_path / "text.sqlite3")
+    digest = content_digest(b"%PDF-1.4 conteudo")
+
+    worker_a = ExtractedTextCache(memory_bytes=1024, store_path=store_path)
+    worker_b = ExtractedTextCache(memory_bytes=1024, store_path=store_path)
+
+    assert worker_b.get(digest) is None
+    worker_a.set(digest, "Experiência profissional")
+
+    assert worker_b.get(digest) == "Experiência profissional"
+    # Segunda leitura vem da memória local
+    assert worker_b.get(digest) == "Experiência profissional"
+    assert len(worker_b.memory) == 1
+
+
+def test_cache_sem_camada_persistente():
+    cache = ExtractedTextCache(memory_bytes=1024, store_path=None)
+    cache.set("abc", "texto")
+    assert cache.get("abc") == "texto"
+    assert cache.store is None
+
+
+def test_chave_inclui_limites_de_extracao():
+    """Texto truncado com outros limites não é reaproveitado"""
+    cache = ExtractedTextCache(memory_bytes=1024, store_path=None)
+    cache.set("abc", "texto curto", ExtractionLimits(max_chars=11))
+
+    assert cache.get("abc", ExtractionLimits(max_chars=11)) == "texto curto"
+    assert cache.get("abc", ExtractionLimits(max_chars=32000)) is None
+    assert cache.get("abc", ExtractionLimits(max_pages=5, max_chars=11)) is None
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_text_cache.py"])
@@ -0,0 +1,103 @@
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from app.utils import text_extraction
+from app.utils.extraction_pool import ExtractionPool
+from app.utils.metrics import metrics
+from app.utils.text_cache import ExtractedTextCache
+from app.utils.upload_ingest import ingest_bytes
+from tests.test_docx_handler import build_docx, paragraph
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Pool e cache próprios do teste, sem camada persistente"""
+    pool = ExtractionPool(size=1, timeout=30)
+    cache = ExtractedTextCache(memory_bytes=1024 * 1024, store_path=None)
+    monkeypatch.setattr(text_extraction, "extraction_pool", pool)
+    monkeypatch.setattr(text_extraction, "text_cache", cache)
+    yield pool, cache
+    pool.shutdown()
+
+
+def make_upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_formato_definido_pelo_conteudo(isolated):
+    """Um DOCX enviado com extensão .pdf é processado pelo extrator de DOCX"""
+    content = build_docx(paragraph("Engenheiro de Dados"))
+    text = await text_extraction.extract_upload_text(make_upload(content, "curriculo.pdf"))
+    assert "Engenheiro de Dados" in text
+
+
+@pytest.mark.asyncio
+async def test_segundo_envio_usa_cache(isolated, make_pdf):
+    pool, cache = isolated
+    content = make_pdf(["Desenvolvedor Python"])
+
+    first = await text_extraction.extract_upload_text(make_upload(content, "a.pdf"))
+    # O segundo envio não pode chegar ao pool
+    pool.start = lambda: pytest.fail("o pool não deveria ser usado")
+    second = await text_extraction.extract_upload_text(make_upload(content, "b.pdf"))
+
+    assert first == second
+    assert cache.stats()["hits_memory"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_formatos_permitidos(isolated):
+    content = build_docx(paragraph("Texto"))
+    with pytest.raises(HTTPException) as exc:
+        await text_extraction.extract_upload_text(make_upload(content, "a.docx"), allowed_kinds={"pdf"})
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_doc_legado_nao_suportado(isolated):
+    with pytest.raises(HTTPException):
+        await text_extraction.extract_upload_text(make_upload(b"\xD0\xCF\x11\xE0" + b"0" * 64, "a.doc"))
+
+
+@pytest.mark.asyncio
+async def test_pdf_digitalizado_rejeitado_antes_da_extracao(isolated, make_pdf, monkeypatch):
+    pool, cache = isolated
+
+    async def fail_extract(*args, **kwargs):
+        pytest.fail("a extração completa não deveria ser executada")
+
+    monkeypatch.setattr(pool, "extract", fail_extract)
+    content = make_pdf([None, None])
+    image_only = metrics.counter("image_only_rejections_total", kind="pdf")
+    empty_text = metrics.counter("empty_text_rejections_total")
+    image_only_before, empty_text_before = image_only.value, empty_text.value
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            await text_extraction.extract_upload_text(make_upload(content, "scan.pdf"))
+        assert exc.value.status_code == 422
+    # O segundo envio é rejeitado pelo cache, contado no mesmo motivo
+    assert cache.stats()["hits_memory"] == 1
+    assert image_only.value == image_only_before + 2
+    assert empty_text.value == empty_text_before
+
+
+@pytest.mark.asyncio
+async def test_verificacao_rapida_e_extracao_no_worker(isolated, make_pdf):
+    """O envio assíncrono só verifica o arquivo; o worker extrai os bytes guardados"""
+    _, cache = isolated
+    content = make_pdf(["Experiencia com Kubernetes"])
+    with ingest_bytes(content) as upload:
+        assert await text_extraction.check_upload(upload) is None
+        assert cache.get(upload.digest, text_extraction.default_limits()) is None
+
+    text = await text_extraction.extract_stored_text(content)
+    assert "Kubernetes" in text
+    with ingest_bytes(content) as upload:
+        # Reenvio do mesmo arquivo: o texto vai direto para a fila
+        assert await text_extraction.check_upload(upload) == text
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_text_extraction.py"])
@@ -0,0 +1,48 @@
+import pytest
+from app.utils.text_normalization import comparison_form, normalize_document
+
+
+def test_normalizacao_completa():
+    """Testa NFKC, ligaduras, hifenização, espaços e minúsculas"""
+    document = normalize_document("  Desenvol-\n  vimento de   APIs\n\n\nEﬁciência em PYTHON")
+
+    assert document.text == "desenvolvimento de apis\neficiência em python"
+    assert document.lines == ("desenvolvimento de apis", "eficiência em python")
+
+
+def test_hifen_entre_palavras_maiusculas_e_mantido():
+    document = normalize_document("Full-\nStack")
+    assert document.lines == ("full-", "stack")
+
+
+def test_mapa_de_offsets_para_o_original():
+    original = "Experiência:\n  Python  e   AWS"
+    document = normalize_document(original)
+
+    start = document.text.index("python")
+    span = document.original_span(start, start + len("python"))
+    assert original[span[0]:span[1]] == "Python"
+
+    start = document.text.index("e aws")
+    span = document.original_span(start, start + len("e aws"))
+    assert original[span[0]:span[1]] == "e   AWS"
+
+
+def test_linhas_de_comparacao_sem_pontuacao():
+    document = normalize_document("Habilidades: Node.js, C#\nAWS (Lambda)")
+    assert document.match_lines == ("habilidades node js c", "aws lambda")
+    assert comparison_form("Node.JS") == "node js"
+
+
+def test_resultado_reutilizado():
+    text = "Resumo profissional"
+    assert normalize_document(text) is normalize_document(text)
+
+
+def test_combinantes_compostos():
+    # "e" + acento agudo combinante vira "é" (forma composta)
+    assert normalize_document("Expérience").text == "expérience"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_text_normalization.py"])
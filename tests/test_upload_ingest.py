@@ -0,0 +1,67 @@
+import hashlib
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from app.utils.upload_ingest import ingest_upload, sniff_format
+from app.utils.extraction_pool import ExtractionPool
+
+
+def make_upload(content: bytes, filename: str = "curriculo.pdf") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_ingestao_em_blocos(make_pdf):
+    """Testa hash, tamanho e formato calculados numa única passada"""
+    content = make_pdf(["Desenvolvedor Python"])
+    upload = await ingest_upload(make_upload(content), max_size=1024 * 1024, chunk_size=16)
+
+    with upload:
+        assert upload.kind == "pdf"
+        assert upload.size == len(content)
+        assert upload.digest == hashlib.sha256(content).hexdigest()
+        assert upload.read_bytes() == content
+    assert not os.path.exists(upload.path)
+
+
+@pytest.mark.asyncio
+async def test_rejeita_arquivo_grande_sem_deixar_temporario(tmp_path, monkeypatch):
+    from app.config.settings import settings
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+
+    with pytest.raises(HTTPException) as exc:
+        await ingest_upload(make_upload(b"%PDF" + b"0" * 100), max_size=50, chunk_size=16)
+    assert exc.value.status_code == 400
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_rejeita_magic_number_invalido():
+    with pytest.raises(HTTPException):
+        await ingest_upload(make_upload(b"<html>nao e pdf</html>"), max_size=1024)
+
+
+def test_sniff_format():
+    assert sniff_format(b"%PDF-1.7") == "pdf"
+    assert sniff_format(b"PK\x03\x04") == "docx"
+    assert sniff_format(b"\xD0\xCF\x11\xE0") == "doc"
+    assert sniff_format(b"GIF8") is None
+
+
+@pytest.mark.asyncio
+async def test_pool_extrai_do_arquivo_mapeado(make_pdf):
+    """Testa a extração a partir do caminho do upload (mmap no worker)"""
+    pool = ExtractionPool(size=1, timeout=30)
+    try:
+        upload = await ingest_upload(make_upload(make_pdf(["Experiencia com AWS"])), max_size=1024 * 1024)
+        with upload:
+            result = await pool.extract(upload.kind, upload.path)
+        assert result.complete
+        assert "Experiencia com AWS" in result.text
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", "test_upload_ingest.py"])